@@ -26,37 +26,148 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import re
+from collections import namedtuple
+from copy import deepcopy
 from datetime import datetime
-from threading import Event
-from typing import Optional, Tuple
-from dateutil.tz import gettz
+from functools import wraps
+from os.path import isdir, join
+from threading import Event, Lock, Thread
+from typing import Callable, List, Optional, Tuple
+from uuid import uuid4
 from lingua_franca import load_language
-from lingua_franca.time import default_timezone
-from ovos_bus_client.message import Message
+from ovos_bus_client.message import Message, dig_for_message
+from ovos_bus_client.session import Session
 from neon_utils.location_utils import get_timezone
+from neon_utils.message_utils import get_message_user
 from neon_utils.skills.neon_skill import NeonSkill
-from neon_utils.user_utils import get_user_prefs, update_user_profile
-from neon_utils.language_utils import get_supported_languages
+from neon_utils.configuration_utils import dict_make_equal_keys, \
+    dict_update_keys
+from neon_utils.user_utils import get_default_user_config, get_user_prefs, \
+    update_user_profile
+from neon_utils.language_utils import SupportedLanguages, \
+    get_supported_languages
 from neon_utils.parse_utils import validate_email
 from lingua_franca.parse import extract_langcode, get_full_lang_code
-from lingua_franca.format import pronounce_lang
 from lingua_franca.internal import UnsupportedLanguageError
 from ovos_utils import classproperty
 from ovos_utils.log import LOG
 from ovos_utils.process_utils import RuntimeRequirements
 from ovos_workshop.decorators import intent_handler
 from ovos_workshop.intents import IntentBuilder
+from ovos_workshop.resource_files import ResourceFile
 from lingua_franca.parse import extract_datetime
 
+from .util.birthday_scheduler import BirthdayScheduler
+from .util.date_parser import compile_date_pattern, extract_date, \
+    has_year, previous_occurrence
+from .util.handler_limiter import HandlerLimiter
+from .util.language_names import LanguageNames
+from .util.language_parser import LanguageExtractor, read_patterns
+from .util.memory import get_memory_report, start_memory_audit
+from .util.name_parser import NameParser, normalize_name
+from .util.resource_bundle import BUNDLE_EXTENSION, ResourceBundle, \
+    is_stale
+from .util.profile_cache import ProfileCache, profile_fingerprint
+from .util.profile_patch import make_patch
+from .util.rate_limiter import RateLimiter
+from .util.recent_places import RecentPlaces
+from .util.profile_utils import DEFAULT_COORDS, MAX_SPEECH_SPEED, \
+    MIN_SPEECH_SPEED, UNSET_DOB, get_section_changes, is_default_location, \
+    is_generated_username, patch_changes_profile
+from .util.spoken_email import EmailRenderer
+from .util.timezones import TimezoneRegistry
+from .util.utc_offsets import format_utc_offset
+
+GuiPrompt = namedtuple('GuiPrompt', ['prompt_id', 'callback'])
+LanguageRequest = namedtuple('LanguageRequest', ['primary', 'secondary',
+                                                 'primary_gender',
+                                                 'secondary_gender'])
+
+
+def concurrency_limited(func):
+    """
+    Decorate an intent handler to run within the skill's handler limits. If
+    the skill is too busy to handle the request, the user is notified.
+    """
+    @wraps(func)
+    def wrapper(self, message: Message):
+        user = get_message_user(message) or self._get_session_id(message)
+        with self._handler_limiter.acquire(user) as acquired:
+            if not acquired:
+                self.speak_dialog("skill_busy", private=True)
+                return
+            return func(self, message)
+    return wrapper
+
+
+def rate_limited(*budgets: str):
+    """
+    Decorate an intent handler to draw on the named rate limit budgets. If any
+    budget is exhausted, the user is asked to try again later. Apply this
+    above `concurrency_limited` so throttled requests never wait for a slot.
+    :param budgets: names of budgets configured in `_rate_limiter`
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, message: Message):
+            user = get_message_user(message) or self._get_session_id(message)
+            with self._rate_limiter.limit(user, budgets) as allowed:
+                if not allowed:
+                    self.speak_dialog("rate_limited", private=True)
+                    return
+                return func(self, message)
+        return wrapper
+    return decorator
+
 
 class UserSettingsSkill(NeonSkill):
-    MAX_SPEECH_SPEED = 1.5
-    MIN_SPEECH_SPEED = 0.7
+    MAX_SPEECH_SPEED = MAX_SPEECH_SPEED
+    MIN_SPEECH_SPEED = MIN_SPEECH_SPEED
+    GUI_INPUT_TIMEOUT = 120
+    # Profile sections announced with `neon.user_settings.<section>_changed`
+    CHANGE_EVENT_SECTIONS = ("location", "units")
 
     def __init__(self, **kwargs):
         self._languages = None
+        # Language support matrices by display language, built from
+        # `_language_matrix_source`
+        self._language_matrices = dict()
+        self._language_matrix_source = None
+        self._language_matrix_version = 0
+        self._language_matrix_lock = Lock()
+        # Language name tables, keyed by display language
+        self._language_names = dict()
+        # Compiled language request extractors, keyed by language
+        self._language_extractors = dict()
+        # Memory-mapped locale bundles, keyed by language; None if not built
+        self._resource_bundles = dict()
         self._get_location = Event()
+        # Pending GUI input prompts, keyed by session ID
+        self._gui_prompts = dict()
+        self._gui_prompts_lock = Lock()
+        self._handler_limiter = HandlerLimiter()
+        self._rate_limiter = RateLimiter()
+        self._profile_writes = 0
+        # Latest profiles from `neon.profile_update`, keyed by username
+        self._profiles = ProfileCache()
+        self._instance_id = uuid4().hex
+        # Resolved places and timezones, keyed by user
+        self._recent_places = RecentPlaces()
+        self._suppressed_writes = 0
+        self._birthdays = BirthdayScheduler()
+        self._timezones = TimezoneRegistry()
+        # Compiled date patterns and month names, keyed by language
+        self._date_patterns = dict()
+        # Email address renderers, keyed by language
+        self._email_renderers = dict()
+        # Name parsers, keyed by language
+        self._name_parsers = dict()
+        # Languages with registered vocab, regex, and intent files
+        self._registered_langs = set()
+        # Languages queued for registration off the bus thread
+        self._pending_langs = set()
+        self._locale_lock = Lock()
+        self._next_birthday_greeting = None
         NeonSkill.__init__(self, **kwargs)
 
     @classproperty
@@ -73,10 +184,264 @@ class UserSettingsSkill(NeonSkill):
 
     # TODO: move to __init__ after stable ovos-workshop release
     def initialize(self):
+        self._handler_limiter.max_concurrent = \
+            self.settings.get("max_concurrent_handlers", 4)
+        self._handler_limiter.max_queued = \
+            self.settings.get("max_queued_handlers", 8)
+        self._rate_limiter.configure(
+            "settings",
+            user_rate=self.settings.get("settings_rate_limit", 30),
+            user_burst=self.settings.get("settings_rate_burst", 20),
+            global_rate=self.settings.get("settings_global_rate_limit", 600),
+            global_burst=self.settings.get("settings_global_rate_burst", 50))
+        # Public geocoders allow about one request per second per client
+        self._rate_limiter.configure(
+            "geocode",
+            user_rate=self.settings.get("geocode_rate_limit", 6),
+            user_burst=self.settings.get("geocode_rate_burst", 3),
+            global_rate=self.settings.get("geocode_global_rate_limit", 60),
+            global_burst=self.settings.get("geocode_global_rate_burst", 5))
+        self._recent_places.max_places = \
+            self.settings.get("max_recent_places", 5)
+        self._recent_places.cutoff = \
+            self.settings.get("recent_place_match_cutoff", 0.85)
+        self._recent_places.file_path = join(self.file_system.path,
+                                             "recent_places.json")
+        self._recent_places.load()
+        self._birthdays.greeting_hour = \
+            self.settings.get("birthday_greeting_hour", 9)
+        self._timezones.warm(self.location_timezone)
+        self._registered_langs = set(self.native_langs)
+        self.add_event("neon.user_settings.get_stats", self._handle_get_stats)
+        self.add_event("neon.profile_update", self._handle_profile_update)
+        self.add_event("neon.profile_patch", self._handle_profile_patch)
+        self.add_event("neon.user_settings.get_languages",
+                       self._handle_get_languages)
+        self.add_event("mycroft.ready", self._handle_refresh_languages)
+        if self.settings.get("memory_audit"):
+            LOG.info("Tracing memory allocations")
+            start_memory_audit()
+        self.add_event(self.gui.build_message_type('input.box.response'),
+                       self._handle_gui_input_response)
+        self.add_event(self.gui.build_message_type('input.box.close'),
+                       self._handle_gui_input_response)
         if self.settings.get('use_geolocation'):
             LOG.debug(f"Geolocation update enabled")
             self.add_event("mycroft.ready", self._request_location_update)
 
+    def _handle_get_stats(self, message: Message):
+        """
+        Handle a request for skill performance metrics
+        :param message: Message requesting metrics
+        """
+        stats = {"handlers": self._handler_limiter.stats,
+                 "rate_limits": self._rate_limiter.stats,
+                 "recent_places": self._recent_places.stats,
+                 "profile": {"writes": self._profile_writes,
+                             "suppressed_writes": self._suppressed_writes,
+                             "cache": self._profiles.stats}}
+        if message.data.get("memory") or self.settings.get("memory_audit"):
+            stats["memory"] = get_memory_report(self._memory_structures)
+        self.bus.emit(message.response(stats))
+
+    @property
+    def _memory_structures(self) -> dict:
+        """
+        Get a dict of the skill's caches and per-user state by name
+        """
+        return {"languages": self._languages,
+                "language_matrices": self._language_matrices,
+                "language_names": self._language_names,
+                "gui_prompts": self._gui_prompts,
+                "handler_limiter": self._handler_limiter,
+                "rate_limiter": self._rate_limiter,
+                "timezones": self._timezones,
+                "email_renderers": self._email_renderers,
+                "name_parsers": self._name_parsers,
+                "profiles": self._profiles,
+                "recent_places": self._recent_places,
+                "birthdays": self._birthdays,
+                "language_extractors": self._language_extractors,
+                "resource_bundles": self._resource_bundles,
+                "lang_resources": getattr(self, "_lang_resources", None),
+                "voc_match_cache": self.voc_match_cache}
+
+    def _handle_profile_update(self, message: Message):
+        """
+        Handle a user profile update from any skill or client
+        :param message: Message containing the updated `profile`
+        """
+        profile = message.data.get("profile")
+        if profile:
+            username = profile.get("user", {}).get("username")
+            version = message.context.get("profile_version")
+            if username and not (version and self._profiles.version(
+                    username) == tuple(version)):
+                # Cache profiles as `get_user_prefs` returns them, unless this
+                # version was already applied from a patch
+                self._profiles.update(
+                    username, dict_update_keys(deepcopy(profile),
+                                               get_default_user_config()),
+                    version, message.context.get("profile_supersedes"))
+            self._track_birthday(profile, message)
+            self._queue_locale(profile.get("speech", {}).get("stt_language"))
+
+    def _queue_locale(self, lang: Optional[str]) -> bool:
+        """
+        Register a language in a background thread so a profile update does
+        not block the bus handler while Padatious loads intents. Languages
+        that are already registered or pending are not queued again.
+        :param lang: language code to register
+        :returns: True if a registration thread was started
+        """
+        lang = (lang or "").lower()
+        if not lang or not isdir(join(self.res_dir, "locale", lang)):
+            return False
+        with self._locale_lock:
+            if lang in self._registered_langs or lang in self._pending_langs:
+                return False
+            self._pending_langs.add(lang)
+        Thread(target=self._register_pending_locale, args=(lang,),
+               name=f"register_locale_{lang}", daemon=True).start()
+        return True
+
+    def _register_pending_locale(self, lang: str):
+        """
+        Register a queued language and remove it from pending languages
+        :param lang: language code to register
+        """
+        try:
+            self._register_locale(lang)
+        except Exception as e:
+            LOG.exception(f"Failed to register {lang}: {e}")
+            with self._locale_lock:
+                self._registered_langs.discard(lang)
+        finally:
+            with self._locale_lock:
+                self._pending_langs.discard(lang)
+
+    def _handle_profile_patch(self, message: Message):
+        """
+        Handle a profile patch emitted by an instance of this skill with
+        `profile_patches` enabled
+        :param message: Message containing a versioned profile `patch`
+        """
+        try:
+            self._profiles.apply_patch(message.data["username"],
+                                       message.data["patch"],
+                                       message.data["base_version"],
+                                       message.data["version"],
+                                       message.data["fingerprint"],
+                                       message.data.get("supersedes"))
+        except (KeyError, TypeError) as e:
+            LOG.error(f"Invalid profile patch: {e}")
+
+    def _register_locale(self, lang: Optional[str]) -> bool:
+        """
+        Register vocab, regex, and intent files for a language. Only
+        `native_langs` are registered at load, so other languages are
+        registered when a user switches to them.
+        :param lang: language code to register
+        :returns: True if `lang` was newly registered
+        """
+        lang = (lang or "").lower()
+        if not lang:
+            return False
+        if not isdir(join(self.res_dir, "locale", lang)):
+            LOG.debug(f"No resources for {lang}")
+            return False
+        with self._locale_lock:
+            if lang in self._registered_langs:
+                return False
+            self._registered_langs.add(lang)
+        LOG.info(f"Registering intents for {lang}")
+        resources = self.load_lang(self.res_dir, lang)
+        vocabulary = resources.load_skill_vocabulary(
+            self.alphanumeric_skill_id)
+        for vocab_type, lines in vocabulary.items():
+            for line in lines:
+                self.intent_service.register_adapt_keyword(
+                    vocab_type, line[0], line[1:], lang)
+        for regex in resources.load_skill_regex(self.alphanumeric_skill_id):
+            self.intent_service.register_adapt_regex(regex, lang)
+        for intent_file in self._intent_files:
+            resource_file = ResourceFile(resources.types.intent, intent_file)
+            if resource_file.file_path is None:
+                LOG.warning(f"No {intent_file} for {lang}")
+                continue
+            self.intent_service.register_padatious_intent(
+                f"{self.skill_id}:{intent_file}",
+                str(resource_file.file_path), lang)
+        return True
+
+    @property
+    def _intent_files(self) -> List[str]:
+        """
+        Padatious intent files used by this skill's intent handlers
+        """
+        return [intent for method in type(self).__dict__.values()
+                for intent in getattr(method, "intents", [])
+                if isinstance(intent, str) and intent.endswith(".intent")]
+
+    def _track_birthday(self, profile: dict,
+                        message: Optional[Message] = None):
+        """
+        Schedule a birthday greeting for the user described by `profile`
+        :param profile: user profile with `user` and `location` sections
+        :param message: Message the profile was received in; the greeting is
+            spoken in its session
+        """
+        username = profile.get("user", {}).get("username")
+        if not username:
+            return
+        context = None
+        if message and self._get_session_id(message) != "default":
+            # Keep routing context only; profiles are tracked separately
+            context = {key: value for key, value in message.context.items()
+                       if key not in ("user_profiles", "profile_version",
+                                      "profile_supersedes", "timing")}
+        user_tz = self._timezones.get(profile.get("location", {}).get("tz"))
+        self._birthdays.update_user(username, profile["user"].get("dob"),
+                                    user_tz, context=context)
+        self._schedule_birthday_greeting()
+
+    def _schedule_birthday_greeting(self):
+        """
+        Schedule a single event for the next due birthday greeting
+        """
+        next_due = self._birthdays.next_due
+        if next_due == self._next_birthday_greeting:
+            return
+        if self._next_birthday_greeting:
+            self.cancel_scheduled_event("birthday_greeting")
+        self._next_birthday_greeting = next_due
+        if next_due:
+            LOG.debug(f"Next birthday greeting at {next_due}")
+            self.schedule_event(self._handle_birthday_greeting, next_due,
+                                name="birthday_greeting")
+
+    def _handle_birthday_greeting(self, _=None):
+        """
+        Greet every user whose birthday is due in the session their birthday
+        was last updated from, and schedule the next greeting. Users without a
+        known session are announced with an event rather than greeted on the
+        local device.
+        """
+        self._next_birthday_greeting = None
+        for username in self._birthdays.pop_due():
+            context = self._birthdays.get_context(username)
+            message = Message("neon.user_settings.birthday",
+                              {"username": username},
+                              dict(context or {}, username=username))
+            if context:
+                LOG.info(f"Wishing {username} a happy birthday")
+                self.speak_dialog("happy_birthday", message=message,
+                                  private=True)
+            else:
+                LOG.info(f"No session to greet {username} in")
+                self.bus.emit(message)
+        self._schedule_birthday_greeting()
+
     def _request_location_update(self, _=None):
         LOG.info(f'Requesting Geolocation update')
         self.add_event('ovos.ipgeo.update.response',
@@ -107,12 +472,8 @@ class UserSettingsSkill(NeonSkill):
         #                                      {}).get('coordinate',
         #                                              {}).get('longitude')))
         # TODO: Figure out why default config doesn't match real default values
-        default_coords = ("38.971669", "-95.23525")
-        user_coords = (
-            user_config.get('location', {}).get('lat'),
-            user_config.get('location', {}).get('lng')
-        )
-        if not all(user_coords) or user_coords == default_coords:
+        if is_default_location(user_config.get('location', {}).get('lat'),
+                               user_config.get('location', {}).get('lng')):
             LOG.info(f'Updating default user config from ip geolocation')
             new_loc = {
                 'lat': str(updated_location['coordinate']['latitude']),
@@ -124,47 +485,158 @@ class UserSettingsSkill(NeonSkill):
             name, offset = self._get_timezone_from_location(new_loc)
             new_loc['lng'] = new_loc.pop('lon')
             new_loc['tz'] = name
-            new_loc['utc'] = str(round(offset, 1))
+            new_loc['utc'] = format_utc_offset(offset)
+            changes = {"location": get_section_changes({'location': new_loc},
+                                                       user_config,
+                                                       "location")}
             apply_local_user_profile_updates({'location': new_loc}, user_config)
+            self._emit_settings_changes(
+                message, user_config.get('user', {}).get('username'), changes)
             self._emit_weather_update(message)
         else:
             LOG.debug(f'Ignoring IP location for already defined user location:'
                       f'{user_config["location"]}')
-            LOG.debug(f'default={default_coords}')
-            LOG.debug(f'user={user_coords}')
+            LOG.debug(f'default={DEFAULT_COORDS}')
         # Remove listener after a successful update
         self.remove_event('ovos.ipgeo.update.response')
 
     @property
     def stt_languages(self) -> Optional[set]:
-        self._get_supported_languages()
-        if not all((self._languages.skills, self._languages.stt)):
+        languages = self._get_supported_languages()
+        if not all((languages.skills, languages.stt)):
             LOG.warning("Incomplete language support response. "
                         "Assuming all languages are supported")
             return None
-        return set((lang for lang in self._languages.stt
-                    if lang in self._languages.skills))
+        return set((lang for lang in languages.stt
+                    if lang in languages.skills))
 
     @property
     def tts_languages(self):
-        self._get_supported_languages()
-        if not all((self._languages.skills, self._languages.tts)):
+        languages = self._get_supported_languages()
+        if not all((languages.skills, languages.tts)):
             LOG.warning("Incomplete language support response. "
                         "Assuming all languages are supported")
             return None
-        return set((lang for lang in self._languages.tts
-                    if lang in self._languages.skills))
+        return set((lang for lang in languages.tts
+                    if lang in languages.skills))
+
+    def _get_supported_languages(self, refresh: bool = False) -> \
+            SupportedLanguages:
+        """
+        Gather supported languages via the Messagebus API and save the result.
+        Handlers may read languages while they are refreshed, so the cached
+        value is only ever replaced and callers should use the returned value.
+        :param refresh: if True, query services even if languages are cached
+        :returns: SupportedLanguages for STT, TTS, and skills
+        """
+        languages = self._languages
+        if refresh or not languages:
+            languages = get_supported_languages()
+            self._languages = languages
+        return languages
 
-    def _get_supported_languages(self):
+    @staticmethod
+    def _load_language(lang: str) -> bool:
         """
-        Gather supported languages via the Messagebus API and save the result
+        Load lingua_franca for `lang`, if it is supported
+        :param lang: language to load
+        :returns: True if `lang` was loaded
         """
-        if not self._languages:
-            supported_langs = get_supported_languages()
-            self._languages = supported_langs
+        try:
+            load_language(lang)
+            return True
+        except UnsupportedLanguageError as e:
+            LOG.warning(f"lingua_franca does not support {lang}: {e}")
+            return False
+
+    def _get_language_names(self, lang: str) -> LanguageNames:
+        """
+        Get the shared table of language names for a display language. New
+        tables include every code in `languages.value` and supported languages
+        :param lang: language to pronounce language names in
+        :returns: LanguageNames for `lang`
+        """
+        if lang not in self._language_names:
+            self._load_language(lang)
+            aliases = self._load_named_values("languages.value", lang)
+            language_names = LanguageNames(lang, aliases)
+            language_names.warm(code.strip() for code in aliases.values())
+            supported_languages = self._languages
+            if supported_languages:
+                language_names.warm(set().union(*(langs or () for langs in
+                                                  supported_languages)))
+            self._language_names[lang] = language_names
+        return self._language_names[lang]
+
+    def _get_language_matrix(self, lang: str) -> dict:
+        """
+        Get the cached language support matrix. The matrix is rebuilt and its
+        version incremented whenever the supported languages change.
+        :param lang: language to pronounce language names in
+        :returns: dict `version` and list of `languages`, each with `code`,
+            `name`, `stt`, `tts`, `skills`, and `genders`
+        """
+        supported_languages = self._get_supported_languages()
+        with self._language_matrix_lock:
+            if supported_languages != self._language_matrix_source:
+                self._language_matrix_source = supported_languages
+                self._language_matrix_version += 1
+                self._language_matrices = dict()
+            if lang not in self._language_matrices:
+                self._load_language(lang)
+                stt, tts, skills = (set(langs or ())
+                                    for langs in supported_languages)
+                languages = list()
+                for code in sorted(stt | tts | skills):
+                    # Support is unknown if a service did not respond
+                    stt_support = code in stt and code in skills \
+                        if stt and skills else None
+                    tts_support = code in tts and code in skills \
+                        if tts and skills else None
+                    languages.append({
+                        "code": code,
+                        "name": self._get_language_names(lang).get(code),
+                        "stt": stt_support,
+                        "tts": tts_support,
+                        "skills": code in skills if skills else None,
+                        "genders": ["female", "male"] if tts_support is not
+                        False else []})
+                self._language_matrices[lang] = languages
+            return {"version": self._language_matrix_version,
+                    "languages": self._language_matrices[lang]}
+
+    def _handle_get_languages(self, message: Message):
+        """
+        Handle a request for the language support matrix
+        :param message: Message optionally specifying a display `lang`
+        """
+        try:
+            matrix = self._get_language_matrix(message.data.get("lang") or
+                                               self.lang)
+        except Exception as e:
+            # Always respond so callers do not wait for a timeout
+            LOG.exception(e)
+            matrix = {"version": self._language_matrix_version,
+                      "languages": [], "error": repr(e)}
+        self.bus.emit(message.response(matrix))
+
+    def _handle_refresh_languages(self, message: Message):
+        """
+        Refresh supported languages after services start and publish the
+        language support matrix if it changed
+        :param message: Message notifying services are ready
+        """
+        version = self._language_matrix_version
+        self._get_supported_languages(refresh=True)
+        matrix = self._get_language_matrix(self.lang)
+        if matrix["version"] != version:
+            self.bus.emit(message.forward("neon.user_settings.languages",
+                                          matrix))
 
     @intent_handler(IntentBuilder("ChangeUnits").require("change")
                     .require("units").one_of("imperial", "metric").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_unit_change(self, message: Message):
         """
         Handle a request to set metric or imperial units of measurement
@@ -175,13 +647,13 @@ class UserSettingsSkill(NeonSkill):
         if not new_unit:
             raise RuntimeError("Missing required imperial or metric vocab")
 
-        current_unit = get_user_prefs(message)["units"]["measure"]
+        current_unit = self._get_user_prefs(message)["units"]["measure"]
         if new_unit == current_unit:
             self.speak_dialog("units_already_set", {"unit": new_unit},
                               private=True)
         else:
             updated_prefs = {"units": {"measure": new_unit}}
-            update_user_profile(updated_prefs, message, self.bus)
+            self._update_user_profile(updated_prefs, message)
             self.speak_dialog("units_changed",
                               {"unit": self.resources.render_dialog(f"word_{new_unit}")},
                               private=True)
@@ -189,6 +661,8 @@ class UserSettingsSkill(NeonSkill):
 
     @intent_handler(IntentBuilder("ChangeTime").require("change")
                     .require("time").one_of("half", "full").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_time_format_change(self, message: Message):
         """
         Handle a request to set time format to 12 or 24 hour time
@@ -199,18 +673,20 @@ class UserSettingsSkill(NeonSkill):
         if not new_setting:
             raise RuntimeError("Missing required time scale vocab")
 
-        current_setting = get_user_prefs(message)["units"]["time"]
+        current_setting = self._get_user_prefs(message)["units"]["time"]
         if new_setting == current_setting:
             self.speak_dialog("time_format_already_set",
                               {"scale": str(new_setting)}, private=True)
         else:
             updated_prefs = {"units": {"time": new_setting}}
-            update_user_profile(updated_prefs, message, self.bus)
+            self._update_user_profile(updated_prefs, message)
             self.speak_dialog("time_format_changed",
                               {"scale": str(new_setting)}, private=True)
 
     @intent_handler(IntentBuilder("ChangeDate").require("change")
                     .require("date").one_of("mdy", "dmy", "ymd").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_date_format_change(self, message: Message):
         """
         Handle a request to set date format to DMY, MDY, or YMD format
@@ -222,20 +698,22 @@ class UserSettingsSkill(NeonSkill):
         if not new_setting:
             raise RuntimeError("Missing required date format vocab")
 
-        current_setting = get_user_prefs(message)["units"]["date"]
+        current_setting = self._get_user_prefs(message)["units"]["date"]
         if new_setting == current_setting:
             self.speak_dialog("date_format_already_set",
                               {"format": message.data.get(new_setting.lower())},
                               private=True)
         else:
             updated_prefs = {"units": {"date": new_setting}}
-            update_user_profile(updated_prefs, message, self.bus)
+            self._update_user_profile(updated_prefs, message)
             self.speak_dialog("date_format_changed",
                               {"format": message.data.get(new_setting.lower())},
                               private=True)
 
     @intent_handler(IntentBuilder("SetHesitation").one_of("permit", "deny")
                     .require("hesitation").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_speak_hesitation(self, message: Message):
         """
         Handle a request for Neon to speak something when intent processing
@@ -243,8 +721,8 @@ class UserSettingsSkill(NeonSkill):
         :param message: Message associated with request
         """
         enabled = True if message.data.get("permit") else False
-        update_user_profile({"response_mode": {"hesitation": enabled}},
-                            message, self.bus)
+        self._update_user_profile({"response_mode": {"hesitation": enabled}},
+                                  message)
         if enabled:
             self.speak_dialog("hesitation_enabled", private=True)
         else:
@@ -253,6 +731,8 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("Transcription").one_of("permit", "deny")
                     .optionally("audio").optionally("text").require("retention")
                     .build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_transcription_retention(self, message: Message):
         """
         Handle a request to permit or deny saving audio recordings
@@ -268,7 +748,7 @@ class UserSettingsSkill(NeonSkill):
         transcription = "word_audio" if kind == "save_audio" else "word_text"
         enabled = "word_enabled" if allow else "word_disabled"
 
-        current_setting = get_user_prefs(message)["privacy"][kind]
+        current_setting = self._get_user_prefs(message)["privacy"][kind]
         if current_setting == allow:
             self.speak_dialog("transcription_already_set",
                               {"transcription": self.resources.render_dialog(transcription),
@@ -276,7 +756,7 @@ class UserSettingsSkill(NeonSkill):
                               private=True)
         else:
             updated_prefs = {"privacy": {kind: allow}}
-            update_user_profile(updated_prefs, message, self.bus)
+            self._update_user_profile(updated_prefs, message)
             self.speak_dialog("transcription_changed",
                               {"transcription": self.resources.render_dialog(transcription),
                                "enabled": self.resources.render_dialog(enabled)},
@@ -284,12 +764,14 @@ class UserSettingsSkill(NeonSkill):
 
     @intent_handler(IntentBuilder("SpeakSpeed").require("speak_to_me")
                     .one_of("faster", "slower", "normally").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_speech_speed(self, message: Message):
         """
         Handle a request to adjust response audio playback speed
         :param message: Message associated with request
         """
-        current_speed = float(get_user_prefs(message)["speech"].get(
+        current_speed = float(self._get_user_prefs(message)["speech"].get(
             "speed_multiplier")) or 1.0
         if message.data.get("faster"):
             speed = current_speed / 0.9
@@ -306,8 +788,8 @@ class UserSettingsSkill(NeonSkill):
             speed = self.MAX_SPEECH_SPEED
 
         speed = round(speed, 1)
-        update_user_profile({"speech": {"speed_multiplier": speed}},
-                            message, self.bus)
+        self._update_user_profile({"speech": {"speed_multiplier": speed}},
+                                  message)
 
         if speed == current_speed == self.MAX_SPEECH_SPEED:
             self.speak_dialog("speech_speed_limit",
@@ -327,6 +809,8 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("ChangeLocationTimezone").require("change")
                     .one_of("timezone", "location").require("rx_place")
                     .build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_change_location_timezone(self, message: Message):
         """
         Handle a request to change user configured location or timezone.
@@ -334,19 +818,34 @@ class UserSettingsSkill(NeonSkill):
         :param message: Message associated with request
         """
         requested_place = message.data.get("rx_place")
-        resolved_place = self._get_location_from_spoken_location(
-            requested_place, self.lang)
-        if not resolved_place and message.data.get("timezone"):
-            # TODO: Try resolving tz by name DM
-            pass
-        if not resolved_place:
-            self.speak_dialog("location_not_found",
-                              {"location": requested_place},
-                              private=True)
-            return
+        user = get_message_user(message) or self._get_session_id(message)
+        recent = self._recent_places.match(user, requested_place)
+        if recent:
+            resolved_place = deepcopy(recent["place"])
+            tz_name = recent["tz"]
+            # Offsets are not cached since they change with DST
+            utc_offset = self._timezones.now(tz_name).utcoffset()\
+                .total_seconds() / 3600
+        else:
+            # Only requests that reach the geocoder draw on its budget
+            if not self._rate_limiter.try_acquire(user, ("geocode",))[0]:
+                self.speak_dialog("rate_limited", private=True)
+                return
+            resolved_place = self._get_location_from_spoken_location(
+                requested_place, self.lang)
+            if not resolved_place and message.data.get("timezone"):
+                # TODO: Try resolving tz by name DM
+                pass
+            if not resolved_place:
+                self.speak_dialog("location_not_found",
+                                  {"location": requested_place},
+                                  private=True)
+                return
 
-        tz_name, utc_offset = get_timezone(resolved_place["lat"],
-                                           resolved_place["lon"])
+            tz_name, utc_offset = get_timezone(resolved_place["lat"],
+                                               resolved_place["lon"])
+            self._recent_places.add(user, requested_place, resolved_place,
+                                    tz_name)
         if message.data.get("timezone"):
             do_timezone = True
             do_location = self.ask_yesno(
@@ -365,9 +864,9 @@ class UserSettingsSkill(NeonSkill):
 
         if do_timezone:
             LOG.info(f"Update timezone: {tz_name}|{utc_offset}")
-            update_user_profile({"location": {"tz": tz_name,
-                                              "utc": utc_offset}},
-                                message, self.bus)
+            self._update_user_profile({"location": {"tz": tz_name,
+                                                    "utc": utc_offset}},
+                                      message)
             self.speak_dialog("change_location_tz",
                               {"type": self.resources.render_dialog("word_timezone"),
                                "location": f"UTC {utc_offset}"},
@@ -378,21 +877,24 @@ class UserSettingsSkill(NeonSkill):
                 #   Extend this to map other known location mis-matches
                 resolved_place['address']['city'] == "Honolulu"
             LOG.info(f"Update location: {resolved_place}")
-            update_user_profile({'location': {
+            changed = self._update_user_profile({'location': {
                 'city': resolved_place['address']['city'],
                 'state': resolved_place['address'].get('state'),
                 'country': resolved_place['address']['country'],
                 'lat': float(resolved_place['lat']),
-                'lng': float(resolved_place['lon'])}}, message, self.bus)
+                'lng': float(resolved_place['lon'])}}, message)
             self.speak_dialog("change_location_tz",
                               {"type": self.resources.render_dialog("word_location"),
                                "location": resolved_place['address']['city']},
                               private=True)
-            self._emit_weather_update(message)
+            if changed:
+                self._emit_weather_update(message)
 
     @intent_handler(IntentBuilder("ChangeDialog").one_of("change", "permit")
                     .require("dialog_mode").one_of("random", "limited")
                     .build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_change_dialog_mode(self, message: Message):
         """
         Handle a request to switch between normal and limited dialog modes
@@ -403,7 +905,7 @@ class UserSettingsSkill(NeonSkill):
         if not new_dialog:
             raise RuntimeError("Missing required dialog mode")
         new_limit_dialog = new_dialog == "word_limited"
-        current_limit_dialog = get_user_prefs(message)["response_mode"].get(
+        current_limit_dialog = self._get_user_prefs(message)["response_mode"].get(
             "limit_dialog", False)
 
         if new_limit_dialog == current_limit_dialog:
@@ -412,9 +914,9 @@ class UserSettingsSkill(NeonSkill):
                               private=True)
             return
 
-        update_user_profile(
+        self._update_user_profile(
             {"response_mode": {"limit_dialog": new_limit_dialog}},
-            message, self.bus)
+            message)
         self.speak_dialog("dialog_mode_changed",
                           {"response": self.resources.render_dialog(new_dialog)},
                           private=True)
@@ -422,6 +924,7 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("SayMyName").require("tell_me_my")
                     .require("name").build())
     @intent_handler("who_am_i.intent")
+    @concurrency_limited
     def handle_say_my_name(self, message: Message):
         """
         Handle a request to read back a user's name
@@ -430,9 +933,8 @@ class UserSettingsSkill(NeonSkill):
         if not self.neon_in_request(message):
             return
         utterance = message.data.get("utterance")
-        profile = get_user_prefs(message)
-        # a 32-char username is a generated UID, not a real username
-        real_username = len(profile["user"]["username"]) < 32
+        profile = self._get_user_prefs(message)
+        real_username = not is_generated_username(profile["user"]["username"])
         if not any((profile["user"]["first_name"],
                     profile["user"]["middle_name"],
                     profile["user"]["last_name"],
@@ -483,6 +985,7 @@ class UserSettingsSkill(NeonSkill):
 
     @intent_handler(IntentBuilder("SayMyEmail").require("tell_me_my")
                     .require("email").build())
+    @concurrency_limited
     def handle_say_my_email(self, message: Message):
         """
         Handle a request to read back the user's email address
@@ -490,7 +993,7 @@ class UserSettingsSkill(NeonSkill):
         """
         if not self.neon_in_request(message):
             return
-        email_address = get_user_prefs(message)["user"]["email"]
+        email_address = self._get_user_prefs(message)["user"]["email"]
         if not email_address:
             # TODO: Use get_response to ask for the user's email
             self.speak_dialog("email_not_known", private=True)
@@ -502,6 +1005,7 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("SayMyLocation").require("tell_me_my")
                     .require("location").build())
     @intent_handler("where_am_i.intent")
+    @concurrency_limited
     def handle_say_my_location(self, message: Message):
         """
         Handle a request to read back the user's location
@@ -509,7 +1013,7 @@ class UserSettingsSkill(NeonSkill):
         """
         if not self.neon_in_request(message):
             return
-        location_prefs = get_user_prefs(message)["location"]
+        location_prefs = self._get_user_prefs(message)["location"]
         if not location_prefs["city"]:
             from neon_utils.net_utils import check_online
             if check_online():
@@ -529,6 +1033,7 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("SayMyBirthday").require("tell_me_my")
                     .require("birthday").build())
     @intent_handler("when_is_my_birthday.intent")
+    @concurrency_limited
     def handle_say_my_birthday(self, message: Message):
         """
         Handle a request to read back the user's birthday
@@ -536,13 +1041,13 @@ class UserSettingsSkill(NeonSkill):
         """
         if not self.neon_in_request(message):
             return
-        birthday_str = get_user_prefs(message)["user"]["dob"]
-        if not birthday_str or birthday_str == "YYYY/MM/DD":
+        profile = self._get_user_prefs(message)
+        self._track_birthday(profile)
+        birthday_str = profile["user"]["dob"]
+        if not birthday_str or birthday_str == UNSET_DOB:
             self.speak_dialog("birthday_not_known", private=True)
             return
-        user_tz = gettz(self.location_timezone) if self.location_timezone else \
-            default_timezone()
-        now_time = datetime.now(user_tz)
+        now_time = self._timezones.now(self.location_timezone)
         birthday_dt = datetime.strptime(birthday_str, "%Y/%m/%d")
         speakable_birthday = birthday_dt.strftime("%B %-d")
         self.speak_dialog("birthday_is",
@@ -554,6 +1059,8 @@ class UserSettingsSkill(NeonSkill):
 
     @intent_handler(IntentBuilder("SetMyBirthday").require("my")
                     .require("birthday").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_my_birthday(self, message: Message):
         """
         Handle a request to set a user's birthday
@@ -561,16 +1068,18 @@ class UserSettingsSkill(NeonSkill):
         """
         if not self.neon_in_request(message):
             return
-        load_language(self.lang)
-        user_tz = gettz(self.location_timezone) if self.location_timezone else \
-            default_timezone()
-        now_time = datetime.now(user_tz)
-        try:
-            birth_date, _ = extract_datetime(message.data.get("utterance"),
-                                             now_time, self.lang)
-        except IndexError:
+        now_time = self._timezones.now(self.location_timezone)
+        birth_date = self._extract_birthday(message.data.get("utterance"),
+                                            now_time, self.lang)
+        if not birth_date:
             self.speak_dialog("birthday_not_heard", private=True)
             return
+        if birth_date.date() > now_time.date():
+            if has_year(message.data.get("utterance")):
+                self.speak_dialog("birthday_in_future", private=True)
+                return
+            # Dates without a year resolve to the next occurrence
+            birth_date = previous_occurrence(birth_date, now_time)
 
         formatted_birthday = birth_date.strftime("%Y/%m/%d")
         # TODO: Update to use LF when method added for month + date format
@@ -578,8 +1087,8 @@ class UserSettingsSkill(NeonSkill):
         # speakable_birthday = nice_date(birth_date, now=anchor_date)
         speakable_birthday = birth_date.strftime("%B %-d")
 
-        update_user_profile({"user": {"dob": formatted_birthday}},
-                            message, self.bus)
+        self._update_user_profile({"user": {"dob": formatted_birthday}},
+                                  message)
         self.speak_dialog("birthday_confirmed",
                           {"birthday": speakable_birthday}, private=True)
 
@@ -590,6 +1099,8 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("SetMyEmail").optionally("change")
                     .require("my").require("email").require("rx_setting")
                     .build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_my_email(self, message: Message):
         """
        Handle a request to set a user's email address
@@ -601,8 +1112,8 @@ class UserSettingsSkill(NeonSkill):
         email_addr: str = extracted.split()[0] + \
                           message.data.get("utterance").rsplit(extracted.split()[0])[1]
 
-        dot = self.resources.load_vocabulary_file("dot.voc")[0][0]
-        at = self.resources.load_vocabulary_file("at.voc")[0][0]
+        dot = self._load_vocabulary("dot.voc", self.lang)[0][0]
+        at = self._load_vocabulary("at.voc", self.lang)[0][0]
         email_words = email_addr.split()
         if dot in email_words:
             email_words[email_words.index(dot)] = "."
@@ -613,79 +1124,207 @@ class UserSettingsSkill(NeonSkill):
 
         if not validate_email(email_addr):
             self.speak_dialog("email_set_error", private=True)
-            email_addr = self.get_gui_input(self.resources.render_dialog("word_email_title"),
-                                            "test@neon.ai")
-            if not email_addr or not validate_email(email_addr):
-                LOG.warning(f"Invalid email_addr entered: {email_addr}")
-                return
+            self.get_gui_input_async(
+                lambda addr: self._handle_email_input(addr, message),
+                self.resources.render_dialog("word_email_title"),
+                "test@neon.ai", message=message)
+            return
+        self._confirm_email_change(email_addr, message)
 
-        current_email = get_user_prefs(message)["user"]["email"]
+    def _handle_email_input(self, email_addr: Optional[str],
+                            message: Message):
+        """
+        Continue an email change request with an address entered in the GUI
+        :param email_addr: email address entered by the user
+        :param message: Message associated with the original request
+        """
+        if not email_addr or not validate_email(email_addr):
+            LOG.warning(f"Invalid email_addr entered: {email_addr}")
+            return
+        self._confirm_email_change(email_addr, message)
+
+    def _confirm_email_change(self, email_addr: str, message: Message):
+        """
+        Confirm and apply a change to the user's email address
+        :param email_addr: validated email address requested by the user
+        :param message: Message associated with the original request
+        """
+        current_email = self._get_user_prefs(message)["user"]["email"]
+        spoken_email = self._get_email_renderer(self.lang).render
         if current_email and email_addr == current_email:
             self.speak_dialog("email_already_set_same",
-                              {"email": self._spoken_email(current_email)},
+                              {"email": spoken_email(current_email)},
                               private=True)
             return
         if current_email:
             if self.ask_yesno("email_overwrite",
-                              {"old": self._spoken_email(current_email),
-                               "new": self._spoken_email(email_addr)}) == "yes":
-                update_user_profile({"user": {"email": email_addr}},
-                                    message, self.bus)
+                              {"old": spoken_email(current_email),
+                               "new": spoken_email(email_addr)}) == "yes":
+                self._update_user_profile({"user": {"email": email_addr}},
+                                          message)
                 self.speak_dialog("email_set",
-                                  {"email": self._spoken_email(email_addr)},
+                                  {"email": spoken_email(email_addr)},
                                   private=True)
             else:
                 self.speak_dialog("email_not_changed",
-                                  {"email": self._spoken_email(current_email)},
+                                  {"email": spoken_email(current_email)},
                                   private=True)
             return
         if self.ask_yesno("email_confirmation",
-                          {"email": self._spoken_email(email_addr)}) == "yes":
-            update_user_profile({"user": {"email": email_addr}},
-                                message, self.bus)
+                          {"email": spoken_email(email_addr)}) == "yes":
+            self._update_user_profile({"user": {"email": email_addr}},
+                                      message)
             self.speak_dialog("email_set",
-                              {"email": self._spoken_email(email_addr)},
+                              {"email": spoken_email(email_addr)},
                               private=True)
         else:
             self.speak_dialog("email_not_confirmed", private=True)
-            email_addr = self.get_gui_input(self.resources.render_dialog("word_email_title"),
-                                            "test@neon.ai")
-            if email_addr:
-                update_user_profile({"user": {"email": email_addr}},
-                                    message, self.bus)
-                self.speak_dialog("email_set",
-                                  {"email": self._spoken_email(email_addr)},
-                                  private=True)
-            else:
-                LOG.info("User Cancelled email input")
-                # TODO: Speak confirmation
+            self.get_gui_input_async(
+                lambda addr: self._set_email_from_gui(addr, message),
+                self.resources.render_dialog("word_email_title"),
+                "test@neon.ai", message=message)
+
+    def _set_email_from_gui(self, email_addr: Optional[str],
+                            message: Message):
+        """
+        Set the user's email address to a value entered in the GUI
+        :param email_addr: email address entered by the user
+        :param message: Message associated with the original request
+        """
+        if email_addr and not validate_email(email_addr):
+            LOG.warning(f"Invalid email_addr entered: {email_addr}")
+        elif email_addr:
+            self._update_user_profile({"user": {"email": email_addr}},
+                                      message)
+            self.speak_dialog("email_set",
+                              {"email": self._spoken_email(email_addr)},
+                              private=True)
+        else:
+            LOG.info("User Cancelled email input")
+            # TODO: Speak confirmation
 
     def get_gui_input(self, title=None, placeholder=None,
-                      confirm_text=None, exit_text=None) -> Optional[str]:
+                      confirm_text=None, exit_text=None,
+                      timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Display a GUI input box and block until the user responds. Prefer
+        `get_gui_input_async` in handlers so a thread isn't held while waiting
+        :param timeout: seconds to wait for input (default from settings)
+        :returns: text entered by the user, else None
+        """
         gui_response = None
         response_event = Event()
-        response_event.clear()
-        self.gui.show_input_box(title, placeholder, confirm_text, exit_text,
-                                True, True)
+        timeout = timeout or self.settings.get("gui_input_timeout",
+                                               self.GUI_INPUT_TIMEOUT)
 
-        def _on_response(message):
+        def _on_response(response):
             nonlocal gui_response
-            gui_response = message.data.get("text")
+            gui_response = response
             response_event.set()
 
-        def _on_close(message):
-            response_event.set()
-
-        resp_message = self.gui.build_message_type('input.box.response')
-        close_message = self.gui.build_message_type('input.box.close')
-        self.add_event(resp_message, _on_response, once=True)
-        self.add_event(close_message, _on_close, once=True)
-        response_event.wait()
-        self.gui.remove_input_box()
-        self.remove_event(resp_message)
-        self.remove_event(close_message)
+        prompt_id = self.get_gui_input_async(_on_response, title, placeholder,
+                                             confirm_text, exit_text, timeout)
+        if not response_event.wait(timeout):
+            LOG.warning(f"GUI input timed out after {timeout}s")
+            self._resolve_gui_prompt(prompt_id=prompt_id)
         return gui_response
 
+    def get_gui_input_async(self, callback: Callable[[Optional[str]], None],
+                            title=None, placeholder=None, confirm_text=None,
+                            exit_text=None, timeout: Optional[float] = None,
+                            message: Optional[Message] = None) -> str:
+        """
+        Display a GUI input box and return without waiting for a response.
+        `callback` is called exactly once with the text entered by the user,
+        or with None if the input is closed, times out, or is cancelled.
+        :param callback: method to call with the user input
+        :param timeout: seconds to wait for input (default from settings)
+        :param message: Message associated with the request
+        :returns: ID of the pending prompt
+        """
+        message = message or dig_for_message()
+        session_id = self._get_session_id(message)
+        timeout = timeout or self.settings.get("gui_input_timeout",
+                                               self.GUI_INPUT_TIMEOUT)
+        prompt = GuiPrompt(str(uuid4()), callback)
+        with self._gui_prompts_lock:
+            replaced = self._gui_prompts.get(session_id)
+        if replaced:
+            LOG.info(f"Replacing pending GUI prompt for session: {session_id}")
+            self._resolve_gui_prompt(prompt_id=replaced.prompt_id)
+        with self._gui_prompts_lock:
+            self._gui_prompts[session_id] = prompt
+        self.gui.show_input_box(title, placeholder, confirm_text, exit_text,
+                                True, True)
+        self.schedule_event(self._handle_gui_input_timeout, timeout,
+                            {"prompt_id": prompt.prompt_id},
+                            f"gui_input_{prompt.prompt_id}")
+        return prompt.prompt_id
+
+    def _handle_gui_input_response(self, message: Message):
+        """
+        Handle a GUI input box response or close event
+        :param message: Message emitted by the GUI
+        """
+        self._resolve_gui_prompt(self._get_session_id(message),
+                                 response=message.data.get("text"))
+
+    def _handle_gui_input_timeout(self, message: Message):
+        """
+        Handle a scheduled timeout for a pending GUI input prompt
+        :param message: Message containing the `prompt_id` that timed out
+        """
+        prompt_id = message.data.get("prompt_id")
+        LOG.info(f"GUI input timed out: {prompt_id}")
+        self._resolve_gui_prompt(prompt_id=prompt_id)
+
+    def _resolve_gui_prompt(self, session_id: Optional[str] = None,
+                            prompt_id: Optional[str] = None,
+                            response: Optional[str] = None):
+        """
+        Complete a pending GUI prompt and call its callback
+        :param session_id: session the response is associated with
+        :param prompt_id: ID of a specific prompt to resolve
+        :param response: text entered by the user, else None
+        """
+        with self._gui_prompts_lock:
+            if prompt_id:
+                session_id = next((sid for sid, p in self._gui_prompts.items()
+                                   if p.prompt_id == prompt_id), None)
+            elif session_id not in self._gui_prompts:
+                if len(self._gui_prompts) == 1:
+                    # GUI responses may not carry the requesting session
+                    session_id = next(iter(self._gui_prompts))
+                elif self._gui_prompts:
+                    # Text entered for one session must never reach another
+                    LOG.warning(f"Ignoring GUI response for session "
+                                f"{session_id} with "
+                                f"{len(self._gui_prompts)} prompts pending")
+            prompt = self._gui_prompts.pop(session_id, None)
+            remaining = len(self._gui_prompts)
+        if not prompt:
+            LOG.debug(f"No pending GUI prompt for session: {session_id}")
+            return
+        self.cancel_scheduled_event(f"gui_input_{prompt.prompt_id}")
+        if not remaining:
+            self.gui.remove_input_box()
+        try:
+            prompt.callback(response)
+        except Exception as e:
+            LOG.exception(f"GUI prompt callback failed: {e}")
+
+    @staticmethod
+    def _get_session_id(message: Optional[Message]) -> str:
+        """
+        Get the session ID associated with a message
+        :param message: Message to get session for
+        :returns: session ID, or "default" if not specified
+        """
+        if not message:
+            return "default"
+        return message.context.get("session", {}).get("session_id") or \
+            "default"
+
     @staticmethod
     def _normalize_name(name: str) -> str:
         """
@@ -693,8 +1332,7 @@ class UserSettingsSkill(NeonSkill):
         @param name: the input name parsed from user utterance
         @return: normalized name
         """
-        name = re.sub(r'[\'".,\d]', '', name)
-        name = name.strip().title()
+        name = normalize_name(name)
         LOG.debug(f"Parsed: {name}")
         return name
 
@@ -703,6 +1341,8 @@ class UserSettingsSkill(NeonSkill):
                     .build())
     @intent_handler(IntentBuilder("MyNameIs").require("my_name_is")
                     .require("rx_name").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_my_name(self, message: Message):
         """
         Handle a request to set a user's name. Some considerations for name
@@ -732,7 +1372,7 @@ class UserSettingsSkill(NeonSkill):
         else:
             request = None
 
-        user_profile = get_user_prefs(message)["user"]
+        user_profile = self._get_user_prefs(message)["user"]
 
         # Catch an invalid intent match
         if (request and len(name.split()) > 3) or len(name.split()) > 4:
@@ -755,9 +1395,9 @@ class UserSettingsSkill(NeonSkill):
                               for n in ("first_name", "middle_name",
                                         "last_name"))
                 full_name = " ".join((n for n in name_parts if n))
-                update_user_profile({"user": {request: name,
-                                              "full_name": full_name}},
-                                    message, self.bus)
+                self._update_user_profile({"user": {request: name,
+                                                    "full_name": full_name}},
+                                          message)
                 self.speak_dialog(
                     "name_set_part",
                     {"position": self.resources.render_dialog(f"word_{request}"),
@@ -777,8 +1417,8 @@ class UserSettingsSkill(NeonSkill):
                                       f"word_name"),
                                       "name": name})
             else:
-                update_user_profile({"user": updated_user_profile},
-                                    message, self.bus)
+                self._update_user_profile({"user": updated_user_profile},
+                                          message)
                 self.speak_dialog("name_set_full",
                                   {"nick": preferred_name,
                                    "name": name_parts["full_name"]},
@@ -788,15 +1428,16 @@ class UserSettingsSkill(NeonSkill):
                     .require("tell_me_my").require("language_settings")
                     .build())
     @intent_handler("language_settings.intent")
+    @concurrency_limited
     def handle_say_my_language_settings(self, message: Message):
         """
         Handle a request to read back the user's language settings
         :param message: Message associated with request
         """
-        load_language(self.lang)
-        language_settings = get_user_prefs(message)["speech"]
-        primary_lang = pronounce_lang(language_settings["tts_language"])
-        second_lang = pronounce_lang(
+        language_names = self._get_language_names(self.lang)
+        language_settings = self._get_user_prefs(message)["speech"]
+        primary_lang = language_names.get(language_settings["tts_language"])
+        second_lang = language_names.get(
             language_settings["secondary_tts_language"])
         self.speak_dialog(
             "language_setting",
@@ -820,6 +1461,8 @@ class UserSettingsSkill(NeonSkill):
                     .optionally("my").require("language_stt")
                     .require("language").require("rx_language").build())
     @intent_handler("language_stt.intent")
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_stt_language(self, message: Message):
         """
         Handle a request to change the language spoken by the user
@@ -848,15 +1491,15 @@ class UserSettingsSkill(NeonSkill):
             return
         dialog_data = {"io": self.resources.render_dialog("word_stt"),
                        "lang": spoken_lang}
-        if code == get_user_prefs(message)["speech"]["stt_language"]:
+        if code == self._get_user_prefs(message)["speech"]["stt_language"]:
             self.speak_dialog("language_not_changed", dialog_data,
                               private=True)
             return
 
         if self.ask_yesno("language_change_confirmation",
                           dialog_data) == "yes":
-            update_user_profile({"speech": {"stt_language": code}},
-                                message, self.bus)
+            self._update_user_profile({"speech": {"stt_language": code}},
+                                      message)
             self.speak_dialog("language_set", dialog_data,
                               private=True)
         else:
@@ -866,6 +1509,8 @@ class UserSettingsSkill(NeonSkill):
                     .optionally("my").require("language_tts")
                     .require("language").require("rx_language").build())
     @intent_handler("language_tts.intent")
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_tts_language(self, message: Message):
         """
         Handle a request to change the language spoken to the user
@@ -873,11 +1518,12 @@ class UserSettingsSkill(NeonSkill):
         """
         language = message.data.get("rx_language") or \
                    message.data.get("request_language")
-        primary, secondary = \
-            self._parse_languages(message.data.get("utterance"))
+        request = self._parse_language_request(message.data.get("utterance"),
+                                               self.lang)
+        primary, secondary = request.primary, request.secondary
         LOG.info(f"primary={primary} | secondary={secondary} | "
                  f"language={language}")
-        user_settings = get_user_prefs(message)
+        user_settings = self._get_user_prefs(message)
         if primary:
             try:
                 primary_code, primary_spoken = \
@@ -893,11 +1539,11 @@ class UserSettingsSkill(NeonSkill):
                                            'word_speak')},
                                       private=True)
                     return
-                gender = self._get_gender(primary) or \
+                gender = request.primary_gender or \
                          user_settings["speech"]["tts_gender"]
-                update_user_profile({"speech": {"tts_gender": gender,
-                                                "tts_language": primary_code}},
-                                    message, self.bus)
+                self._update_user_profile(
+                    {"speech": {"tts_gender": gender,
+                                "tts_language": primary_code}}, message)
                 self.speak_dialog("language_set",
                                   {"io": self.resources.render_dialog(
                                       "word_primary"),
@@ -921,12 +1567,12 @@ class UserSettingsSkill(NeonSkill):
                                            'word_speak')},
                                       private=True)
                     return
-                gender = self._get_gender(secondary) or \
+                gender = request.secondary_gender or \
                          user_settings["speech"]["secondary_tts_gender"]
-                update_user_profile(
+                self._update_user_profile(
                     {"speech": {"secondary_tts_gender": gender,
                                 "secondary_tts_language": secondary_code}},
-                    message, self.bus)
+                    message)
                 self.speak_dialog("language_set",
                                   {"io": self.resources.render_dialog(
                                       "word_secondary"),
@@ -953,9 +1599,9 @@ class UserSettingsSkill(NeonSkill):
                     return
                 gender = self._get_gender(language) or \
                          user_settings["speech"]["tts_gender"]
-                update_user_profile({"speech": {"tts_gender": gender,
-                                                "tts_language": code}},
-                                    message, self.bus)
+                self._update_user_profile({"speech": {"tts_gender": gender,
+                                                      "tts_language": code}},
+                                          message)
                 self.speak_dialog("language_set",
                                   {"io": self.resources.render_dialog(
                                       "word_primary"),
@@ -971,6 +1617,8 @@ class UserSettingsSkill(NeonSkill):
     @intent_handler(IntentBuilder("SetMyLanguage").optionally("change")
                     .require("my").optionally("preferred").optionally("second")
                     .require("language").optionally("rx_language").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_set_language(self, message: Message):
         """
         Handle a user request to change languages. Checks for improper parsing
@@ -993,28 +1641,181 @@ class UserSettingsSkill(NeonSkill):
             self.handle_set_tts_language(message)
         else:
             LOG.info("General language change request, handle STT+TTS")
-            self.handle_set_tts_language(message)
-            try:
-                lang = self._get_lang_code_and_name(
-                    message.data.get("rx_language", ""))[0]
-                if not lang or lang != \
-                        get_user_prefs(message)["speech"]["stt_language"]:
-                    self.handle_set_stt_language(message)
-            except UnsupportedLanguageError:
-                pass
+            self._change_language(message)
+
+    def _change_language(self, message: Message):
+        """
+        Change the user's STT and TTS language together. The request is
+        parsed, resolved and validated once, the user confirms the combined
+        change once, and all changed values are written in one profile update.
+        :param message: Message associated with request
+        """
+        lang = self.lang
+        request = self._parse_language_request(
+            message.data.get("utterance") or "", lang)
+        language = request.primary or message.data.get("rx_language") or \
+            message.data.get("request_language")
+        if not language:
+            LOG.warning("No language parsed")
+            self.speak_dialog("language_not_heard", private=True)
+            return
+        try:
+            code, spoken_lang = self._get_lang_code_and_name(language, lang)
+        except UnsupportedLanguageError as e:
+            LOG.error(e)
+            self.speak_dialog("language_not_recognized", {"lang": language},
+                              private=True)
+            return
+
+        short_code = code.split('-')[0]
+        stt_languages = self.stt_languages
+        tts_languages = self.tts_languages
+        stt_supported = not stt_languages or short_code in stt_languages
+        tts_supported = not tts_languages or short_code in tts_languages
+        resources = self.load_lang(lang=lang)
+        if not any((stt_supported, tts_supported)):
+            LOG.warning(f"{code} not found in: {stt_languages} or "
+                        f"{tts_languages}")
+            self.speak_dialog("language_not_supported",
+                              {"lang": spoken_lang,
+                               "io": resources.render_dialog(
+                                   'word_understand')},
+                              private=True)
+            return
+
+        changes = dict()
+        if stt_supported:
+            changes["stt_language"] = code
+        if tts_supported:
+            changes["tts_language"] = code
+            gender = request.primary_gender if request.primary else \
+                self._get_gender(language)
+            if gender:
+                changes["tts_gender"] = gender
+        if stt_supported and tts_supported:
+            io = "word_stt_tts"
+        else:
+            LOG.warning(f"{code} only supported for "
+                        f"{'STT' if stt_supported else 'TTS'}")
+            io = "word_stt" if stt_supported else "word_primary"
+        dialog_data = {"io": resources.render_dialog(io),
+                       "lang": spoken_lang}
+        if not patch_changes_profile({"speech": changes},
+                                     self._get_user_prefs(message)):
+            self.speak_dialog("language_not_changed", dialog_data,
+                              private=True)
+            return
+
+        if self.ask_yesno("language_change_confirmation",
+                          dialog_data) == "yes":
+            self._update_user_profile({"speech": changes}, message)
+            self.speak_dialog("language_set", dialog_data, private=True)
+        else:
+            self.speak_dialog("language_not_confirmed", private=True)
 
     @intent_handler(IntentBuilder("NoSecondaryLanguage")
                     .require("no_secondary_language").build())
+    @rate_limited("settings")
+    @concurrency_limited
     def handle_no_secondary_language(self, message: Message):
         """
         Handle a user request to only hear responses in one language
         :param message: Message associated with request
         """
-        update_user_profile({"speech": {"secondary_tts_language": "",
-                                        "secondary_neon_voice": ""}},
-                            message, self.bus)
+        self._update_user_profile({"speech": {"secondary_tts_language": "",
+                                              "secondary_neon_voice": ""}},
+                                  message)
         self.speak_dialog("only_one_language", private=True)
 
+    def _update_user_profile(self, new_preferences: dict,
+                             message: Message) -> bool:
+        """
+        Update the user profile associated with `message`. If the profile
+        already contains all the requested values, nothing is written or
+        emitted.
+        :param new_preferences: nested dict of profile values to update
+        :param message: Message associated with request
+        :returns: True if the profile was updated, False if nothing changed
+        """
+        profile = self._get_user_prefs(message)
+        if not patch_changes_profile(new_preferences, profile):
+            self._suppressed_writes += 1
+            LOG.debug(f"Profile already up to date: {new_preferences}")
+            return False
+        username = profile["user"]["username"]
+        base_version = self._profiles.version(username)
+        version = self._profiles.next_version(username, self._instance_id)
+        supersedes = profile_fingerprint(profile)
+        changes = {section: get_section_changes(new_preferences, profile,
+                                                section)
+                   for section in self.CHANGE_EVENT_SECTIONS}
+        if self.settings.get("profile_patches") and \
+                self._profiles.fingerprint(username) == supersedes:
+            # Instances with the same cached profile apply the patch and skip
+            # merging the complete profile broadcast after it, which is still
+            # sent for clients that persist profiles. Patches are computed
+            # the same way `update_user_profile` merges the update.
+            updated = dict_update_keys(
+                dict_make_equal_keys(deepcopy(new_preferences),
+                                     deepcopy(profile)),
+                get_default_user_config())
+            self.bus.emit(message.forward("neon.profile_patch", {
+                "username": username,
+                "base_version": base_version,
+                "version": version,
+                "patch": make_patch(profile, updated),
+                "fingerprint": profile_fingerprint(updated),
+                "supersedes": supersedes}))
+        # Version the broadcast without adding it to the handler's context
+        update_user_profile(new_preferences,
+                            Message(message.msg_type, message.data,
+                                    dict(message.context,
+                                         profile_version=version,
+                                         profile_supersedes=supersedes)),
+                            self.bus)
+        updated = get_user_prefs(message)
+        self._profiles.update(username, updated, version, supersedes)
+        self._emit_settings_changes(message, username, changes)
+        self._profile_writes += 1
+        return True
+
+    def _get_user_prefs(self, message: Message) -> dict:
+        """
+        Get the user profile associated with `message`. If the profile in the
+        message context was replaced by a profile update from any instance of
+        this skill, the context is updated to the latest profile first.
+        :param message: Message associated with request
+        :returns: dict user profile
+        """
+        profile = get_user_prefs(message)
+        username = profile["user"]["username"]
+        latest = self._profiles.get_latest(username, profile)
+        if latest is None:
+            return profile
+        LOG.info(f"Replacing stale profile for {username}")
+        for idx, user_profile in enumerate(
+                message.context.get("user_profiles") or []):
+            if user_profile.get("user", {}).get("username") == username:
+                message.context["user_profiles"][idx] = latest
+        return get_user_prefs(message)
+
+    def _emit_settings_changes(self, message: Message, username: str,
+                               changes: dict):
+        """
+        Emit one `neon.user_settings.<section>_changed` event for each profile
+        section with changed values. Only changed keys are included so
+        listeners can invalidate just the data that depends on them.
+        :param message: Message associated with the profile update
+        :param username: user whose profile was updated
+        :param changes: dict of section to old and new values, as returned by
+            `get_section_changes`
+        """
+        for section, (old, new) in changes.items():
+            if new:
+                self.bus.emit(message.forward(
+                    f"neon.user_settings.{section}_changed",
+                    {"username": username, "old": old, "new": new}))
+
     def _emit_weather_update(self, message: Message):
         """
         Emit a weather update on location change
@@ -1029,55 +1830,162 @@ class UserSettingsSkill(NeonSkill):
         :param utterance: raw utterance spoken by the user
         :returns: spoken primary, secondary languages requested
         """
+        return self._parse_language_request(utterance, self.lang)[:2]
 
-        def _get_rx_patterns(rx_file: str, utt: str):
-            with open(rx_file) as f:
-                for pat in f.read().splitlines():
-                    pat = pat.strip()
-                    if pat and pat[0] == "#":
-                        continue
-                    res = re.search(pat, utt)
-                    if res:
-                        return res
-
-        utterance = f"{utterance}\n"
-        primary_tts = self.find_resource('primary_tts.rx', 'regex')
-        secondary_tts = self.find_resource('secondary_tts.rx', 'regex')
-        if primary_tts:
-            try:
-                primary = _get_rx_patterns(primary_tts,
-                                           utterance).group("rx_primary").strip()
-            except (IndexError, AttributeError):
-                primary = None
-        else:
-            LOG.warning("Could not resolve primary_tts.rx")
-            primary = None
-        if secondary_tts:
+    def _parse_language_request(self, utterance: str,
+                                lang: str) -> LanguageRequest:
+        """
+        Parse a language change request for primary and secondary languages
+        and voice genders
+        :param utterance: raw utterance spoken by the user
+        :param lang: language of `utterance`
+        :returns: LanguageRequest with spoken languages and genders requested
+        """
+        primary, secondary = self._get_language_extractor(lang).extract(
+            utterance)
+        return LanguageRequest(primary, secondary,
+                               self._get_gender(primary) if primary else None,
+                               self._get_gender(secondary) if secondary
+                               else None)
+
+    def _get_language_extractor(self, lang: str) -> LanguageExtractor:
+        """
+        Get a cached LanguageExtractor for the requested language
+        :param lang: language to extract requested languages in
+        :returns: LanguageExtractor compiled from `primary_tts.rx` and
+            `secondary_tts.rx`
+        """
+        if lang not in self._language_extractors:
+            patterns = dict()
+            for name in ("primary_tts.rx", "secondary_tts.rx"):
+                patterns[name] = self._load_patterns(name, lang)
+                if patterns[name] is None:
+                    LOG.warning(f"Could not resolve {name}")
+                    patterns[name] = []
+            self._language_extractors[lang] = LanguageExtractor(
+                patterns["primary_tts.rx"], patterns["secondary_tts.rx"])
+        return self._language_extractors[lang]
+
+    def _get_resource_bundle(self, lang: str) -> Optional[ResourceBundle]:
+        """
+        Get the memory-mapped resource bundle for a language, if one was built
+        with `util.resource_bundle`
+        :param lang: language to get resources for
+        :returns: ResourceBundle for `lang`, else None to use loose files
+        """
+        if lang not in self._resource_bundles:
+            bundle_file = join(self.res_dir, "locale",
+                               f"{lang}{BUNDLE_EXTENSION}")
             try:
-                secondary = _get_rx_patterns(secondary_tts,
-                                             utterance).group("rx_secondary") \
-                    .strip()
-            except (IndexError, AttributeError):
-                secondary = None
-        else:
-            LOG.warning("Could not resolve secondary_tts.rx")
-            secondary = None
+                if is_stale(bundle_file, join(self.res_dir, "locale", lang)):
+                    LOG.warning(f"Ignoring outdated resource bundle: "
+                                f"{bundle_file}")
+                    self._resource_bundles[lang] = None
+                else:
+                    self._resource_bundles[lang] = \
+                        ResourceBundle(bundle_file)
+                    LOG.debug(f"Loaded resource bundle: {bundle_file}")
+            except FileNotFoundError:
+                self._resource_bundles[lang] = None
+            except ValueError as e:
+                LOG.error(e)
+                self._resource_bundles[lang] = None
+        return self._resource_bundles[lang]
+
+    def _load_named_values(self, name: str, lang: str) -> dict:
+        """
+        Load a `.value` resource from the language's bundle or loose files
+        :param name: name of the `.value` file
+        :param lang: language to load resources for
+        :returns: dict of names to values
+        """
+        bundle = self._get_resource_bundle(lang)
+        if bundle:
+            return bundle.load_named_values(name)
+        return self.load_lang(lang=lang).load_named_value_file(name)
 
-        return primary, secondary
+    def _load_list(self, name: str, lang: str) -> Optional[List[str]]:
+        """
+        Load a `.list` resource from the language's bundle or loose files
+        :param name: name of the `.list` file
+        :param lang: language to load resources for
+        :returns: list of lines, or None if the file is missing
+        """
+        bundle = self._get_resource_bundle(lang)
+        if bundle:
+            return bundle.load_list(name)
+        return self.load_lang(lang=lang).load_list_file(name)
 
-    def _get_lang_code_and_name(self, request: str) -> Tuple[str, str]:
+    def _load_patterns(self, name: str, lang: str) -> Optional[List[str]]:
+        """
+        Load a `.rx` resource from the language's bundle or loose files
+        :param name: name of the `.rx` file
+        :param lang: language to load resources for
+        :returns: list of patterns in file order, or None if missing
+        """
+        bundle = self._get_resource_bundle(lang)
+        if bundle:
+            return bundle.load_patterns(name)
+        rx_file = self.find_resource(name, 'regex', lang)
+        return read_patterns(rx_file) if rx_file else None
+
+    def _load_vocabulary(self, name: str,
+                         lang: str) -> Optional[List[List[str]]]:
+        """
+        Load a `.voc` resource from the language's bundle or loose files
+        :param name: name of the `.voc` file
+        :param lang: language to load resources for
+        :returns: list of synonym lists, or None if the file is missing
+        """
+        bundle = self._get_resource_bundle(lang)
+        if bundle:
+            return bundle.load_vocabulary(name)
+        return self.load_lang(lang=lang).load_vocabulary_file(name)
+
+    def _extract_birthday(self, utterance: str, now_time: datetime,
+                          lang: Optional[str] = None) -> Optional[datetime]:
+        """
+        Extract a birth date from an utterance. Common spoken dates are parsed
+        with a pattern compiled from the language's month names before
+        falling back to `extract_datetime`
+        :param utterance: user utterance containing a date
+        :param now_time: tz-aware datetime to resolve dates relative to
+        :param lang: language of `utterance`, else the current language
+        :returns: extracted date if found, else None
+        """
+        lang = lang or self.lang
+        if lang not in self._date_patterns:
+            months = {name.lower(): int(num) for name, num in
+                      self._load_named_values("months.value", lang).items()}
+            self._date_patterns[lang] = \
+                (compile_date_pattern(months) if months else None, months)
+        pattern, months = self._date_patterns[lang]
+        if pattern:
+            birth_date = extract_date(pattern, months, utterance, now_time)
+            if birth_date:
+                return birth_date
+        load_language(lang)
+        try:
+            return extract_datetime(utterance, now_time, lang)[0]
+        except (IndexError, TypeError):
+            return None
+
+    def _get_lang_code_and_name(self, request: str,
+                                lang: Optional[str] = None) -> Tuple[str, str]:
         """
         Extract the lang code and pronounceable name from a requested language
         :param request: user requested language
+        :param lang: language of `request`, else the current language
         :returns: lang code and pronounceable language name if found, else None
         """
-        load_language(self.lang)
+        lang = lang or self.lang
+        load_language(lang)
 
         code = None
         # Manually specified languages take priority
-        request_overrides = self.resources.load_named_value_file("languages.value")
-        for lang, c in request_overrides.items():
-            if lang in request.lower().split():
+        request_overrides = self._load_named_values("languages.value", lang)
+        for name, c in request_overrides.items():
+            if name in request.lower().split():
                 code = c
                 break
         if not code:
@@ -1091,7 +1999,7 @@ class UserSettingsSkill(NeonSkill):
         if not code:
             # Request is not a language, raise an exception
             raise UnsupportedLanguageError(f"No language found in {request}")
-        spoken_lang = pronounce_lang(code)
+        spoken_lang = self._get_language_names(lang).get(code)
         return code, spoken_lang
 
     def _get_gender(self, request: str) -> Optional[str]:
@@ -1111,39 +2019,54 @@ class UserSettingsSkill(NeonSkill):
         """
         Get a pronounceable email address string
         """
-        return email_addr.replace(
-            '.', f' {self.resources.render_dialog("word_dot")} ') \
-            .replace('@', f' {self.resources.render_dialog("word_at")} ')
+        return self._get_email_renderer(self.lang).render(email_addr)
 
-    @staticmethod
-    def _get_name_parts(name: str, user_profile: dict) -> dict:
+    def _get_email_renderer(self, lang: str) -> EmailRenderer:
+        """
+        Get a cached EmailRenderer for the requested language
+        :param lang: language to render email addresses in
+        :returns: EmailRenderer for `lang`
+        """
+        if lang not in self._email_renderers:
+            resources = self.load_lang(lang=lang)
+            symbols = {symbol: resources.render_dialog(f"word_{word}")
+                       for symbol, word in (('.', "dot"), ('@', "at"),
+                                            ('_', "underscore"),
+                                            ('-', "dash"), ('+', "plus"))}
+            self._email_renderers[lang] = EmailRenderer(
+                symbols, self._load_named_values("email_domains.value", lang))
+        return self._email_renderers[lang]
+
+    def _get_name_parts(self, name: str, user_profile: dict) -> dict:
         """
         Parse a name string into first/middle/last components
         :param user_profile: user preferences dict with keys:
             ('first_name', 'middle_name', 'last_name')
         :returns: dict of positional names extracted
         """
-        name_parts = name.split()
-        if len(name_parts) == 1:
-            name = {"first_name": name}
-        elif len(name_parts) == 2:
-            name = {"first_name": name_parts[0],
-                    "last_name": name_parts[1]}
-        elif len(name_parts) == 3:
-            name = {"first_name": name_parts[0],
-                    "middle_name": name_parts[1],
-                    "last_name": name_parts[2]}
-        else:
-            LOG.warning(f"Longer name than expected: {name}")
-            # TODO: Better logic here
-            name = {"first_name": name_parts[0],
-                    "middle_name": name_parts[1],
-                    "last_name": " ".join(name_parts[2:])}
+        first, middle, last = self._get_name_parser(self.lang).parse(name)
+        name = {"first_name": first}
+        if middle:
+            name["middle_name"] = middle
+        if last:
+            name["last_name"] = last
         name_parts = (name.get(n) or user_profile.get(n)
                       for n in ("first_name", "middle_name", "last_name"))
         name["full_name"] = " ".join((n for n in name_parts if n))
         return name
 
+    def _get_name_parser(self, lang: str) -> NameParser:
+        """
+        Get a cached NameParser for the requested language
+        :param lang: language to parse names in
+        :returns: NameParser for `lang`
+        """
+        if lang not in self._name_parsers:
+            self._name_parsers[lang] = NameParser(
+                self._load_list("name_particles", lang) or [],
+                self._load_list("name_suffixes", lang) or [])
+        return self._name_parsers[lang]
+
     @staticmethod
     def _get_timezone_from_location(location: dict) -> \
             Optional[Tuple[str, float]]:
@@ -1186,5 +2109,31 @@ class UserSettingsSkill(NeonSkill):
             return None
         return place
 
+    def _cancel_gui_prompts(self, session_id: Optional[str] = None) -> bool:
+        """
+        Cancel pending GUI prompts for one session, or all sessions
+        :param session_id: session to cancel a prompt for, else cancel all
+        :returns: True if any prompt was cancelled
+        """
+        with self._gui_prompts_lock:
+            prompt_ids = [p.prompt_id for sid, p in self._gui_prompts.items()
+                          if session_id is None or sid == session_id]
+        for prompt_id in prompt_ids:
+            self._resolve_gui_prompt(prompt_id=prompt_id)
+        return bool(prompt_ids)
+
+    def stop_session(self, session: Session) -> bool:
+        """
+        Cancel the pending GUI prompt of the session that requested `stop`
+        :param session: Session to stop
+        :returns: True if a prompt was cancelled
+        """
+        return self._cancel_gui_prompts(session.session_id)
+
     def stop(self):
-        pass
+        # Only the session that requested `stop` has its prompt cancelled
+        self._cancel_gui_prompts(self._get_session_id(dig_for_message()))
+
+    def shutdown(self):
+        self._cancel_gui_prompts()
+        self._recent_places.flush()
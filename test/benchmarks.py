@@ -0,0 +1,299 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare the skill's optimized code paths with the code they replace. Tests
+check that fast paths are taken (i.e. that a fallback is not called); how
+much faster they are depends on the machine, so it is measured here instead
+of asserted. Example:
+
+    python test/benchmarks.py --rounds 20 extract_birthday
+"""
+
+import argparse
+
+from datetime import datetime
+from os.path import dirname
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = dirname(dirname(__file__))
+BENCHMARKS: Dict[str, Callable[[int], Tuple[float, float]]] = dict()
+
+
+def benchmark(func: Callable[[int], Tuple[float, float]]):
+    """
+    Register a benchmark. Benchmarks take a number of rounds and return the
+    seconds spent in the baseline and the optimized code paths.
+    """
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _timed(func: Callable, rounds: int) -> float:
+    start = perf_counter()
+    for _ in range(rounds):
+        func()
+    return perf_counter() - start
+
+
+@benchmark
+def extract_birthday(rounds: int) -> Tuple[float, float]:
+    """
+    Spoken birth dates parsed with `extract_datetime` and the compiled
+    month-name pattern
+    """
+    from dateutil.tz import gettz
+    from lingua_franca import load_language
+    from lingua_franca.parse import extract_datetime
+    from ovos_workshop.resource_files import SkillResources
+    from skill_user_settings.util.date_parser import compile_date_pattern, \
+        extract_date
+
+    lang = "en-us"
+    load_language(lang)
+    months = {name.lower(): int(num) for name, num in SkillResources(
+        ROOT, lang).load_named_value_file("months.value").items()}
+    pattern = compile_date_pattern(months)
+    now = datetime.now(gettz("America/Los_Angeles"))
+    corpus = [phrase.format(name=name, day=day, year=year)
+              for name in ("january", "may", "august", "december")
+              for day in (1, 2, 12, 21, 28)
+              for year in ("", " 1990", ", 1985")
+              for phrase in ("my birthday is {name} {day}{year}",
+                             "my birthday is the {day}th of {name}{year}",
+                             "i was born on {name} {day}th{year}")]
+    baseline = _timed(lambda: [extract_datetime(u, now, lang)
+                               for u in corpus], rounds)
+    optimized = _timed(lambda: [extract_date(pattern, months, u, now)
+                                for u in corpus], rounds)
+    return baseline, optimized
+
+
+@benchmark
+def parse_names(rounds: int) -> Tuple[float, float]:
+    """
+    Repeated names parsed without and with the parse cache
+    """
+    from itertools import product
+    from skill_user_settings.util.name_parser import NameParser
+
+    corpus = [" ".join(p for p in parts if p) for parts in product(
+        ("Anna", "Bohdan", "Carlos", "Daniel", "Emma", "Fatima"),
+        ("", "Lee", "Maria Jose"),
+        ("Smith", "van Dijk", "de la Cruz", "Al-Sayed", "Kovalenko"),
+        ("", "Jr", "III"))]
+    parser = NameParser(["van", "de", "al"], ["jr", "iii"],
+                        cache_size=4096)
+    baseline = _timed(lambda: [parser._parse(n) for n in corpus], rounds)
+    # Warm the cache, as the skill's parser is after the first requests
+    for name in corpus:
+        parser.parse(name)
+    optimized = _timed(lambda: [parser.parse(n) for n in corpus], rounds)
+    return baseline, optimized
+
+
+@benchmark
+def extract_languages(rounds: int) -> Tuple[float, float]:
+    """
+    Requested languages extracted by reading and searching with each `.rx`
+    pattern per request and with the single combined pattern
+    """
+    import re
+    import yaml
+    from os.path import join
+    from skill_user_settings.util.language_parser import \
+        LanguageExtractor, read_patterns
+
+    lang = "en-us"
+    regex_dir = join(ROOT, "locale", lang, "regex")
+    primary = join(regex_dir, "primary_tts.rx")
+    secondary = join(regex_dir, "secondary_tts.rx")
+    extractor = LanguageExtractor(read_patterns(primary),
+                                  read_patterns(secondary))
+    with open(join(ROOT, "test", "test_intents.yaml")) as f:
+        corpus = [f"{list(u)[0] if isinstance(u, dict) else u}\n"
+                  for utterances in yaml.safe_load(f)[lang].values()
+                  for u in utterances]
+
+    def _search(rx_file, utterance, group):
+        for pattern in read_patterns(rx_file):
+            match = re.search(pattern, utterance)
+            if match:
+                return match.group(group).strip()
+
+    baseline = _timed(lambda: [(_search(primary, u, "rx_primary"),
+                                _search(secondary, u, "rx_secondary"))
+                               for u in corpus], rounds)
+    optimized = _timed(lambda: [extractor.extract(u) for u in corpus],
+                       rounds)
+    return baseline, optimized
+
+
+@benchmark
+def read_resources(rounds: int) -> Tuple[float, float]:
+    """
+    Runtime resources read from loose locale files and from a built bundle
+    """
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from ovos_workshop.resource_files import SkillResources
+    from skill_user_settings.util.language_parser import read_patterns
+    from skill_user_settings.util.resource_bundle import ResourceBundle, \
+        build_bundle
+
+    lang_dir = join(ROOT, "locale", "en-us")
+    values = ("languages.value", "months.value", "email_domains.value")
+    lists = ("name_particles", "name_suffixes")
+    patterns = ("primary_tts.rx", "secondary_tts.rx")
+
+    def _read_loose():
+        resources = SkillResources(ROOT, "en-us")
+        for name in values:
+            resources.load_named_value_file(name)
+        for name in lists:
+            resources.load_list_file(name)
+        for name in patterns:
+            read_patterns(join(lang_dir, "regex", name))
+        resources.load_vocabulary_file("dot.voc")
+
+    with TemporaryDirectory() as tmp:
+        bundle_file = join(tmp, "en-us.bundle")
+        build_bundle(lang_dir, bundle_file)
+
+        def _read_bundle():
+            # The skill keeps one bundle per language
+            for name in values:
+                bundle.load_named_values(name)
+            for name in lists:
+                bundle.load_list(name)
+            for name in patterns:
+                bundle.load_patterns(name)
+            bundle.load_vocabulary("dot.voc")
+
+        baseline = _timed(_read_loose, rounds)
+        start = perf_counter()
+        bundle = ResourceBundle(bundle_file)
+        optimized = _timed(_read_bundle, rounds) + perf_counter() - start
+    return baseline, optimized
+
+
+@benchmark
+def rate_limiter_users(rounds: int) -> Tuple[float, float]:
+    """
+    Rate limit checks with 1000 tracked users and with 50 times as many
+    users making requests, per 1000 checks. A ratio near 1 means the cost of
+    a check does not grow with the number of users.
+    """
+    from skill_user_settings.util.rate_limiter import RateLimiter
+
+    def _check_users(first: int, count: int):
+        limiter = RateLimiter({"settings": {"user_rate": 60,
+                                            "user_burst": 5}},
+                              max_users=1000)
+        return _timed(lambda: [limiter.try_acquire(f"user_{idx}",
+                                                   ["settings"])
+                               for idx in range(first, first + count)],
+                      rounds)
+
+    baseline = _check_users(0, 1000)
+    optimized = _check_users(0, 50000) / 50
+    return baseline, optimized
+
+
+@benchmark
+def profile_patches(rounds: int) -> Tuple[float, float]:
+    """
+    A profile change delivered to 100 caches as a complete profile and as a
+    patch, including deserializing each message
+    """
+    import json
+    from copy import deepcopy
+    from neon_utils.user_utils import get_default_user_config
+    from skill_user_settings.util.profile_cache import ProfileCache, \
+        profile_fingerprint
+    from skill_user_settings.util.profile_patch import make_patch
+
+    profile = deepcopy(get_default_user_config())
+    profile["user"]["username"] = "test_user"
+    updated = deepcopy(profile)
+    updated["speech"]["speed_multiplier"] = 1.1
+    base_version, version = (1, "a"), (2, "a")
+    update_message = json.dumps({"profile": updated})
+    patch_message = json.dumps({
+        "username": "test_user", "base_version": base_version,
+        "version": version, "patch": make_patch(profile, updated),
+        "fingerprint": profile_fingerprint(updated),
+        "supersedes": profile_fingerprint(profile)})
+
+    def _receivers():
+        caches = [ProfileCache() for _ in range(100)]
+        for cache in caches:
+            cache.update("test_user", profile, base_version)
+        return caches
+
+    def _deliver_update():
+        for cache in _receivers():
+            cache.update("test_user", json.loads(update_message)["profile"],
+                         version)
+
+    def _deliver_patch():
+        for cache in _receivers():
+            data = json.loads(patch_message)
+            cache.apply_patch(data["username"], data["patch"],
+                              data["base_version"], data["version"],
+                              data["fingerprint"], data["supersedes"])
+
+    # Setting up receivers costs the same for both
+    setup = _timed(_receivers, rounds)
+    return _timed(_deliver_update, rounds) - setup, \
+        _timed(_deliver_patch, rounds) - setup
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)} "
+                             f"(default all)")
+    parser.add_argument("--rounds", type=int, default=10,
+                        help="times to repeat each benchmark")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    print(f"{'benchmark':<24} {'baseline ms':>12} {'optimized ms':>13} "
+          f"{'speedup':>8}")
+    for name in args.names or BENCHMARKS:
+        baseline, optimized = BENCHMARKS[name](args.rounds)
+        print(f"{name:<24} {baseline * 1000:>12.1f} "
+              f"{optimized * 1000:>13.1f} "
+              f"{baseline / max(optimized, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Replay the utterances in `test_intents.yaml` against an in-process instance
+of the skill to measure how many requests per second it can sustain.
+
+Network backends (geocoding, timezone, and language support) are replaced
+with local stand-ins with configurable latency and user prompts are answered
+immediately, so results reflect the skill's own overhead plus the simulated
+backend latency. Example:
+
+    python test/load_generator.py --users 1,4,16,64 --requests 500 \
+        --geocode-latency 0.05
+"""
+
+import argparse
+import random
+import tracemalloc
+import yaml
+
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from os.path import dirname, join
+from statistics import quantiles
+from threading import Lock
+from time import monotonic, sleep
+from typing import List, Tuple
+
+from mock import patch
+from ovos_bus_client import Message
+try:
+    from ovos_utils.fakebus import FakeBus
+except ImportError:
+    from ovos_utils.messagebus import FakeBus
+
+SKILL_ID = "skill-user_settings.neongeckocom"
+
+
+class LocalBackends:
+    """
+    Local stand-ins for the network services the skill calls
+    """
+    def __init__(self, geocode_latency: float = 0.0,
+                 timezone_latency: float = 0.0,
+                 languages_latency: float = 0.0):
+        self.geocode_latency = geocode_latency
+        self.timezone_latency = timezone_latency
+        self.languages_latency = languages_latency
+
+    def get_full_location(self, location: str, lang: str = None) -> dict:
+        sleep(self.geocode_latency)
+        return {"lat": "47.6038321", "lon": "-122.330062",
+                "address": {"city": location.title(), "state": "Washington",
+                            "country": "United States"}}
+
+    def get_timezone(self, lat, lng) -> Tuple[str, float]:
+        sleep(self.timezone_latency)
+        return "America/Los_Angeles", -7.0
+
+    def get_supported_languages(self):
+        from neon_utils.language_utils import SupportedLanguages
+        sleep(self.languages_latency)
+        return SupportedLanguages({'en', 'uk', 'es', 'fr', 'de'},
+                                  {'en', 'uk', 'es', 'fr', 'de'},
+                                  {'en', 'uk', 'es', 'fr', 'de'})
+
+    def patch(self):
+        return [patch("neon_utils.location_utils.get_full_location",
+                      self.get_full_location),
+                patch("skill_user_settings.get_timezone", self.get_timezone),
+                patch("skill_user_settings.get_supported_languages",
+                      self.get_supported_languages),
+                patch("neon_utils.net_utils.check_online", lambda: True)]
+
+
+def load_skill(bus: FakeBus):
+    """
+    Load the skill with user prompts answered immediately
+    """
+    from skill_user_settings import UserSettingsSkill
+    skill = UserSettingsSkill(skill_id=SKILL_ID, bus=bus)
+    skill.ask_yesno = lambda *args, **kwargs: "yes"
+    skill.get_gui_input_async = \
+        lambda callback, *args, **kwargs: callback(None)
+    return skill
+
+
+def build_requests(skill, lang: str = "en-us") -> List[Tuple[str, dict]]:
+    """
+    Build (message type, data) pairs for each test utterance in `lang`
+    """
+    with open(join(dirname(__file__), "test_intents.yaml")) as f:
+        test_intents = yaml.safe_load(f)[lang]
+    prefix = skill.alphanumeric_skill_id
+    vocab = dict()
+    for method in (getattr(skill, name) for name in dir(skill)
+                   if name.startswith("handle_")):
+        for intent in getattr(method, "intents", []):
+            if isinstance(intent, str):
+                vocab[intent] = list()
+                continue
+            names = [v[0] for v in intent.requires + intent.optional] + \
+                [v for one_of in intent.at_least_one for v in one_of]
+            vocab[intent.name.split(':')[-1]] = \
+                [v.replace(prefix, '', 1) for v in names]
+    requests = list()
+    for intent_name, utterances in test_intents.items():
+        if intent_name not in vocab:
+            continue
+        for utterance in utterances:
+            data = {"utterance": utterance, "lang": lang}
+            if isinstance(utterance, dict):
+                data["utterance"], expected = next(iter(utterance.items()))
+                for entity in expected:
+                    if isinstance(entity, dict):
+                        data.update(entity)
+                    else:
+                        data[entity] = entity
+            for voc in vocab[intent_name]:
+                if voc not in data and \
+                        skill.voc_match(data["utterance"], voc, lang):
+                    data[voc] = voc
+            requests.append((f"{SKILL_ID}:{intent_name}", data))
+    return requests
+
+
+def run_load(skill, bus: FakeBus, requests: List[Tuple[str, dict]],
+             users: int, total: int) -> dict:
+    """
+    Send `total` requests from `users` concurrent users and collect timing
+    """
+    from neon_utils.user_utils import get_default_user_config
+    default_profile = get_default_user_config()
+    latencies = list()
+    errors = 0
+    lock = Lock()
+
+    def _on_error(_):
+        nonlocal errors
+        with lock:
+            errors += 1
+
+    def _user_session(user: int, count: int):
+        profile = deepcopy(default_profile)
+        profile["user"]["username"] = f"user_{user}"
+        context = {"username": f"user_{user}", "user_profiles": [profile],
+                   "neon_in_request": True,
+                   "session": {"session_id": f"session_{user}"}}
+        for _ in range(count):
+            msg_type, data = random.choice(requests)
+            start = monotonic()
+            bus.emit(Message(msg_type, deepcopy(data), context))
+            elapsed = monotonic() - start
+            with lock:
+                latencies.append(elapsed)
+
+    bus.on("mycroft.skill.handler.error", _on_error)
+    rejected = skill._handler_limiter.rejected
+    start = monotonic()
+    with ThreadPoolExecutor(users) as pool:
+        for user in range(users):
+            pool.submit(_user_session, user, total // users)
+    duration = monotonic() - start
+    bus.remove("mycroft.skill.handler.error", _on_error)
+    cuts = quantiles(latencies, n=100)
+    return {"users": users,
+            "requests": len(latencies),
+            "throughput": len(latencies) / duration,
+            "p50": cuts[49], "p95": cuts[94], "p99": cuts[98],
+            "errors": errors,
+            "rejected": skill._handler_limiter.rejected - rejected}
+
+
+def find_saturation(results: List[dict], threshold: float = 0.1):
+    """
+    Get the first user count where adding users improved throughput by less
+    than `threshold`
+    """
+    for prev, current in zip(results, results[1:]):
+        if current["throughput"] < prev["throughput"] * (1 + threshold):
+            return current["users"]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", default="1,2,4,8,16,32",
+                        help="comma-separated concurrent user counts")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="requests to send at each user count")
+    parser.add_argument("--lang", default="en-us")
+    parser.add_argument("--geocode-latency", type=float, default=0.0)
+    parser.add_argument("--timezone-latency", type=float, default=0.0)
+    parser.add_argument("--languages-latency", type=float, default=0.0)
+    parser.add_argument("--memory", action="store_true",
+                        help="report memory retained per user")
+    args = parser.parse_args()
+
+    from skill_user_settings.util.memory import get_memory_report
+    backends = LocalBackends(args.geocode_latency, args.timezone_latency,
+                             args.languages_latency)
+    patches = backends.patch()
+    for p in patches:
+        p.start()
+    bus = FakeBus()
+    skill = load_skill(bus)
+    requests = build_requests(skill, args.lang)
+    print(f"Replaying {len(requests)} utterances ({args.lang})")
+    print(f"{'users':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'busy':>6}")
+    results = list()
+    memory = list()
+    if args.memory:
+        tracemalloc.start()
+    for users in (int(u) for u in args.users.split(',')):
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = run_load(skill, bus, requests, users, args.requests)
+        results.append(result)
+        if args.memory:
+            memory.append((users,
+                           tracemalloc.get_traced_memory()[0] - baseline,
+                           get_memory_report(skill._memory_structures)))
+        print(f"{users:>6} {result['throughput']:>9.1f} "
+              f"{result['p50'] * 1000:>8.1f} {result['p95'] * 1000:>8.1f} "
+              f"{result['p99'] * 1000:>8.1f} {result['errors']:>7} "
+              f"{result['rejected']:>6}")
+    saturation = find_saturation(results)
+    print(f"Saturation point: {saturation or 'not reached'} users")
+    for users, retained, report in memory:
+        print(f"{users:>6} users: {retained / users:>10.0f} B retained/user "
+              f"{report['structures']}")
+    skill.shutdown()
+    for p in patches:
+        p.stop()
+
+
+if __name__ == "__main__":
+    main()
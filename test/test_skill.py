@@ -30,9 +30,12 @@ import unittest
 import mock
 import os
 
+from os.path import join
+from tempfile import mkdtemp
+from threading import Event
 from time import sleep
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 from dateutil.tz import gettz
 from mock import Mock
@@ -43,8 +46,15 @@ from ovos_bus_client import Message
 
 from neon_minerva.tests.skill_unit_test_base import SkillTestCase
 
+from geocode_replay import GeocodeReplay
+
 
 os.environ["TEST_SKILL_ENTRYPOINT"] = "skill-user_settings.neongeckocom"
+# Each test process (i.e. each pytest-xdist worker) gets its own skill file
+# system, which is removed in `tearDownClass`
+SkillTestCase.test_fs = mkdtemp(prefix="skill_fs_")
+os.environ["XDG_DATA_HOME"] = join(SkillTestCase.test_fs, "data")
+os.environ["XDG_CONFIG_HOME"] = join(SkillTestCase.test_fs, "config")
 
 
 class TestSkill(SkillTestCase):
@@ -57,10 +67,24 @@ class TestSkill(SkillTestCase):
     def setUpClass(cls, get_langs) -> None:
         get_langs.return_value = SupportedLanguages({'en'}, {'en'}, {'en'})
         SkillTestCase.setUpClass()
+        cls.geocoder = GeocodeReplay()
+        cls.geocoder.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.geocoder.stop()
+        SkillTestCase.tearDownClass()
 
     def setUp(self):
+        from skill_user_settings.util.profile_cache import ProfileCache
+        from skill_user_settings.util.recent_places import RecentPlaces
         SkillTestCase.setUp(self)
         self.user_config = deepcopy(self.default_config)
+        # Per-user state and counters start empty so tests do not depend on
+        # the order they run in (or which pytest-xdist worker runs them)
+        self.skill._profiles = ProfileCache()
+        self.skill._recent_places = RecentPlaces()
+        self.skill._rate_limiter.reset()
 
     def test_00_skill_init(self):
         # Test any parameters expected to be set in init or initialize methods
@@ -94,6 +118,212 @@ class TestSkill(SkillTestCase):
 
         self.skill._languages = real_languages
 
+    @mock.patch("skill_user_settings.get_supported_languages")
+    def test_language_matrix(self, get_languages):
+        real_languages = self.skill._languages
+        get_languages.return_value = SupportedLanguages({'en', 'es'},
+                                                        {'en', 'uk'},
+                                                        {'en', 'uk'})
+        self.skill._languages = None
+        responses = list()
+        self.skill.bus.on("neon.user_settings.get_languages.response",
+                          responses.append)
+        self.skill.bus.emit(Message("neon.user_settings.get_languages",
+                                    {"lang": "en-us"}))
+        matrix = responses[0].data
+        version = matrix["version"]
+        self.assertEqual(matrix["languages"], [
+            {"code": "en", "name": "English", "stt": True, "tts": True,
+             "skills": True, "genders": ["female", "male"]},
+            {"code": "es", "name": "Spanish", "stt": False, "tts": False,
+             "skills": False, "genders": []},
+            {"code": "uk", "name": "Ukrainian", "stt": False, "tts": True,
+             "skills": True, "genders": ["female", "male"]}])
+
+        # Matrix is cached until supported languages change
+        self.skill.bus.emit(Message("neon.user_settings.get_languages",
+                                    {"lang": "en-us"}))
+        self.assertEqual(responses[1].data, matrix)
+
+        # Display languages lingua_franca does not support fall back to
+        # English names
+        from lingua_franca import load_language
+        from lingua_franca.format import pronounce_lang
+        from lingua_franca.internal import UnsupportedLanguageError
+
+        def _load_language(lang):
+            if lang == "uk-ua":
+                raise UnsupportedLanguageError(lang)
+            load_language(lang)
+
+        def _pronounce_lang(code, lang):
+            if lang == "uk-ua":
+                raise ModuleNotFoundError("No language module loaded.")
+            return pronounce_lang(code, lang)
+
+        with mock.patch("skill_user_settings.load_language", _load_language), \
+                mock.patch("skill_user_settings.util.language_names."
+                           "pronounce_lang", _pronounce_lang):
+            self.skill.bus.emit(Message("neon.user_settings.get_languages",
+                                        {"lang": "uk-ua"}))
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(responses[2].data["version"], version)
+        self.assertEqual([lang["name"] for lang in
+                          responses[2].data["languages"]],
+                         ["English", "Spanish", "Ukrainian"])
+        responses = responses[:2]
+        get_languages.assert_called_once()
+
+        published = list()
+        self.skill.bus.on("neon.user_settings.languages", published.append)
+        self.skill.bus.emit(Message("mycroft.ready"))
+        self.assertEqual(get_languages.call_count, 2)
+        self.assertEqual(published, [])
+
+        # Handlers read the previous languages until the refresh completes
+        during_refresh = list()
+
+        def _get_languages():
+            during_refresh.append((self.skill._languages,
+                                   self.skill.stt_languages))
+            return SupportedLanguages({'en', 'uk'}, {'en', 'uk'},
+                                      {'en', 'uk'})
+
+        get_languages.side_effect = _get_languages
+        self.skill.bus.emit(Message("mycroft.ready"))
+        get_languages.side_effect = None
+        self.assertEqual(during_refresh, [(SupportedLanguages(
+            {'en', 'es'}, {'en', 'uk'}, {'en', 'uk'}), {'en'})])
+        self.assertEqual(self.skill._languages.stt, {'en', 'uk'})
+        self.assertEqual(published[0].data["version"], version + 1)
+        self.assertTrue(published[0].data["languages"][1]["stt"])
+
+        # Support is unknown if a service did not respond
+        self.skill._languages = SupportedLanguages(set(), {'en'}, {'en'})
+        matrix = self.skill._get_language_matrix("en-us")
+        self.assertEqual(matrix["version"], version + 2)
+        self.assertEqual(matrix["languages"], [
+            {"code": "en", "name": "English", "stt": None, "tts": True,
+             "skills": True, "genders": ["female", "male"]}])
+
+        self.skill.bus.remove("neon.user_settings.get_languages.response",
+                              responses.append)
+        self.skill.bus.remove("neon.user_settings.languages",
+                              published.append)
+        self.skill._languages = real_languages
+
+    def test_concurrency_limited(self):
+        real_limiter = self.skill._handler_limiter
+        from skill_user_settings.util.handler_limiter import HandlerLimiter
+        self.skill._handler_limiter = HandlerLimiter(max_concurrent=1,
+                                                     max_queued=0)
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_message = Message("test", {"permit": "enable"},
+                               {"username": "test_user",
+                                "user_profiles": [test_profile]})
+
+        # Skill busy
+        self.assertTrue(self.skill._handler_limiter.try_acquire("other_user"))
+        self.skill.handle_speak_hesitation(test_message)
+        self.skill.speak_dialog.assert_called_once_with("skill_busy",
+                                                        private=True)
+
+        # Request handled
+        self.skill._handler_limiter.release("other_user")
+        self.skill.handle_speak_hesitation(test_message)
+        self.skill.speak_dialog.assert_called_with("hesitation_enabled",
+                                                   private=True)
+
+        # Stats reported
+        response = self.skill.bus.wait_for_response(
+            Message("neon.user_settings.get_stats"))
+        self.assertEqual(response.data["handlers"]["rejected"], 1)
+        self.assertEqual(response.data["handlers"]["completed"], 2)
+
+        self.skill._handler_limiter = real_limiter
+
+    def test_memory_report(self):
+        from skill_user_settings.util.birthday_scheduler import \
+            BirthdayScheduler
+        from skill_user_settings.util.memory import deep_getsizeof
+        from skill_user_settings.util.profile_cache import ProfileCache
+        from skill_user_settings.util.rate_limiter import RateLimiter
+        from skill_user_settings.util.recent_places import RecentPlaces
+        from skill_user_settings.util.timezones import TimezoneRegistry
+        response = self.skill.bus.wait_for_response(
+            Message("neon.user_settings.get_stats", {"memory": True}))
+        structures = response.data["memory"]["structures"]
+        for name in ("languages", "gui_prompts", "handler_limiter",
+                     "profiles", "rate_limiter", "recent_places", "birthdays",
+                     "timezones"):
+            self.assertIsInstance(structures[name], int)
+
+        # Per-user state does not grow beyond each store's limit
+        real_stores = (self.skill._rate_limiter, self.skill._birthdays,
+                       self.skill._timezones)
+        real_ask_yesno = self.skill.ask_yesno
+        real_get_location = self.skill._get_location_from_spoken_location
+        self.skill._profiles = ProfileCache(max_users=10)
+        self.skill._rate_limiter = RateLimiter({
+            "settings": {"user_rate": 30, "user_burst": 20},
+            "geocode": {"user_rate": 6, "user_burst": 3}}, max_users=20)
+        self.skill._recent_places = RecentPlaces(max_users=10)
+        self.skill._birthdays = BirthdayScheduler(max_users=10)
+        self.skill._timezones = TimezoneRegistry(max_unknown=10)
+        self.skill.ask_yesno = Mock(return_value="no")
+        self.skill._get_location_from_spoken_location = Mock(return_value={
+            "lat": "33.4484367", "lon": "-112.074141",
+            "address": {"city": "Phoenix", "state": "Arizona",
+                        "country": "United States"}})
+
+        def _user_state():
+            return deep_getsizeof((self.skill._gui_prompts,
+                                   self.skill._handler_limiter,
+                                   self.skill._profiles,
+                                   self.skill._rate_limiter,
+                                   self.skill._recent_places,
+                                   self.skill._birthdays,
+                                   self.skill._timezones))
+
+        def _handle_users(first, count):
+            for i in range(first, first + count):
+                # Fixed-width names so each user's state is the same size
+                username = f"user_{i:04d}"
+                profile = deepcopy(self.default_config)
+                profile["user"]["username"] = username
+                profile["user"]["dob"] = "2000/03/01"
+                # Unknown timezones are cached per name
+                profile["location"]["tz"] = "Not/A_" + "".join(
+                    chr(ord("a") + int(d)) for d in f"{i:04d}")
+                context = {"username": username, "user_profiles": [profile]}
+                self.skill.bus.emit(Message("neon.profile_update",
+                                            {"profile": profile}, context))
+                self.skill.handle_speak_hesitation(
+                    Message("test", {"deny": "disable"}, context))
+                with mock.patch("skill_user_settings.get_timezone",
+                                return_value=("America/Phoenix", -7.0)):
+                    self.skill.handle_change_location_timezone(
+                        Message("test", {"timezone": "timezone",
+                                         "rx_place": "phoenix"}, context))
+
+        try:
+            _handle_users(0, 20)
+            baseline = _user_state()
+            self.assertEqual(len(self.skill._profiles), 10)
+            self.assertEqual(len(self.skill._birthdays), 10)
+            self.assertEqual(len(self.skill._timezones._unknown), 10)
+            self.assertEqual(self.skill._recent_places.stats["users"], 10)
+            self.assertEqual(self.skill._rate_limiter.stats["users"], 20)
+            _handle_users(20, 20)
+            # Only stats counters may grow, once they exceed cached small ints
+            self.assertLess(_user_state() - baseline, 128)
+        finally:
+            self.skill._rate_limiter, self.skill._birthdays, \
+                self.skill._timezones = real_stores
+            self.skill.ask_yesno = real_ask_yesno
+            self.skill._get_location_from_spoken_location = real_get_location
+
     def test_location_update(self):
         # TODO: Test ipgeo update at init
         pass
@@ -140,6 +370,344 @@ class TestSkill(SkillTestCase):
             test_message.context["user_profiles"][0]["units"]["measure"],
             "imperial")
 
+    def test_profile_cache_coherence(self):
+        from skill_user_settings.util.profile_cache import profile_fingerprint
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_profile["units"]["measure"] = "metric"
+        test_message = Message("test", {"imperial": "imperial"},
+                               {"username": "test_user",
+                                "user_profiles": [test_profile]})
+        stale_profile = deepcopy(get_user_prefs(test_message))
+        updates = list()
+        self.skill.bus.on("neon.profile_update", updates.append)
+
+        # Updates are broadcast with a version for other instances
+        self.skill.handle_unit_change(test_message)
+        self.assertEqual(len(updates), 1)
+        version = tuple(updates[0].context["profile_version"])
+        self.assertEqual(version, (1, self.skill._instance_id))
+        self.assertEqual(updates[0].context["profile_supersedes"],
+                         profile_fingerprint(stale_profile))
+        self.assertNotIn("profile_version", test_message.context)
+        self.assertEqual(self.skill._profiles.version("test_user"), version)
+
+        # Another device sends the profile from before the update
+        other_device = Message("test", {"imperial": "imperial"},
+                               {"username": "test_user",
+                                "user_profiles": [deepcopy(stale_profile)]})
+        self.skill.handle_unit_change(other_device)
+        self.skill.speak_dialog.assert_called_with("units_already_set",
+                                                   {"unit": "imperial"},
+                                                   private=True)
+        self.assertEqual(other_device.context["user_profiles"][0]["units"]
+                         ["measure"], "imperial")
+        self.assertEqual(len(updates), 1)
+
+        # Another instance changes the profile
+        latest = deepcopy(test_message.context["user_profiles"][0])
+        latest["units"]["measure"] = "metric"
+        self.skill.bus.emit(Message(
+            "neon.profile_update", {"profile": latest},
+            {"profile_version": [2, "other_instance"],
+             "profile_supersedes": profile_fingerprint(
+                 test_message.context["user_profiles"][0])}))
+        self.skill.handle_unit_change(test_message)
+        self.skill.speak_dialog.assert_called_with("units_changed",
+                                                   {"unit": "imperial"},
+                                                   private=True)
+        self.assertEqual(self.skill._profiles.version("test_user"),
+                         (3, self.skill._instance_id))
+
+        # Delayed updates from other instances are ignored
+        self.skill.bus.emit(Message(
+            "neon.profile_update", {"profile": latest},
+            {"profile_version": [2, "other_instance"]}))
+        self.assertEqual(self.skill._profiles.version("test_user"),
+                         (3, self.skill._instance_id))
+        stats = self.skill._profiles.stats
+        self.assertEqual(stats["stale_reads"], 2)
+        self.assertEqual(stats["stale_updates"], 1)
+        self.skill.bus.remove("neon.profile_update", updates.append)
+
+    def test_profile_patches(self):
+        from neon_utils.configuration_utils import dict_update_keys
+        from neon_utils.user_utils import get_default_user_config
+        from skill_user_settings.util.profile_cache import ProfileCache, \
+            profile_fingerprint
+        from skill_user_settings.util.profile_patch import make_patch
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_profile["speech"]["speed_multiplier"] = 1.0
+        test_message = Message("test", {}, {"username": "test_user",
+                                            "user_profiles": [test_profile]})
+        patches = list()
+        self.skill.bus.on("neon.profile_patch", patches.append)
+
+        # Another instance of the skill, handling updates the same way
+        other = ProfileCache()
+
+        def _on_update(message):
+            profile = message.data["profile"]
+            version = message.context.get("profile_version")
+            username = profile["user"]["username"]
+            if not (version and other.version(username) == tuple(version)):
+                other.update(username,
+                             dict_update_keys(deepcopy(profile),
+                                              get_default_user_config()),
+                             version, message.context.get("profile_supersedes"))
+
+        def _on_patch(message):
+            other.apply_patch(message.data["username"], message.data["patch"],
+                              message.data["base_version"],
+                              message.data["version"],
+                              message.data["fingerprint"],
+                              message.data.get("supersedes"))
+
+        self.skill.bus.on("neon.profile_update", _on_update)
+        self.skill.bus.on("neon.profile_patch", _on_patch)
+
+        # Patches are opt-in
+        self.skill._update_user_profile({"speech": {"speed_multiplier": 1.1}},
+                                        test_message)
+        self.assertEqual(patches, [])
+        self.assertEqual(other.stats["updates"], 1)
+
+        self.skill.settings["profile_patches"] = True
+        base_version = self.skill._profiles.version("test_user")
+        self.skill._update_user_profile({"speech": {"speed_multiplier": 1.2}},
+                                        test_message)
+        self.assertEqual(len(patches), 1)
+        patch = patches[0].data
+        self.assertEqual(patch["patch"],
+                         [{"op": "replace", "path": "/speech/speed_multiplier",
+                           "value": 1.2}])
+        self.assertEqual(tuple(patch["base_version"]), base_version)
+        self.assertEqual(tuple(patch["version"]),
+                         self.skill._profiles.version("test_user"))
+
+        # The other instance applied the patch and skipped the complete
+        # profile with the same version
+        updated = self.skill._get_user_prefs(test_message)
+        self.assertEqual(updated["speech"]["speed_multiplier"], 1.2)
+        self.assertEqual(other.stats["patches"], 1)
+        self.assertEqual(other.stats["updates"], 2)
+        self.assertEqual(other.stats["patch_gaps"], 0)
+        self.assertEqual(other.version("test_user"),
+                         self.skill._profiles.version("test_user"))
+        self.assertEqual(other.fingerprint("test_user"),
+                         profile_fingerprint(updated))
+        self.assertEqual(patch["fingerprint"], profile_fingerprint(updated))
+
+        # Profiles no instance has cached are not patched
+        new_profile = deepcopy(self.user_config)
+        new_profile["user"]["username"] = "new_user"
+        self.skill._update_user_profile(
+            {"speech": {"speed_multiplier": 1.3}},
+            Message("test", {}, {"username": "new_user",
+                                 "user_profiles": [new_profile]}))
+        self.assertEqual(len(patches), 1)
+        self.assertEqual(other.stats["patch_gaps"], 0)
+        self.skill.bus.remove("neon.profile_update", _on_update)
+        self.skill.bus.remove("neon.profile_patch", _on_patch)
+
+        # Patches from other instances are applied to the cached profile
+        patched = deepcopy(updated)
+        patched["speech"]["speed_multiplier"] = 1.5
+        self.skill.bus.emit(Message("neon.profile_patch", {
+            "username": "test_user", "base_version": patch["version"],
+            "version": [99, "other_instance"],
+            "patch": make_patch(updated, patched),
+            "fingerprint": profile_fingerprint(patched),
+            "supersedes": patch["fingerprint"]}))
+        self.assertEqual(self.skill._profiles.version("test_user"),
+                         (99, "other_instance"))
+        self.assertEqual(self.skill._get_user_prefs(test_message)["speech"]
+                         ["speed_multiplier"], 1.5)
+
+        # Patches after a missed update are dropped
+        self.skill.bus.emit(Message("neon.profile_patch", {
+            "username": "test_user", "base_version": [100, "other_instance"],
+            "version": [101, "other_instance"], "patch": [],
+            "fingerprint": "0123456789abcdef"}))
+        self.assertEqual(self.skill._profiles.version("test_user"),
+                         (99, "other_instance"))
+        self.assertEqual(self.skill._profiles.stats["patch_gaps"], 1)
+
+        self.skill.settings["profile_patches"] = False
+        self.skill.bus.remove("neon.profile_patch", patches.append)
+
+    def test_rate_limited(self):
+        real_get_location = self.skill._get_location_from_spoken_location
+        self.skill._get_location_from_spoken_location = Mock(return_value=None)
+        self.skill._rate_limiter.configure("settings", user_rate=1,
+                                           user_burst=3)
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_message = Message("test", {"imperial": "imperial"},
+                               {"username": "test_user",
+                                "user_profiles": [test_profile]})
+        for _ in range(3):
+            self.skill.handle_unit_change(test_message)
+            self.assertNotEqual(self.skill.speak_dialog.call_args[0][0],
+                                "rate_limited")
+        self.skill.handle_unit_change(test_message)
+        self.skill.speak_dialog.assert_called_with("rate_limited",
+                                                   private=True)
+
+        # Other users have their own budget
+        other_profile = deepcopy(self.user_config)
+        other_profile["user"]["username"] = "other_user"
+        self.skill.handle_unit_change(
+            Message("test", {"imperial": "imperial"},
+                    {"username": "other_user",
+                     "user_profiles": [other_profile]}))
+        self.assertNotEqual(self.skill.speak_dialog.call_args[0][0],
+                            "rate_limited")
+
+        # Requests that reach the geocoder also draw on the geocode budget
+        self.skill._rate_limiter.configure("geocode", user_rate=1,
+                                           user_burst=1)
+        location_message = Message("test", {"rx_place": "paris",
+                                            "location": "location"},
+                                   {"username": "other_user",
+                                    "user_profiles": [other_profile]})
+        self.skill.handle_change_location_timezone(location_message)
+        self.skill.speak_dialog.assert_called_with(
+            "location_not_found", {"location": "paris"}, private=True)
+        self.skill.handle_change_location_timezone(location_message)
+        self.skill.speak_dialog.assert_called_with("rate_limited",
+                                                   private=True)
+        self.skill._get_location_from_spoken_location.assert_called_once()
+
+        stats = self.skill._rate_limiter.stats["budgets"]
+        self.assertEqual(stats["settings"], {"allowed": 6,
+                                             "throttled_user": 1,
+                                             "throttled_global": 0})
+        self.assertEqual(stats["geocode"], {"allowed": 1,
+                                            "throttled_user": 1,
+                                            "throttled_global": 0})
+        self.skill._rate_limiter.configure("settings", user_rate=30,
+                                           user_burst=20, global_rate=600,
+                                           global_burst=50)
+        self.skill._rate_limiter.configure("geocode", user_rate=6,
+                                           user_burst=3, global_rate=60,
+                                           global_burst=5)
+        self.skill._get_location_from_spoken_location = real_get_location
+
+    def test_recent_places(self):
+        real_ask_yesno = self.skill.ask_yesno
+        real_get_location = self.skill._get_location_from_spoken_location
+        self.skill.ask_yesno = Mock(return_value="no")
+        phoenix = {"lat": "33.4484367", "lon": "-112.074141",
+                   "address": {"city": "Phoenix", "state": "Arizona",
+                               "country": "United States"}}
+        self.skill._get_location_from_spoken_location = \
+            Mock(return_value=deepcopy(phoenix))
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+
+        with mock.patch("skill_user_settings.get_timezone",
+                        return_value=("America/Phoenix", -7.0)) as get_tz:
+            # Repeated and mis-transcribed requests skip the geocode
+            for place in ("phoenix arizona", "Phoenix, Arizona.",
+                          "pheonix arizona"):
+                test_message = Message("test", {"timezone": "timezone",
+                                                "rx_place": place},
+                                       {"username": "test_user",
+                                        "user_profiles": [test_profile]})
+                self.skill.handle_change_location_timezone(test_message)
+                self.skill.speak_dialog.assert_called_with(
+                    "change_location_tz",
+                    {"type": "timezone", "location": "UTC -7.0"},
+                    private=True)
+                profile = test_message.context["user_profiles"][0]
+                self.assertEqual(profile["location"]["tz"], "America/Phoenix")
+                self.assertEqual(profile["location"]["utc"], -7.0)
+            self.skill._get_location_from_spoken_location.\
+                assert_called_once_with("phoenix arizona", "en-us")
+            get_tz.assert_called_once()
+
+            # Resolved city names do not match other requests
+            self.skill.handle_change_location_timezone(
+                Message("test", {"timezone": "timezone", "rx_place": "phoenix"},
+                        {"username": "test_user",
+                         "user_profiles": [test_profile]}))
+            self.assertEqual(
+                self.skill._get_location_from_spoken_location.call_count, 2)
+
+            # Recent places are per-user
+            other_profile = deepcopy(self.user_config)
+            other_profile["user"]["username"] = "other_user"
+            self.skill.handle_change_location_timezone(
+                Message("test", {"timezone": "timezone", "rx_place": "phoenix"},
+                        {"username": "other_user",
+                         "user_profiles": [other_profile]}))
+            self.assertEqual(
+                self.skill._get_location_from_spoken_location.call_count, 3)
+        self.assertEqual(self.skill._recent_places.stats["fuzzy_hits"], 1)
+
+        self.skill.ask_yesno = real_ask_yesno
+        self.skill._get_location_from_spoken_location = real_get_location
+
+    def test_settings_changed_events(self):
+        real_ask_yesno = self.skill.ask_yesno
+        real_get_location = self.skill._get_location_from_spoken_location
+        self.skill.ask_yesno = Mock(return_value="yes")
+        self.skill._get_location_from_spoken_location = Mock(return_value={
+            "lat": "33.4484367", "lon": "-112.074141",
+            "address": {"city": "Phoenix", "state": "Arizona",
+                        "country": "United States"}})
+        events = list()
+
+        def _on_event(message):
+            events.append((message.msg_type, message.data))
+
+        for event in ("neon.user_settings.location_changed",
+                      "neon.user_settings.units_changed"):
+            self.skill.bus.on(event, _on_event)
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_profile["units"]["measure"] = "metric"
+        test_profile["location"]["city"] = "Seattle"
+        test_profile["location"]["tz"] = "America/Los_Angeles"
+
+        def _message(data):
+            return Message("test", data, {"username": "test_user",
+                                          "user_profiles": [test_profile]})
+
+        self.skill.handle_unit_change(_message({"imperial": "imperial"}))
+        self.assertEqual(events, [("neon.user_settings.units_changed",
+                                   {"username": "test_user",
+                                    "old": {"measure": "metric"},
+                                    "new": {"measure": "imperial"}})])
+
+        # Unchanged settings emit nothing
+        events.clear()
+        test_profile["units"]["measure"] = "imperial"
+        self.skill.handle_unit_change(_message({"imperial": "imperial"}))
+        self.assertEqual(events, list())
+
+        # Only changed values are included
+        with mock.patch("skill_user_settings.get_timezone",
+                        return_value=("America/Phoenix", -7.0)):
+            self.skill.handle_change_location_timezone(
+                _message({"location": "location", "rx_place": "phoenix"}))
+        self.assertEqual([event[0] for event in events],
+                         ["neon.user_settings.location_changed"] * 2)
+        self.assertEqual(events[0][1]["old"]["tz"], "America/Los_Angeles")
+        self.assertEqual(events[0][1]["new"], {"tz": "America/Phoenix",
+                                               "utc": -7.0})
+        self.assertEqual(events[1][1]["old"]["city"], "Seattle")
+        self.assertEqual(events[1][1]["new"]["city"], "Phoenix")
+        self.assertNotIn("tz", events[1][1]["new"])
+
+        for event in ("neon.user_settings.location_changed",
+                      "neon.user_settings.units_changed"):
+            self.skill.bus.remove(event, _on_event)
+        self.skill.ask_yesno = real_ask_yesno
+        self.skill._get_location_from_spoken_location = real_get_location
+
     def test_handle_time_format_change(self):
         test_profile = self.user_config
         test_profile["user"]["username"] = "test_user"
@@ -387,7 +955,11 @@ class TestSkill(SkillTestCase):
         test_message: Optional[Message] = None
 
         def _init_test_message(voc, location):
-            nonlocal test_message
+            nonlocal test_message, test_profile
+            if test_message:
+                # Continue from the profile written by the last request
+                test_profile = \
+                    deepcopy(test_message.context["user_profiles"][0])
             test_message = Message("test", {voc: voc,
                                             "rx_place": location},
                                    {"username": "test_user",
@@ -395,7 +967,6 @@ class TestSkill(SkillTestCase):
 
         # Change location same tz
         _init_test_message("location", "new york")
-        sleep(1)
         self.skill.handle_change_location_timezone(test_message)
         self.skill.ask_yesno.assert_called_once_with(
             "also_change_location_tz", {"type": "timezone", "new": "new york"})
@@ -416,7 +987,6 @@ class TestSkill(SkillTestCase):
 
         # Change tz same location
         _init_test_message("timezone", "phoenix")
-        sleep(1)
         self.skill.handle_change_location_timezone(test_message)
         self.skill.ask_yesno.assert_called_once_with(
             "also_change_location_tz", {"type": "location", "new": "phoenix"})
@@ -436,7 +1006,6 @@ class TestSkill(SkillTestCase):
         # Change location and tz
         _init_test_message("location", "honolulu")
         new_city = "Honolulu"
-        sleep(1)
         self.skill.handle_change_location_timezone(test_message)
         self.skill.ask_yesno.assert_called_once_with(
             "also_change_location_tz", {"type": "timezone", "new": "honolulu"})
@@ -464,7 +1033,6 @@ class TestSkill(SkillTestCase):
 
         # Change tz and location
         _init_test_message("timezone", "phoenix")
-        sleep(1)
         self.skill.handle_change_location_timezone(test_message)
         self.skill.ask_yesno.assert_called_once_with(
             "also_change_location_tz", {"type": "location", "new": "phoenix"})
@@ -715,6 +1283,84 @@ class TestSkill(SkillTestCase):
                                                    {"birthday": "September 9"},
                                                    private=True)
 
+        test_message.data['utterance'] = "my birthday is the 5th of march 1990"
+        self.skill.handle_set_my_birthday(test_message)
+        self.skill.speak_dialog.assert_called_with("birthday_confirmed",
+                                                   {"birthday": "March 5"},
+                                                   private=True)
+
+        for utterance in ("my birthday is the 5th of march in 1990",
+                          "my birthday is march 5th of 1990"):
+            test_message.data['utterance'] = utterance
+            self.skill.handle_set_my_birthday(test_message)
+            self.skill.speak_dialog.assert_called_with(
+                "birthday_confirmed", {"birthday": "March 5"}, private=True)
+            self.assertEqual(test_message.context["user_profiles"][0]
+                             ["user"]["dob"], "1990/03/05")
+
+        # Dates of birth in the future are rejected
+        test_message.data['utterance'] = "my birthday is march 5th, 2090"
+        self.skill.handle_set_my_birthday(test_message)
+        self.skill.speak_dialog.assert_called_with("birthday_in_future",
+                                                   private=True)
+        self.assertEqual(test_message.context["user_profiles"][0]
+                         ["user"]["dob"], "1990/03/05")
+
+        # Dates without a year are not stored in the future
+        tomorrow = today + timedelta(days=1)
+        test_message.data['utterance'] = \
+            f"my birthday is {tomorrow.strftime('%B')} {tomorrow.day}"
+        self.skill.handle_set_my_birthday(test_message)
+        self.skill.speak_dialog.assert_called_with(
+            "birthday_confirmed", {"birthday": tomorrow.strftime("%B %-d")},
+            private=True)
+        dob = test_message.context["user_profiles"][0]["user"]["dob"]
+        self.assertLessEqual(dob, today.strftime("%Y/%m/%d"))
+        self.assertTrue(dob.endswith(tomorrow.strftime("/%m/%d")))
+
+        test_message.data['utterance'] = "my birthday is"
+        self.skill.handle_set_my_birthday(test_message)
+        self.skill.speak_dialog.assert_called_with("birthday_not_heard",
+                                                   private=True)
+
+    def test_extract_birthday(self):
+        from lingua_franca import load_language
+        from lingua_franca.parse import extract_datetime
+        lang = self.skill.lang
+        load_language(lang)
+        now = datetime.now(gettz("America/Los_Angeles"))
+        months = ("january", "february", "march", "april", "may", "june",
+                  "july", "august", "september", "october", "november",
+                  "december")
+        corpus = list()
+        for month, name in enumerate(months, 1):
+            for day in (1, 2, 3, 12, 21, 28):
+                for year in ("", " 1990", ", 1985"):
+                    corpus += [f"my birthday is {name} {day}{year}",
+                               f"my birthday is the {day}th of {name}{year}",
+                               f"my birthday is {day} {name}{year}",
+                               f"i was born on {name} {day}th{year}"]
+        # Common phrasings never reach extract_datetime and parse the same.
+        # See `test/benchmarks.py extract_birthday` for the speedup
+        with mock.patch("skill_user_settings.extract_datetime") as fallback:
+            fast_path = [self.skill._extract_birthday(u, now, lang)
+                         for u in corpus]
+            fallback.assert_not_called()
+        lf = [extract_datetime(u, now, lang)[0] for u in corpus]
+        self.assertEqual(fast_path, lf)
+
+        # Unhandled phrasings and invalid dates fall back to extract_datetime
+        with mock.patch("skill_user_settings.extract_datetime") as fallback:
+            fallback.return_value = [now, ""]
+            self.assertEqual(self.skill._extract_birthday(
+                "my birthday is today", now, lang), now)
+            self.assertEqual(self.skill._extract_birthday(
+                "my birthday is february 30", now, lang), now)
+            self.assertEqual(fallback.call_count, 2)
+            fallback.return_value = None
+            self.assertIsNone(self.skill._extract_birthday(
+                "my birthday is", now, lang))
+
     def test_handle_say_my_birthday(self):
         test_profile = self.user_config
         test_profile["user"]["username"] = "test_user"
@@ -746,9 +1392,60 @@ class TestSkill(SkillTestCase):
         self.skill.handle_say_my_birthday(test_message)
         self.skill.speak_dialog.assert_any_call("happy_birthday", private=True)
 
+    def test_birthday_greeting(self):
+        real_schedule_event = self.skill.schedule_event
+        self.skill.schedule_event = Mock()
+        self.skill._next_birthday_greeting = None
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "birthday_user"
+        test_profile["user"]["dob"] = "2000/01/01"
+        test_profile["location"]["tz"] = "America/Los_Angeles"
+
+        session = {"session_id": "remote_session"}
+
+        # Profile updates schedule the next greeting
+        self.skill.bus.emit(Message("neon.profile_update",
+                                    {"profile": test_profile},
+                                    {"session": session,
+                                     "user_profiles": [test_profile]}))
+        self.skill.schedule_event.assert_called_once()
+        next_due = self.skill.schedule_event.call_args[0][1]
+        self.assertEqual((next_due.month, next_due.day), (1, 1))
+        self.assertEqual(self.skill._next_birthday_greeting, next_due)
+
+        # Users without a known session are not greeted on this device
+        local_profile = deepcopy(test_profile)
+        local_profile["user"]["username"] = "local_user"
+        self.skill.bus.emit(Message("neon.profile_update",
+                                    {"profile": local_profile}))
+        events = list()
+        self.skill.bus.on("neon.user_settings.birthday", events.append)
+
+        # Greeting spoken to due users in their session
+        real_pop_due = self.skill._birthdays.pop_due
+        self.skill._birthdays.pop_due = Mock(return_value=["birthday_user",
+                                                           "local_user"])
+        self.skill._handle_birthday_greeting()
+        self.skill.speak_dialog.assert_called_once()
+        self.assertEqual(self.skill.speak_dialog.call_args[0][0],
+                         "happy_birthday")
+        context = self.skill.speak_dialog.call_args[1]["message"].context
+        self.assertEqual(context["username"], "birthday_user")
+        self.assertEqual(context["session"], session)
+        self.assertNotIn("user_profiles", context)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].data, {"username": "local_user"})
+        self.assertEqual(self.skill._get_session_id(events[0]), "default")
+        self.skill._birthdays.pop_due = real_pop_due
+        self.skill.bus.remove("neon.user_settings.birthday", events.append)
+
+        self.skill._birthdays.remove_user("birthday_user")
+        self.skill._birthdays.remove_user("local_user")
+        self.skill.schedule_event = real_schedule_event
+
     def test_handle_set_my_email(self):
-        real_get_gui_input = self.skill.get_gui_input
-        self.skill.get_gui_input = Mock(return_value=None)
+        real_get_gui_input_async = self.skill.get_gui_input_async
+        self.skill.get_gui_input_async = Mock(return_value="prompt_id")
         real_ask_yesno = self.skill.ask_yesno
         self.skill.ask_yesno = Mock(return_value="no")
         test_profile = self.user_config
@@ -791,14 +1488,43 @@ class TestSkill(SkillTestCase):
         test_message.data["rx_setting"] = "test at neon dot ai"
         _check_not_confirmed(test_message)
 
+        # Address entered after an unconfirmed address is validated
+        on_email = self.skill.get_gui_input_async.call_args[0][0]
+        on_email("test at neon ai")
+        self.skill.speak_dialog.assert_not_called()
+        self.assertEqual(test_message.context["user_profiles"][0]
+                         ["user"]["email"], "")
+        on_email("gui@neon.ai")
+        self.skill.speak_dialog.assert_called_once_with(
+            "email_set", {"email": "gui at neon dot ai"}, private=True)
+        self.assertEqual(test_message.context["user_profiles"][0]
+                         ["user"]["email"], "gui@neon.ai")
+        self.skill._update_user_profile({"user": {"email": ""}},
+                                        test_message)
+        self.skill.speak_dialog.reset_mock()
+
         # Invalid address
         test_message.data["utterance"] = "my email address is test at neon ai"
         test_message.data["rx_setting"] = "test at neon ai"
+        self.skill.get_gui_input_async.reset_mock()
         self.skill.handle_set_my_email(test_message)
         self.skill.speak_dialog.assert_called_once_with(
             "email_set_error", private=True)
+        self.skill.get_gui_input_async.assert_called_once()
+        self.skill.ask_yesno.assert_not_called()
         self.skill.speak_dialog.reset_mock()
 
+        # GUI input invalid
+        on_input = self.skill.get_gui_input_async.call_args[0][0]
+        on_input("test at neon ai")
+        self.skill.speak_dialog.assert_not_called()
+        self.skill.ask_yesno.assert_not_called()
+
+        # GUI input cancelled
+        on_input(None)
+        self.skill.speak_dialog.assert_not_called()
+        self.skill.ask_yesno.assert_not_called()
+
         # Set Email Confirmed
         test_message.data["utterance"] = "my email is test at neon dot ai"
         test_message.data["rx_setting"] = "test at neon dot ai"
@@ -842,7 +1568,95 @@ class TestSkill(SkillTestCase):
                          ["user"]["email"], "demo@neon.ai")
 
         self.skill.ask_yesno = real_ask_yesno
-        self.skill.get_gui_input = real_get_gui_input
+        self.skill.get_gui_input_async = real_get_gui_input_async
+
+    def test_get_gui_input_async(self):
+        real_show_input_box = self.skill.gui.show_input_box
+        real_remove_input_box = self.skill.gui.remove_input_box
+        self.skill.gui.show_input_box = Mock()
+        self.skill.gui.remove_input_box = Mock()
+        response_type = self.skill.gui.build_message_type('input.box.response')
+        close_type = self.skill.gui.build_message_type('input.box.close')
+        callback = Mock()
+
+        # Response returned to the requesting session
+        message = Message("test", {}, {"session": {"session_id": "test"}})
+        prompt_id = self.skill.get_gui_input_async(callback, "title",
+                                                   message=message)
+        self.assertIsInstance(prompt_id, str)
+        self.skill.gui.show_input_box.assert_called_once()
+        callback.assert_not_called()
+        self.skill.bus.emit(Message(response_type, {"text": "response"},
+                                    {"session": {"session_id": "test"}}))
+        callback.assert_called_once_with("response")
+        self.skill.gui.remove_input_box.assert_called_once()
+        self.assertEqual(self.skill._gui_prompts, dict())
+
+        # Concurrent prompts in different sessions
+        callback.reset_mock()
+        other_callback = Mock()
+        self.skill.get_gui_input_async(callback, message=message)
+        self.skill.get_gui_input_async(
+            other_callback,
+            message=Message("test", {}, {"session": {"session_id": "other"}}))
+        self.skill.bus.emit(Message(close_type, {},
+                                    {"session": {"session_id": "other"}}))
+        other_callback.assert_called_once_with(None)
+        callback.assert_not_called()
+
+        # Timeout
+        self.skill._handle_gui_input_timeout(Message("test", {"prompt_id":
+                                                              "invalid"}))
+        callback.assert_not_called()
+        prompt_id = self.skill._gui_prompts["test"].prompt_id
+        self.skill._handle_gui_input_timeout(Message("test", {"prompt_id":
+                                                              prompt_id}))
+        callback.assert_called_once_with(None)
+
+        # Session-less responses are dropped when several prompts are pending
+        callback.reset_mock()
+        other_callback.reset_mock()
+        self.skill.get_gui_input_async(callback, message=message)
+        self.skill.get_gui_input_async(
+            other_callback,
+            message=Message("test", {}, {"session": {"session_id": "other"}}))
+        self.skill.bus.emit(Message(response_type, {"text": "ambiguous"}))
+        callback.assert_not_called()
+        other_callback.assert_not_called()
+        self.assertEqual(set(self.skill._gui_prompts), {"test", "other"})
+
+        # Stop only cancels the prompt of the requesting session
+        from ovos_bus_client.session import Session
+        self.assertTrue(self.skill.stop_session(Session("other")))
+        other_callback.assert_called_once_with(None)
+        callback.assert_not_called()
+        self.assertFalse(self.skill.stop_session(Session("other")))
+        self.skill.stop()
+        callback.assert_not_called()
+
+        # A single pending prompt receives a session-less response
+        self.skill.bus.emit(Message(response_type, {"text": "only"}))
+        callback.assert_called_once_with("only")
+        self.assertEqual(self.skill._gui_prompts, dict())
+
+        # All prompts are cancelled on shutdown
+        callback.reset_mock()
+        other_callback.reset_mock()
+        self.skill.get_gui_input_async(callback, message=message)
+        self.skill.get_gui_input_async(
+            other_callback,
+            message=Message("test", {}, {"session": {"session_id": "other"}}))
+        real_flush = self.skill._recent_places.flush
+        self.skill._recent_places.flush = Mock()
+        self.skill.shutdown()
+        self.skill._recent_places.flush.assert_called_once()
+        self.skill._recent_places.flush = real_flush
+        callback.assert_called_once_with(None)
+        other_callback.assert_called_once_with(None)
+        self.assertEqual(self.skill._gui_prompts, dict())
+
+        self.skill.gui.show_input_box = real_show_input_box
+        self.skill.gui.remove_input_box = real_remove_input_box
 
     def test_handle_set_my_name(self):
         test_profile = self.user_config
@@ -1298,14 +2112,6 @@ class TestSkill(SkillTestCase):
         self.skill.handle_set_language(tts_message)
         self.skill.handle_set_tts_language.assert_called_once_with(tts_message)
 
-        # Unspecified request
-        test_message = Message("test",
-                               {"utterance": "set my language to spanish",
-                                "rx_language": "spanish"})
-        self.skill.handle_set_language(test_message)
-        self.skill.handle_set_stt_language.assert_called_with(test_message)
-        self.skill.handle_set_tts_language.assert_called_with(test_message)
-
         # Second language request
         second_lang_message = Message(
             "test", {"utterance": "change my secondary language to ukrainian",
@@ -1314,20 +2120,119 @@ class TestSkill(SkillTestCase):
         self.skill.handle_set_tts_language.assert_called_with(
             second_lang_message)
 
-        # Unspecified STT not changed
+        # Unspecified requests are handled without the STT/TTS handlers
         self.skill.handle_set_stt_language.reset_mock()
+        self.skill.handle_set_tts_language.reset_mock()
+        real_change_language = self.skill._change_language
+        self.skill._change_language = Mock()
+        test_message = Message("test",
+                               {"utterance": "set my language to spanish",
+                                "rx_language": "spanish"})
+        self.skill.handle_set_language(test_message)
+        self.skill._change_language.assert_called_once_with(test_message)
+        self.skill.handle_set_stt_language.assert_not_called()
+        self.skill.handle_set_tts_language.assert_not_called()
+
+        self.skill._change_language = real_change_language
+        self.skill.handle_set_stt_language = real_set_stt_language
+        self.skill.handle_set_tts_language = real_set_tts_language
+
+    def test_change_language(self):
+        real_ask_yesno = self.skill.ask_yesno
+        real_supported_languages = self.skill._languages
+        self.skill._languages = SupportedLanguages({'uk', 'en'},
+                                                   {'uk', 'en', 'bg'},
+                                                   {'uk', 'en', 'bg'})
+        self.skill.ask_yesno = Mock(return_value="yes")
         test_profile = self.user_config
         test_profile["user"]["username"] = "test_user"
         test_profile["speech"]["stt_language"] = "en-us"
-        test_message = Message("test", {"Language": "American English"},
+        test_profile["speech"]["tts_language"] = "en-us"
+        test_message = Message("test", {"utterance": "set my language to "
+                                                     "ukrainian",
+                                        "rx_language": "ukrainian"},
                                {"username": "test_user",
                                 "user_profiles": [test_profile]})
-        self.skill.handle_set_language(test_message)
-        self.skill.handle_set_tts_language.assert_called_with(test_message)
-        self.skill.handle_set_stt_language.assert_not_called()
+        updates = list()
+        self.skill.bus.on("neon.profile_update", updates.append)
+        parse = Mock(wraps=self.skill._parse_language_request)
+        resolve = Mock(wraps=self.skill._get_lang_code_and_name)
+        self.skill._parse_language_request = parse
+        self.skill._get_lang_code_and_name = resolve
+
+        # One parse, lookup, confirmation and profile write for STT+TTS
+        self.skill._change_language(test_message)
+        parse.assert_called_once()
+        resolve.assert_called_once()
+        self.skill.ask_yesno.assert_called_once_with(
+            "language_change_confirmation", {"io": "input and output",
+                                             "lang": "Ukrainian"})
+        self.skill.speak_dialog.assert_called_with(
+            "language_set", {"io": "input and output", "lang": "Ukrainian"},
+            private=True)
+        self.assertEqual(len(updates), 1)
+        speech = test_message.context["user_profiles"][0]["speech"]
+        self.assertEqual(speech["stt_language"], "uk-ua")
+        self.assertEqual(speech["tts_language"], "uk-ua")
 
-        self.skill.handle_set_stt_language = real_set_stt_language
-        self.skill.handle_set_tts_language = real_set_tts_language
+        # Already set
+        self.skill.ask_yesno.reset_mock()
+        self.skill._change_language(test_message)
+        self.skill.ask_yesno.assert_not_called()
+        self.skill.speak_dialog.assert_called_with(
+            "language_not_changed", {"io": "input and output",
+                                     "lang": "Ukrainian"}, private=True)
+        self.assertEqual(len(updates), 1)
+
+        # Only TTS supported
+        test_message.data = {"utterance": "set my language to bulgarian",
+                             "rx_language": "bulgarian"}
+        self.skill._change_language(test_message)
+        self.skill.ask_yesno.assert_called_once_with(
+            "language_change_confirmation", {"io": "primary",
+                                             "lang": "Bulgarian"})
+        self.assertEqual(len(updates), 2)
+        speech = test_message.context["user_profiles"][0]["speech"]
+        self.assertEqual(speech["stt_language"], "uk-ua")
+        self.assertEqual(speech["tts_language"], "bg-bg")
+
+        # Not confirmed
+        self.skill.ask_yesno = Mock(return_value=False)
+        test_message.data = {"utterance": "set my language to english",
+                             "rx_language": "english"}
+        self.skill._change_language(test_message)
+        self.skill.speak_dialog.assert_called_with("language_not_confirmed",
+                                                   private=True)
+        self.assertEqual(len(updates), 2)
+
+        # Unsupported
+        self.skill._languages = SupportedLanguages({'en'}, {'en'}, {'en'})
+        test_message.data = {"utterance": "set my language to ukrainian",
+                             "rx_language": "ukrainian"}
+        self.skill._change_language(test_message)
+        self.skill.speak_dialog.assert_called_with(
+            "language_not_supported", {"io": "understand",
+                                       "lang": "Ukrainian"}, private=True)
+
+        # Not recognized
+        test_message.data = {"utterance": "set my language to something",
+                             "rx_language": "something"}
+        self.skill._change_language(test_message)
+        self.skill.speak_dialog.assert_called_with(
+            "language_not_recognized", {"lang": "something"}, private=True)
+
+        # No language
+        test_message.data = {"utterance": "set my language"}
+        self.skill._change_language(test_message)
+        self.skill.speak_dialog.assert_called_with("language_not_heard",
+                                                   private=True)
+        self.assertEqual(len(updates), 2)
+
+        self.skill.bus.remove("neon.profile_update", updates.append)
+        del self.skill._parse_language_request
+        del self.skill._get_lang_code_and_name
+        self.skill.ask_yesno = real_ask_yesno
+        self.skill._languages = real_supported_languages
 
     def test_handle_no_secondary_language(self):
         test_profile = self.user_config
@@ -1345,10 +2250,189 @@ class TestSkill(SkillTestCase):
                          ["speech"]["secondary_neon_voice"], "")
         profile = deepcopy(test_message.context["user_profiles"][0])
 
+        suppressed = self.skill._suppressed_writes
         self.skill.handle_no_secondary_language(test_message)
         self.skill.speak_dialog.assert_called_with("only_one_language",
                                                    private=True)
         self.assertEqual(test_message.context["user_profiles"][0], profile)
+        self.assertEqual(self.skill._suppressed_writes, suppressed + 1)
+
+    def test_update_user_profile(self):
+        test_profile = self.user_config
+        test_profile["user"]["username"] = "test_user"
+        test_profile["speech"]["speed_multiplier"] = 1.0
+        test_message = Message("test", {},
+                               {"username": "test_user",
+                                "user_profiles": [test_profile]})
+        updates = list()
+        self.skill.bus.on("neon.profile_update", updates.append)
+
+        # Value changed
+        self.assertTrue(self.skill._update_user_profile(
+            {"speech": {"speed_multiplier": 1.1}}, test_message))
+        self.assertEqual(test_message.context["user_profiles"][0]["speech"]
+                         ["speed_multiplier"], 1.1)
+        self.assertEqual(len(updates), 1)
+
+        # Value unchanged
+        suppressed = self.skill._suppressed_writes
+        self.assertFalse(self.skill._update_user_profile(
+            {"speech": {"speed_multiplier": 1.1}}, test_message))
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.skill._suppressed_writes, suppressed + 1)
+
+        # New key
+        self.assertTrue(self.skill._update_user_profile(
+            {"speech": {"new_key": True}}, test_message))
+        self.assertEqual(len(updates), 2)
+        self.skill.bus.remove("neon.profile_update", updates.append)
+
+    def test_resource_bundle(self):
+        from tempfile import TemporaryDirectory
+        from skill_user_settings.util.resource_bundle import ResourceBundle, \
+            build_bundle
+
+        # Without a built bundle, loose files are read
+        self.skill._resource_bundles.clear()
+        self.assertIsNone(self.skill._get_resource_bundle("en-us"))
+        self.assertIsNone(self.skill._get_resource_bundle("xx-xx"))
+        loose = (self.skill._load_named_values("languages.value", "en-us"),
+                 self.skill._load_list("name_particles", "en-us"),
+                 self.skill._load_patterns("primary_tts.rx", "en-us"),
+                 self.skill._load_vocabulary("at.voc", "en-us"))
+        self.assertTrue(all(loose))
+        self.assertIsNone(self.skill._load_patterns("missing.rx", "en-us"))
+
+        with TemporaryDirectory() as tmp:
+            bundle_file = os.path.join(tmp, "en-us.bundle")
+            build_bundle(os.path.join(self.skill.res_dir, "locale", "en-us"),
+                         bundle_file)
+            self.skill._resource_bundles["en-us"] = \
+                ResourceBundle(bundle_file)
+            self.skill.load_lang = Mock()
+            self.skill.find_resource = Mock()
+            self.assertEqual(
+                (self.skill._load_named_values("languages.value", "en-us"),
+                 self.skill._load_list("name_particles", "en-us"),
+                 self.skill._load_patterns("primary_tts.rx", "en-us"),
+                 self.skill._load_vocabulary("at.voc", "en-us")), loose)
+            self.assertEqual(self.skill._get_lang_code_and_name("spanish",
+                                                                "en-us")[0],
+                             "es-es")
+            self.skill.load_lang.assert_not_called()
+            self.skill.find_resource.assert_not_called()
+            del self.skill.load_lang
+            del self.skill.find_resource
+            self.assertEqual(self.skill._load_vocabulary("imperial.voc",
+                                                         "en-us"),
+                             self.skill.load_lang(lang="en-us")
+                             .load_vocabulary_file("imperial.voc"))
+
+        # Bundles older than the loose files are ignored
+        self.skill._resource_bundles.clear()
+        with mock.patch("skill_user_settings.is_stale",
+                        return_value=True), \
+                mock.patch("skill_user_settings.ResourceBundle") as bundle:
+            self.assertIsNone(self.skill._get_resource_bundle("en-us"))
+            bundle.assert_not_called()
+        self.skill._resource_bundles.clear()
+
+    def test_register_locale(self):
+        real_intent_service = self.skill.intent_service
+        self.skill.intent_service = Mock()
+        # Other tests may have registered languages via profile updates
+        self.skill._registered_langs = set(self.skill.native_langs)
+        self.assertEqual(set(self.skill._intent_files),
+                         {"who_am_i.intent", "where_am_i.intent",
+                          "when_is_my_birthday.intent",
+                          "language_settings.intent", "language_stt.intent",
+                          "language_tts.intent"})
+
+        # Native and unknown languages are not registered again
+        self.assertFalse(self.skill._register_locale(self.skill.core_lang))
+        self.assertFalse(self.skill._register_locale("xx-xx"))
+        self.assertFalse(self.skill._register_locale(None))
+        self.skill.intent_service.register_adapt_keyword.assert_not_called()
+
+        # Other locales are registered when a user switches to them
+        test_profile = self.user_config
+        test_profile["speech"]["stt_language"] = "uk-UA"
+        self.skill.bus.emit(Message("neon.profile_update",
+                                    {"profile": test_profile}))
+        for _ in range(100):
+            if not self.skill._pending_langs:
+                break
+            sleep(0.1)
+        self.assertEqual(self.skill._pending_langs, set())
+        self.assertIn("uk-ua", self.skill._registered_langs)
+        for call_args in self.skill.intent_service.register_adapt_keyword \
+                .call_args_list:
+            self.assertEqual(call_args[0][3], "uk-ua")
+        self.skill.intent_service.register_adapt_regex.assert_called_with(
+            mock.ANY, "uk-ua")
+        self.assertEqual(self.skill.intent_service.register_padatious_intent
+                         .call_count, 6)
+        self.skill.intent_service.register_padatious_intent.assert_any_call(
+            f"{self.skill.skill_id}:who_am_i.intent",
+            os.path.join(self.skill.res_dir, "locale", "uk-ua", "intent",
+                         "who_am_i.intent"), "uk-ua")
+        self.assertFalse(self.skill._register_locale("uk-ua"))
+
+        self.skill._registered_langs.remove("uk-ua")
+        self.skill.intent_service = real_intent_service
+
+    def test_queue_locale(self):
+        # Registration runs off the bus thread and is queued once per language
+        self.skill._registered_langs = set(self.skill.native_langs)
+        started = Event()
+        release = Event()
+
+        def _register(lang):
+            started.set()
+            release.wait(10)
+            return True
+
+        real_register = self.skill._register_locale
+        self.skill._register_locale = Mock(side_effect=_register)
+        try:
+            test_profile = deepcopy(self.user_config)
+            test_profile["speech"]["stt_language"] = "uk-ua"
+            for _ in range(3):
+                self.skill.bus.emit(Message("neon.profile_update",
+                                            {"profile": test_profile}))
+            self.assertTrue(started.wait(5))
+            self.assertEqual(self.skill._pending_langs, {"uk-ua"})
+            self.assertFalse(self.skill._queue_locale("uk-UA"))
+            self.assertFalse(self.skill._queue_locale("xx-xx"))
+            self.assertFalse(self.skill._queue_locale(None))
+            release.set()
+            for _ in range(50):
+                if not self.skill._pending_langs:
+                    break
+                sleep(0.1)
+            self.assertEqual(self.skill._pending_langs, set())
+            self.skill._register_locale.assert_called_once_with("uk-ua")
+        finally:
+            release.set()
+            self.skill._register_locale = real_register
+
+    def test_intent_files_canonical(self):
+        # Padatious reuses trained intents while the hash of their lines is
+        # unchanged, so whitespace, blank, or duplicate lines that do not
+        # change matching only force retraining
+        locale_dir = os.path.join(self.skill.res_dir, "locale")
+        for lang in os.listdir(locale_dir):
+            intent_dir = os.path.join(locale_dir, lang, "intent")
+            # Built resource bundles are files in the same directory
+            if not os.path.isdir(intent_dir):
+                continue
+            for intent_file in os.listdir(intent_dir):
+                with open(os.path.join(intent_dir, intent_file)) as f:
+                    lines = [line for line in f.read().split('\n') if line]
+                self.assertEqual(lines, [line.strip() for line in lines],
+                                 f"{lang}/{intent_file}")
+                self.assertEqual(len(lines), len(set(lines)),
+                                 f"{lang}/{intent_file}")
 
     def test_get_name_parts(self):
         user_profile = self.user_config
@@ -1381,9 +2465,21 @@ class TestSkill(SkillTestCase):
                                 "middle_name": "middle",
                                 "last_name": "last senior",
                                 "full_name": "first-name middle last senior"})
+        # Particles and suffixes
+        user_profile["user"]["middle_name"] = ""
+        name = self.skill._get_name_parts("Ludwig Van Beethoven",
+                                          user_profile["user"])
+        self.assertEqual(name, {"first_name": "Ludwig",
+                                "last_name": "Van Beethoven",
+                                "full_name": "Ludwig Van Beethoven"})
+        name = self.skill._get_name_parts("Martin Luther King Jr",
+                                          user_profile["user"])
+        self.assertEqual(name, {"first_name": "Martin",
+                                "middle_name": "Luther",
+                                "last_name": "King Jr",
+                                "full_name": "Martin Luther King Jr"})
 
     def test_get_timezone_from_location(self):
-        sleep(1)
         name, offset = \
             self.skill._get_timezone_from_location(
                 self.skill._get_location_from_spoken_location("seattle"))
@@ -1396,7 +2492,6 @@ class TestSkill(SkillTestCase):
 
     def test_get_location_from_spoken_location(self):
         # Test 'city' case
-        sleep(1)
         address = self.skill._get_location_from_spoken_location("seattle")
         self.assertEqual(address['address']['city'], "Seattle")
         self.assertEqual(address['address']['state'], "Washington")
@@ -1405,7 +2500,6 @@ class TestSkill(SkillTestCase):
         self.assertIsInstance(address['lon'], str)
 
         # Test international case
-        sleep(1)
         address = self.skill._get_location_from_spoken_location("kyiv",
                                                                 "en-us")
         self.assertEqual(address['address']['city'], "Kyiv")
@@ -1414,7 +2508,6 @@ class TestSkill(SkillTestCase):
         self.assertIsInstance(address['lon'], str)
 
         # Test 'town' case
-        sleep(1)
         address = self.skill._get_location_from_spoken_location(
             "kirkland washington")
         self.assertEqual(address['address']['city'], "Kirkland")
@@ -1424,7 +2517,6 @@ class TestSkill(SkillTestCase):
         self.assertIsInstance(address['lon'], str)
 
         # Test 'village' case
-        sleep(1)
         address = self.skill._get_location_from_spoken_location(
             "orchard city colorado")
         self.assertEqual(address["address"]["city"], "Orchard City")
@@ -1536,6 +2628,21 @@ class TestSkill(SkillTestCase):
                          "test at neon dot ai")
         self.assertEqual(self.skill._spoken_email("my.email@domain.com"),
                          "my dot email at domain dot com")
+        self.assertEqual(self.skill._spoken_email("first_last-1+tag@x-y.com"),
+                         "first underscore last dash 1 plus tag at "
+                         "x dash y dot com")
+        self.assertEqual(self.skill._spoken_email("someone@iCloud.com"),
+                         "someone at i cloud dot com")
+        self.assertEqual(self.skill._spoken_email("my.icloud.com@neon.ai"),
+                         "my dot icloud dot com at neon dot ai")
+
+        # Rendered addresses are cached per language
+        renderer = self.skill._get_email_renderer(self.skill.lang)
+        self.assertIs(renderer, self.skill._get_email_renderer(
+            self.skill.lang))
+        hits = renderer.render.cache_info().hits
+        self.skill._spoken_email("test@neon.ai")
+        self.assertEqual(renderer.render.cache_info().hits, hits + 1)
 
     def test_normalize_name(self):
         valid_name = "Daniel"
@@ -0,0 +1,1264 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from threading import Event, Thread
+from time import sleep
+from unittest.mock import patch
+
+
+class TestHandlerLimiter(unittest.TestCase):
+    def test_concurrency_limit(self):
+        from skill_user_settings.util.handler_limiter import HandlerLimiter
+        limiter = HandlerLimiter(max_concurrent=2, max_queued=1,
+                                 queue_timeout=5)
+        self.assertTrue(limiter.try_acquire("user_1"))
+        self.assertTrue(limiter.try_acquire("user_2"))
+        self.assertEqual(limiter.active, 2)
+
+        # Third user is queued until a slot is released
+        acquired = Event()
+
+        def _wait_for_slot():
+            if limiter.try_acquire("user_3"):
+                acquired.set()
+
+        thread = Thread(target=_wait_for_slot, daemon=True)
+        thread.start()
+        sleep(0.1)
+        self.assertEqual(limiter.queued, 1)
+        self.assertFalse(acquired.is_set())
+
+        # Queue is full, fail fast
+        self.assertFalse(limiter.try_acquire("user_4"))
+        self.assertEqual(limiter.rejected, 1)
+
+        limiter.release("user_1")
+        self.assertTrue(acquired.wait(2))
+        thread.join(2)
+        self.assertEqual(limiter.queued, 0)
+        self.assertEqual(limiter.active, 2)
+        limiter.release("user_2")
+        limiter.release("user_3")
+
+        stats = limiter.stats
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertGreater(stats["max_wait"], 0)
+
+    def test_per_user_serialization(self):
+        from skill_user_settings.util.handler_limiter import HandlerLimiter
+        limiter = HandlerLimiter(max_concurrent=4, max_queued=4,
+                                 queue_timeout=0.1)
+        self.assertTrue(limiter.try_acquire("user"))
+        # Same user waits for their previous request and times out
+        self.assertFalse(limiter.try_acquire("user"))
+        self.assertTrue(limiter.try_acquire("other_user"))
+        limiter.release("user")
+        self.assertTrue(limiter.try_acquire("user"))
+
+    def test_acquire_reentrant(self):
+        from skill_user_settings.util.handler_limiter import HandlerLimiter
+        limiter = HandlerLimiter(max_concurrent=1, max_queued=0)
+        with limiter.acquire("user") as acquired:
+            self.assertTrue(acquired)
+            with limiter.acquire("user") as nested:
+                self.assertTrue(nested)
+            self.assertEqual(limiter.active, 1)
+        self.assertEqual(limiter.active, 0)
+        self.assertEqual(limiter.completed, 1)
+
+
+class TestProfileUtils(unittest.TestCase):
+    def test_patch_changes_profile(self):
+        from skill_user_settings.util.profile_utils import \
+            patch_changes_profile
+        profile = {"speech": {"speed_multiplier": 1.0,
+                              "tts_language": "en-us"},
+                   "units": {"measure": "imperial"}}
+        self.assertFalse(patch_changes_profile({}, profile))
+        self.assertFalse(patch_changes_profile(
+            {"speech": {"speed_multiplier": 1.0}}, profile))
+        self.assertFalse(patch_changes_profile(
+            {"speech": {"speed_multiplier": 1}}, profile))
+        self.assertTrue(patch_changes_profile(
+            {"speech": {"speed_multiplier": 1.1}}, profile))
+        self.assertTrue(patch_changes_profile(
+            {"units": {"measure": "imperial", "time": 12}}, profile))
+        self.assertTrue(patch_changes_profile({"location": {"city": ""}},
+                                              profile))
+        self.assertTrue(patch_changes_profile({"units": "metric"}, profile))
+
+    def test_get_section_changes(self):
+        from skill_user_settings.util.profile_utils import \
+            get_section_changes
+        profile = {"location": {"city": "Seattle", "tz": "America/Los_Angeles",
+                                "utc": -7.0},
+                   "units": {"measure": "imperial"}}
+        self.assertEqual(get_section_changes({}, profile, "location"),
+                         (dict(), dict()))
+        self.assertEqual(get_section_changes(
+            {"location": {"city": "Seattle", "tz": "America/Phoenix"}},
+            profile, "location"),
+            ({"tz": "America/Los_Angeles"}, {"tz": "America/Phoenix"}))
+        self.assertEqual(get_section_changes(
+            {"units": {"measure": "imperial", "time": 24}}, profile, "units"),
+            ({"time": None}, {"time": 24}))
+        self.assertEqual(get_section_changes(
+            {"units": {"time": 24}}, {}, "units"), ({"time": None},
+                                                   {"time": 24}))
+
+
+class TestMemory(unittest.TestCase):
+    def test_deep_getsizeof(self):
+        import sys
+        from skill_user_settings.util.memory import deep_getsizeof
+
+        class Slotted:
+            __slots__ = ("value",)
+
+            def __init__(self, value):
+                self.value = value
+
+        value = "x" * 1000
+        self.assertEqual(deep_getsizeof(value), sys.getsizeof(value))
+        self.assertGreater(deep_getsizeof([value]), sys.getsizeof(value))
+        self.assertGreater(deep_getsizeof(Slotted(value)),
+                           sys.getsizeof(value))
+        # Shared references are only counted once
+        self.assertEqual(deep_getsizeof([value, value]),
+                         deep_getsizeof([value]) + 8)
+
+    def test_get_memory_report(self):
+        import tracemalloc
+        from skill_user_settings.util.memory import get_memory_report, \
+            start_memory_audit
+        report = get_memory_report({"test": {"key": "value"}})
+        self.assertIsInstance(report["structures"]["test"], int)
+        self.assertNotIn("traced", report)
+        start_memory_audit()
+        report = get_memory_report({"test": {"key": "value"}})
+        self.assertIsInstance(report["traced"], int)
+        self.assertIsInstance(report["allocations"], dict)
+        tracemalloc.stop()
+
+
+class TestBirthdayScheduler(unittest.TestCase):
+    def test_next_birthday(self):
+        from datetime import datetime
+        from dateutil.tz import gettz
+        from skill_user_settings.util.birthday_scheduler import next_birthday
+        tz = gettz("America/Los_Angeles")
+        now = datetime(2024, 3, 1, 12, tzinfo=tz)
+        self.assertEqual(next_birthday(3, 5, tz, now, 9),
+                         datetime(2024, 3, 5, 9, tzinfo=tz))
+        self.assertEqual(next_birthday(1, 1, tz, now),
+                         datetime(2025, 1, 1, tzinfo=tz))
+        # Birthday today after greeting hour is next year
+        self.assertEqual(next_birthday(3, 1, tz, now, 9),
+                         datetime(2025, 3, 1, 9, tzinfo=tz))
+        # Leap day observed on February 28 in non-leap years
+        self.assertEqual(next_birthday(2, 29, tz, now),
+                         datetime(2025, 2, 28, tzinfo=tz))
+        self.assertEqual(next_birthday(2, 29, tz,
+                                       datetime(2024, 1, 1, tzinfo=tz)),
+                         datetime(2024, 2, 29, tzinfo=tz))
+        # `now` in another timezone
+        self.assertEqual(next_birthday(3, 2, tz,
+                                       datetime(2024, 3, 2, 7,
+                                                tzinfo=gettz("UTC")), 9),
+                         datetime(2024, 3, 2, 9, tzinfo=tz))
+
+    def test_scheduler(self):
+        from datetime import datetime, timedelta
+        from dateutil.tz import gettz
+        from skill_user_settings.util.birthday_scheduler import \
+            BirthdayScheduler
+        tz = gettz("UTC")
+        now = datetime(2024, 1, 1, tzinfo=tz)
+        scheduler = BirthdayScheduler(greeting_hour=0)
+        self.assertIsNone(scheduler.next_due)
+
+        scheduler.update_user("user_1", "2000/03/01", tz, now)
+        scheduler.update_user("user_2", "1990/02/01", tz, now)
+        scheduler.update_user("user_3", "YYYY/MM/DD", tz, now)
+        scheduler.update_user("user_4", "invalid", tz, now)
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.next_due, datetime(2024, 2, 1, tzinfo=tz))
+
+        # Updated birthday replaces the previous entry
+        scheduler.update_user("user_2", "1990/04/01", tz, now)
+        self.assertEqual(scheduler.next_due, datetime(2024, 3, 1, tzinfo=tz))
+        self.assertEqual(scheduler.pop_due(datetime(2024, 2, 15, tzinfo=tz)),
+                         [])
+
+        # Due users are returned once and rescheduled for next year
+        self.assertEqual(scheduler.pop_due(datetime(2024, 3, 1, tzinfo=tz)),
+                         ["user_1"])
+        self.assertEqual(scheduler.pop_due(datetime(2024, 3, 1, tzinfo=tz)),
+                         [])
+        self.assertEqual(scheduler.next_due, datetime(2024, 4, 1, tzinfo=tz))
+
+        # The latest context is kept, including across birthday changes
+        self.assertIsNone(scheduler.get_context("user_2"))
+        scheduler.update_user("user_2", "1990/04/01", tz, now,
+                              context={"session": {"session_id": "a"}})
+        scheduler.update_user("user_2", "1990/04/01", tz, now)
+        self.assertEqual(scheduler.get_context("user_2"),
+                         {"session": {"session_id": "a"}})
+        scheduler.update_user("user_2", "1990/04/02", tz, now)
+        self.assertEqual(scheduler.get_context("user_2"),
+                         {"session": {"session_id": "a"}})
+        scheduler.update_user("user_2", "1990/04/01", tz, now)
+
+        # Removed users are not greeted
+        scheduler.remove_user("user_2")
+        self.assertIsNone(scheduler.get_context("user_2"))
+        self.assertEqual(scheduler.next_due, datetime(2025, 3, 1, tzinfo=tz))
+
+        # Many users
+        for i in range(5000):
+            scheduler.update_user(f"user_{i}",
+                                  f"2000/{i % 12 + 1:02d}/{i % 28 + 1:02d}",
+                                  tz, now)
+        self.assertEqual(len(scheduler), 5000)
+        self.assertEqual(scheduler.next_due, datetime(2024, 1, 5, tzinfo=tz))
+        due = scheduler.pop_due(datetime(2024, 1, 5, tzinfo=tz) +
+                                timedelta(hours=1))
+        self.assertEqual(len(due), len([i for i in range(5000)
+                                        if i % 12 == 0 and i % 28 == 4]))
+
+        # Least recently updated users are removed beyond `max_users`, and
+        # rescheduled birthdays do not accumulate in the heap
+        scheduler = BirthdayScheduler(greeting_hour=0, max_users=2)
+        scheduler.update_user("user_1", "2000/03/01", tz, now)
+        scheduler.update_user("user_2", "2000/02/01", tz, now)
+        scheduler.update_user("user_1", "2000/03/01", tz, now)
+        scheduler.update_user("user_3", "2000/04/01", tz, now)
+        self.assertEqual(len(scheduler), 2)
+        self.assertEqual(scheduler.next_due, datetime(2024, 3, 1, tzinfo=tz))
+        for day in range(1, 29):
+            scheduler.update_user("user_1", f"2000/05/{day:02d}", tz, now)
+        self.assertLessEqual(len(scheduler._heap), 2 * 2 + 16)
+        self.assertEqual(scheduler.next_due, datetime(2024, 4, 1, tzinfo=tz))
+
+
+class TestTimezoneRegistry(unittest.TestCase):
+    def test_registry(self):
+        import builtins
+        from datetime import datetime
+        from dateutil.tz import gettz
+        from lingua_franca.time import default_timezone
+        from skill_user_settings.util.timezones import TimezoneRegistry
+        registry = TimezoneRegistry()
+        registry.warm("America/Los_Angeles", "Europe/Kyiv", None)
+        self.assertEqual(len(registry), 2)
+        la_tz = registry.get("America/Los_Angeles")
+        self.assertEqual(la_tz, gettz("America/Los_Angeles"))
+        self.assertIs(registry.get("America/Los_Angeles"), la_tz)
+        self.assertEqual(registry.get(None), default_timezone())
+        self.assertEqual(registry.get("Not/A_Timezone"), default_timezone())
+        now = registry.now("Europe/Kyiv")
+        self.assertIsInstance(now, datetime)
+        self.assertEqual(now.tzinfo, gettz("Europe/Kyiv"))
+
+        # Cached timezones are resolved without reading zoneinfo files
+        gettz.cache_clear()
+        real_open = builtins.open
+        opened = list()
+
+        def _open(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        with patch("builtins.open", _open):
+            for _ in range(100):
+                registry.now("America/Los_Angeles")
+                registry.now("Europe/Kyiv")
+                registry.get("Not/A_Timezone")
+            self.assertEqual(opened, [])
+            registry.get("Asia/Tokyo")
+            self.assertEqual(len(opened), 1)
+
+        # Only the most recently requested unknown names are cached
+        def _unknown(i):
+            # Names with digits are parsed as POSIX TZ strings
+            return "Not/A_" + "".join(chr(ord("a") + int(d)) for d in str(i))
+
+        registry = TimezoneRegistry(max_unknown=2)
+        registry.warm("America/Los_Angeles")
+        for i in range(100):
+            self.assertEqual(registry.get(_unknown(i)), default_timezone())
+        self.assertEqual(len(registry), 3)
+        self.assertEqual(list(registry._unknown), [_unknown(98), _unknown(99)])
+        registry.get(_unknown(98))
+        registry.get(_unknown(0))
+        self.assertEqual(list(registry._unknown), [_unknown(98), _unknown(0)])
+        self.assertIs(registry.get("America/Los_Angeles"),
+                      registry.get("America/Los_Angeles"))
+
+
+class TestDateParser(unittest.TestCase):
+    def test_extract_date(self):
+        from datetime import datetime
+        from dateutil.tz import gettz
+        from skill_user_settings.util.date_parser import \
+            compile_date_pattern, extract_date
+        tz = gettz("Europe/Kyiv")
+        now = datetime(2024, 6, 1, 12, tzinfo=tz)
+        months = {"березень": 3, "березня": 3, "червень": 6, "червня": 6}
+        pattern = compile_date_pattern(months)
+        self.assertEqual(extract_date(pattern, months,
+                                      "мій день народження 5 березня 1990",
+                                      now), datetime(1990, 3, 5, tzinfo=tz))
+        self.assertEqual(extract_date(pattern, months,
+                                      "мій день народження 5-го березня",
+                                      now), datetime(2025, 3, 5, tzinfo=tz))
+        self.assertEqual(extract_date(pattern, months,
+                                      "мій день народження 2 червня", now),
+                         datetime(2024, 6, 2, tzinfo=tz))
+        self.assertIsNone(extract_date(pattern, months,
+                                       "мій день народження 31 червня", now))
+        self.assertIsNone(extract_date(pattern, months,
+                                       "мій день народження сьогодні", now))
+        self.assertIsNone(extract_date(pattern, months, "березень 1990", now))
+
+        # Years after a short filler word
+        months = {"march": 3}
+        pattern = compile_date_pattern(months)
+        for utterance in ("my birthday is the 5th of march in 1990",
+                          "my birthday is march 5th of 1990",
+                          "my birthday is march 5, 1990"):
+            self.assertEqual(extract_date(pattern, months, utterance, now),
+                             datetime(1990, 3, 5, tzinfo=tz), utterance)
+        # Years the pattern does not match are left to `extract_datetime`
+        self.assertIsNone(extract_date(
+            pattern, months, "march 5th in the year 1990", now))
+
+    def test_previous_occurrence(self):
+        from datetime import datetime
+        from dateutil.tz import gettz
+        from skill_user_settings.util.date_parser import has_year, \
+            previous_occurrence
+        tz = gettz("Europe/Kyiv")
+        now = datetime(2024, 6, 1, 12, tzinfo=tz)
+        self.assertEqual(previous_occurrence(
+            datetime(2024, 9, 9, tzinfo=tz), now),
+            datetime(2023, 9, 9, tzinfo=tz))
+        self.assertEqual(previous_occurrence(
+            datetime(2025, 3, 5, tzinfo=tz), now),
+            datetime(2024, 3, 5, tzinfo=tz))
+        self.assertEqual(previous_occurrence(
+            datetime(2024, 6, 1, tzinfo=tz), now),
+            datetime(2024, 6, 1, tzinfo=tz))
+        self.assertEqual(previous_occurrence(
+            datetime(2028, 2, 29, tzinfo=tz), datetime(2027, 6, 1, tzinfo=tz)),
+            datetime(2024, 2, 29, tzinfo=tz))
+        self.assertTrue(has_year("march 5th of 1990"))
+        self.assertFalse(has_year("march 5th"))
+        self.assertFalse(has_year(None))
+
+
+class TestProfileAudit(unittest.TestCase):
+    @staticmethod
+    def _profile(username: str, **changes) -> dict:
+        profile = {"user": {"username": username, "dob": "1990/03/05"},
+                   "location": {"lat": "47.6", "lng": "-122.3"},
+                   "speech": {"stt_language": "en-us",
+                              "tts_language": "en-us",
+                              "secondary_tts_language": "",
+                              "speed_multiplier": 1.0}}
+        for section, values in changes.items():
+            profile[section].update(values)
+        return profile
+
+    def test_audit_profile(self):
+        from skill_user_settings.util.profile_audit import audit_profile
+        self.assertEqual(audit_profile(self._profile("test_user"),
+                                       {"en"}), [])
+        self.assertEqual(audit_profile(self._profile("a" * 32)),
+                         ["generated_username"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", user={"dob": "YYYY/MM/DD"})),
+            ["placeholder_dob"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", location={"lat": "38.971669",
+                                                 "lng": "-95.23525"})),
+            ["default_location"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", location={"lat": ""})),
+            ["default_location"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", speech={"speed_multiplier": 2.0})),
+            ["speed_out_of_range"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", speech={"speed_multiplier": 0})),
+            ["speed_out_of_range"])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", speech={"speed_multiplier": None})),
+            [])
+        self.assertEqual(audit_profile(
+            self._profile("test_user", speech={"speed_multiplier": "fast"})),
+            ["invalid_speed"])
+        profile = self._profile("test_user",
+                                speech={"tts_language": "uk-ua",
+                                        "secondary_tts_language": "fr-fr"})
+        self.assertEqual(audit_profile(profile), [])
+        self.assertEqual(audit_profile(profile, {"en", "uk"}),
+                         ["unsupported_secondary_tts_language"])
+        self.assertEqual(audit_profile({}), ["placeholder_dob",
+                                             "default_location"])
+
+    def test_iter_profiles(self):
+        import json
+        from tempfile import TemporaryDirectory
+        from os.path import join
+        from skill_user_settings.util.profile_audit import iter_profiles
+        profiles = [self._profile(f"user_{i}") for i in range(3)]
+        with TemporaryDirectory() as tmp:
+            jsonl_file = join(tmp, "profiles.jsonl")
+            with open(jsonl_file, 'w') as f:
+                f.write(json.dumps(profiles[0]) + "\n\n")
+                f.write("not json\n")
+                f.write("\n".join(json.dumps(p) for p in profiles[1:]))
+            self.assertEqual(list(iter_profiles(jsonl_file)), profiles)
+
+            for profile in profiles:
+                username = profile["user"]["username"]
+                with open(join(tmp, f"{username}.json"), 'w') as f:
+                    json.dump(profile, f)
+            self.assertEqual(list(iter_profiles(tmp)), profiles)
+
+    def test_audit_profiles_constant_memory(self):
+        import tracemalloc
+        from collections import Counter
+        from skill_user_settings.util.profile_audit import audit_profiles
+
+        def _profiles(count: int):
+            for i in range(count):
+                yield self._profile(f"user_{i}", user={
+                    "dob": "YYYY/MM/DD" if i % 2 else "1990/03/05"})
+
+        def _peak_memory(count: int) -> int:
+            summary = Counter()
+            tracemalloc.start()
+            for _ in audit_profiles(_profiles(count), {"en"}, summary):
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertEqual(summary["profiles"], count)
+            self.assertEqual(summary["placeholder_dob"], count // 2)
+            return peak
+
+        small = _peak_memory(1000)
+        large = _peak_memory(20000)
+        self.assertLess(large, small * 2)
+
+
+class TestUtcOffsets(unittest.TestCase):
+    def test_recompute_utc_offsets(self):
+        from collections import Counter
+        from datetime import datetime, timezone
+        from dateutil.tz import gettz
+        from skill_user_settings.util.utc_offsets import recompute_utc_offsets
+        summer = datetime(2024, 7, 1, tzinfo=timezone.utc)
+        winter = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        zones = {"America/Los_Angeles": ("-7.0", "-8.0"),
+                 "Europe/Kyiv": ("3.0", "2.0"),
+                 "Asia/Kolkata": ("5.5", "5.5")}
+
+        def _profiles(count: int, season: int):
+            names = list(zones)
+            for i in range(count):
+                tz = names[i % len(names)]
+                yield {"user": {"username": f"user_{i}"},
+                       "location": {"tz": tz, "utc": zones[tz][season]}}
+            yield {"user": {"username": "no_tz"}, "location": {"tz": ""}}
+            yield {"user": {"username": "bad_tz"},
+                   "location": {"tz": "Not/A_Timezone"}}
+
+        # Stored offsets are current
+        summary = Counter()
+        self.assertEqual(list(recompute_utc_offsets(_profiles(30, 0),
+                                                    summer, summary)), [])
+        self.assertEqual(summary, {"profiles": 32, "unknown_tz": 2,
+                                   "timezones": 5})
+
+        # Offsets changed for DST, numeric offsets are compared by value
+        profiles = list(_profiles(3, 0))
+        profiles[2]["location"]["utc"] = 5.5
+        self.assertEqual(list(recompute_utc_offsets(profiles, winter)), [
+            {"username": "user_0", "location": {"utc": "-8.0"}},
+            {"username": "user_1", "location": {"utc": "2.0"}}])
+
+        # Offsets are computed once per zone
+        with patch("skill_user_settings.util.utc_offsets.gettz",
+                   wraps=gettz) as lookup:
+            summary = Counter()
+            for _ in recompute_utc_offsets(_profiles(100000, 0), winter,
+                                           summary):
+                pass
+            self.assertEqual(lookup.call_count, 4)
+            self.assertEqual(summary["changed"], 66667)
+
+
+class TestSpokenEmail(unittest.TestCase):
+    def test_tokenize_email(self):
+        from skill_user_settings.util.spoken_email import tokenize_email
+        self.assertEqual(tokenize_email("test@neon.ai"),
+                         ["test", "@", "neon", ".", "ai"])
+        self.assertEqual(tokenize_email("a_b-c+d..e@f"),
+                         ["a", "_", "b", "-", "c", "+", "d", ".", ".", "e",
+                          "@", "f"])
+
+    def test_email_renderer(self):
+        from skill_user_settings.util.spoken_email import EmailRenderer
+        renderer = EmailRenderer({'.': "крапка", '@': "на", '_': "_",
+                                  '-': "дефіс", '+': "плюс"},
+                                 {"ukr.net": "укр крапка нет"})
+        self.assertEqual(renderer.render("ім'я.прізвище@UKR.net"),
+                         "ім'я крапка прізвище на укр крапка нет")
+        self.assertEqual(renderer.render("a-b@i.ua"),
+                         "a дефіс b на i крапка ua")
+        self.assertEqual(renderer.render("not.an.email"),
+                         "not крапка an крапка email")
+
+
+class TestNameParser(unittest.TestCase):
+    def test_normalize_name(self):
+        from skill_user_settings.util.name_parser import normalize_name
+        self.assertEqual(normalize_name("d-j mcknight . "), "D-J Mcknight")
+        self.assertEqual(normalize_name("DANIEL 1 2 3"), "Daniel")
+
+    def test_parse(self):
+        from skill_user_settings.util.name_parser import NameParser
+        parser = NameParser(["van", "der", "de", "la", "al"],
+                            ["jr", "sr", "iii"])
+        self.assertEqual(parser.parse("Daniel"), ("Daniel", None, None))
+        self.assertEqual(parser.parse("Daniel McKnight"),
+                         ("Daniel", None, "McKnight"))
+        self.assertEqual(parser.parse("José Eduardo Santos Tavares"),
+                         ("José", "Eduardo", "Santos Tavares"))
+        self.assertEqual(parser.parse("Ludwig van Beethoven"),
+                         ("Ludwig", None, "van Beethoven"))
+        self.assertEqual(parser.parse("Johannes Diderik van der Waals"),
+                         ("Johannes", "Diderik", "van der Waals"))
+        self.assertEqual(parser.parse("Juan De La Cruz"),
+                         ("Juan", None, "De La Cruz"))
+        self.assertEqual(parser.parse("Omar Al-Farouk"),
+                         ("Omar", None, "Al-Farouk"))
+        self.assertEqual(parser.parse("Hassan Ali Al-Rashid"),
+                         ("Hassan", "Ali", "Al-Rashid"))
+        self.assertEqual(parser.parse("John Smith Jr."),
+                         ("John", None, "Smith Jr."))
+        self.assertEqual(parser.parse("Thurston Howell III"),
+                         ("Thurston", None, "Howell III"))
+        self.assertEqual(parser.parse("Sammy Davis Jr Sr"),
+                         ("Sammy", None, "Davis Jr Sr"))
+        self.assertEqual(parser.parse("Prince Jr"), ("Prince Jr", None, None))
+        self.assertEqual(parser.parse("De Niro"), ("De", None, "Niro"))
+
+    def test_parse_cached(self):
+        from itertools import product
+        from skill_user_settings.util.name_parser import NameParser
+        parser = NameParser(["van", "de", "al"], ["jr", "iii"],
+                            cache_size=4096)
+        first = ("Anna", "Bohdan", "Carlos", "Daniel", "Emma", "Fatima")
+        middle = ("", "Lee", "Maria Jose")
+        last = ("Smith", "van Dijk", "de la Cruz", "Al-Sayed", "Kovalenko")
+        suffix = ("", "Jr", "III")
+        corpus = [" ".join(p for p in parts if p)
+                  for parts in product(first, middle, last, suffix)]
+
+        # Each name is parsed once; repeats are served from the cache.
+        # See `test/benchmarks.py parse_names` for the speedup
+        parsed = [parser.parse(n) for n in corpus]
+        self.assertEqual(parser.parse.cache_info().misses, len(set(corpus)))
+        self.assertEqual([parser.parse(n) for n in corpus], parsed)
+        self.assertEqual(parser.parse.cache_info().misses, len(set(corpus)))
+        self.assertEqual(parser.parse.cache_info().hits,
+                         2 * len(corpus) - len(set(corpus)))
+        for name, (first, middle, last) in zip(corpus, parsed):
+            self.assertEqual(" ".join(p for p in (first, middle, last) if p),
+                             name)
+
+
+class TestLanguageNames(unittest.TestCase):
+    def test_language_names(self):
+        from lingua_franca import load_language
+        from skill_user_settings.util.language_names import LanguageNames
+        load_language("en-us")
+        names = LanguageNames("en-us", {"klingon": "tlh-qo",
+                                        "australian": " en-au"})
+        names.warm(["en-us", "uk-ua", " en-au".strip()])
+        self.assertEqual(len(names), 3)
+        self.assertEqual(names.get("en-us"), "American English")
+        self.assertEqual(names.get("uk-ua"), "Ukrainian")
+        self.assertEqual(names.get("pt-br"), "Brazilian Portuguese")
+        # Fallbacks for codes lingua_franca does not know
+        self.assertEqual(names.get("tlh-QO"), "Klingon")
+        self.assertEqual(names.get("xx-yy"), "xx-yy")
+        self.assertEqual(names.get(""), "")
+
+        # Resolved names are not looked up again
+        with patch("skill_user_settings.util.language_names.pronounce_lang")\
+                as pronounce_lang:
+            for code in ("en-us", "uk-ua", "tlh-QO", "xx-yy", ""):
+                names.get(code)
+            pronounce_lang.assert_not_called()
+
+        # Display languages lingua_franca does not support use aliases, then
+        # English names
+        from lingua_franca.format import pronounce_lang as real_pronounce
+
+        def _pronounce(code, lang):
+            if lang == "uk-ua":
+                raise ModuleNotFoundError("No language module loaded.")
+            return real_pronounce(code, lang)
+
+        names = LanguageNames("uk-ua", {"українська": "uk-ua"})
+        with patch("skill_user_settings.util.language_names.pronounce_lang",
+                   _pronounce):
+            self.assertEqual(names.get("uk-ua"), "Українська")
+            self.assertEqual(names.get("en-us"), "American English")
+            self.assertEqual(names.get("xx-yy"), "xx-yy")
+
+
+class TestLanguageParser(unittest.TestCase):
+    def test_language_extractor(self):
+        import re
+        import yaml
+        from os.path import dirname, join
+        from unittest.mock import Mock
+        from skill_user_settings.util.language_parser import \
+            LanguageExtractor, read_patterns
+
+        def _search(rx_file, utterance, group):
+            # Read and search with each pattern until one matches
+            for pattern in read_patterns(rx_file):
+                match = re.search(pattern, f"{utterance}\n")
+                if match:
+                    return match.group(group).strip()
+
+        root = dirname(dirname(__file__))
+        with open(join(root, "test", "test_intents.yaml")) as f:
+            test_intents = yaml.safe_load(f)
+        for lang in ("en-us", "uk-ua"):
+            regex_dir = join(root, "locale", lang, "regex")
+            primary = join(regex_dir, "primary_tts.rx")
+            secondary = join(regex_dir, "secondary_tts.rx")
+            extractor = LanguageExtractor(read_patterns(primary),
+                                          read_patterns(secondary))
+            corpus = [list(u)[0] if isinstance(u, dict) else u
+                      for utterances in test_intents[lang].values()
+                      for u in utterances]
+            corpus.append("set my primary language to french and my "
+                          "secondary language to german")
+            corpus *= 20
+
+            expected = [(_search(primary, u, "rx_primary"),
+                         _search(secondary, u, "rx_secondary"))
+                        for u in corpus]
+            # Each utterance is matched once with the combined pattern and
+            # no pattern is compiled or searched separately. See
+            # `test/benchmarks.py extract_languages` for the speedup
+            extractor._pattern = Mock(wraps=extractor._pattern)
+            with patch("re.search") as search, \
+                    patch("re.compile") as compile_:
+                extracted = [extractor.extract(u) for u in corpus]
+            search.assert_not_called()
+            compile_.assert_not_called()
+            self.assertEqual(extractor._pattern.match.call_count, len(corpus))
+            self.assertEqual(extracted, expected)
+            if lang == "en-us":
+                self.assertEqual(expected[-1], ("french", "german"))
+
+        extractor = LanguageExtractor(
+            ["first (?P<rx_primary>\\w+)", "main (?P<rx_primary>\\w+)"], [])
+        self.assertEqual(extractor.extract("main one first two"),
+                         ("two", None))
+        self.assertEqual(LanguageExtractor([], []).extract("test"),
+                         (None, None))
+
+
+class TestResourceBundle(unittest.TestCase):
+    def test_is_stale(self):
+        from os import makedirs, utime
+        from os.path import join
+        from tempfile import TemporaryDirectory
+        from time import time
+        from skill_user_settings.util.resource_bundle import build_bundle, \
+            is_stale
+
+        with TemporaryDirectory() as tmp:
+            lang_dir = join(tmp, "en-us")
+            makedirs(join(lang_dir, "vocab"))
+            voc_file = join(lang_dir, "vocab", "test.voc")
+            with open(voc_file, "w") as f:
+                f.write("test")
+            bundle_file = join(tmp, "en-us.bundle")
+            build_bundle(lang_dir, bundle_file)
+            # Sources older than the bundle
+            past = time() - 60
+            for path in (voc_file, join(lang_dir, "vocab"), lang_dir):
+                utime(path, (past, past))
+            self.assertFalse(is_stale(bundle_file, lang_dir))
+            self.assertFalse(is_stale(bundle_file, join(tmp, "missing")))
+
+            # Edited files are newer than the bundle
+            future = time() + 60
+            utime(voc_file, (future, future))
+            self.assertTrue(is_stale(bundle_file, lang_dir))
+
+            # Added files change their directory's time
+            utime(voc_file, (past, past))
+            utime(join(lang_dir, "vocab"), (future, future))
+            self.assertTrue(is_stale(bundle_file, lang_dir))
+
+    def test_resource_bundle(self):
+        import builtins
+        from os import listdir
+        from os.path import dirname, join
+        from shutil import copytree
+        from tempfile import TemporaryDirectory
+        from ovos_workshop.resource_files import SkillResources
+        from skill_user_settings.util.language_parser import read_patterns
+        from skill_user_settings.util.resource_bundle import ResourceBundle, \
+            build_bundle, main
+
+        root = dirname(dirname(__file__))
+        with TemporaryDirectory() as tmp:
+            bundle_file = join(tmp, "en-us.bundle")
+            count = build_bundle(join(root, "locale", "en-us"), bundle_file)
+            bundle = ResourceBundle(bundle_file)
+            self.assertEqual(len(bundle), count)
+            self.assertGreater(count, 100)
+
+            resources = SkillResources(root, "en-us")
+            for name in ("languages.value", "months.value",
+                         "email_domains.value"):
+                self.assertEqual(bundle.load_named_values(name),
+                                 resources.load_named_value_file(name))
+            for name in ("name_particles", "name_suffixes"):
+                self.assertEqual(bundle.load_list(name),
+                                 resources.load_list_file(name))
+            regex_dir = join(root, "locale", "en-us", "regex")
+            for name in listdir(regex_dir):
+                self.assertEqual(bundle.load_patterns(name),
+                                 read_patterns(join(regex_dir, name)))
+            self.assertEqual(bundle.load_vocabulary("dot"), [["dot"]])
+            # Vocab is normalized and expanded like loose files. Expansion
+            # is slow, so only files with options or capitals are compared
+            for name in ("imperial.voc", "metric.voc", "at.voc"):
+                self.assertEqual(bundle.load_vocabulary(name),
+                                 resources.load_vocabulary_file(name), name)
+            self.assertIn(["sae"], bundle.load_vocabulary("imperial"))
+            with open(join(root, "locale", "en-us", "dialog",
+                           "language_set.dialog")) as f:
+                self.assertEqual(bundle.read("language_set.dialog", "dialog"),
+                                 f.read())
+            self.assertIsNone(bundle.read("missing.value"))
+            self.assertIsNone(bundle.load_list("missing"))
+            self.assertEqual(bundle.load_named_values("missing"), dict())
+
+            # Compare reading runtime resources with loose files
+            real_open = builtins.open
+            opened = list()
+
+            def _open(file, *args, **kwargs):
+                opened.append(file)
+                return real_open(file, *args, **kwargs)
+
+            def _read_loose():
+                resources = SkillResources(root, "en-us")
+                for name in ("languages.value", "months.value",
+                             "email_domains.value"):
+                    resources.load_named_value_file(name)
+                for name in ("name_particles", "name_suffixes"):
+                    resources.load_list_file(name)
+                for name in ("primary_tts.rx", "secondary_tts.rx"):
+                    read_patterns(join(regex_dir, name))
+                resources.load_vocabulary_file("dot.voc")
+
+            def _read_bundle(bundle=None):
+                bundle = bundle or ResourceBundle(bundle_file)
+                for name in ("languages.value", "months.value",
+                             "email_domains.value"):
+                    bundle.load_named_values(name)
+                for name in ("name_particles", "name_suffixes"):
+                    bundle.load_list(name)
+                for name in ("primary_tts.rx", "secondary_tts.rx"):
+                    bundle.load_patterns(name)
+                bundle.load_vocabulary("dot.voc")
+
+            # A bundle is read with one file open instead of one per file.
+            # See `test/benchmarks.py read_resources` for the speedup
+            bundle = ResourceBundle(bundle_file)
+            with patch("builtins.open", _open):
+                _read_loose()
+                loose_opens = len(opened)
+                opened.clear()
+                _read_bundle()
+                self.assertEqual(opened, [bundle_file])
+                opened.clear()
+                # The skill keeps one bundle per language, which is read
+                # when it is loaded
+                for _ in range(3):
+                    _read_bundle(bundle)
+                self.assertEqual(opened, [])
+            self.assertGreater(loose_opens, 1)
+
+            # Build bundles for every language
+            locale_dir = join(tmp, "locale")
+            copytree(join(root, "locale"), locale_dir)
+            main([locale_dir])
+            self.assertEqual(
+                ResourceBundle(join(locale_dir, "uk-ua.bundle"))
+                .load_named_values("languages.value"),
+                SkillResources(root, "uk-ua").load_named_value_file(
+                    "languages.value"))
+
+            with open(join(tmp, "empty.bundle"), 'w'):
+                pass
+            with self.assertRaises(ValueError):
+                ResourceBundle(join(tmp, "empty.bundle"))
+
+
+class TestProfileCache(unittest.TestCase):
+    def test_profile_cache(self):
+        from skill_user_settings.util.profile_cache import ProfileCache, \
+            profile_fingerprint
+        cache = ProfileCache(max_users=2)
+        old = {"user": {"username": "user_1"}, "units": {"measure": "metric"}}
+        new = {"user": {"username": "user_1"},
+               "units": {"measure": "imperial"}}
+        self.assertEqual(cache.version("user_1"), (0, ""))
+        self.assertIsNone(cache.get_latest("user_1", old))
+
+        # Versioned update superseding the profile it was applied to
+        self.assertTrue(cache.update("user_1", new, (1, "a"),
+                                     profile_fingerprint(old)))
+        self.assertEqual(cache.get_latest("user_1", old), new)
+        self.assertIsNone(cache.get_latest("user_1", new))
+        self.assertEqual(cache.next_version("user_1", "b"), (2, "b"))
+
+        # Duplicate and older updates are ignored
+        self.assertFalse(cache.update("user_1", new, [1, "a"]))
+        self.assertFalse(cache.update("user_1", old, (0, "b")))
+        self.assertEqual(cache.stale_updates, 1)
+
+        # Unversioned updates are newer than any cached version
+        self.assertTrue(cache.update("user_1", old))
+        self.assertEqual(cache.version("user_1"), (2, ""))
+        self.assertEqual(cache.get_latest("user_1", new), old)
+        self.assertIsNone(cache.get_latest("user_1", old))
+
+        # Ties between instances are ordered by origin
+        self.assertTrue(cache.update("user_1", new, (3, "b")))
+        self.assertFalse(cache.update("user_1", old, (3, "a")))
+        self.assertEqual(cache.get_latest("user_1", old), new)
+
+        # Least recently updated users are evicted
+        cache.update("user_2", old)
+        cache.update("user_3", old)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.version("user_1"), (0, ""))
+        self.assertEqual(cache.stats["evictions"], 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_multi_instance_coherence(self):
+        from copy import deepcopy
+        from ovos_bus_client import Message
+        from ovos_utils.fakebus import FakeBus
+        from skill_user_settings.util.profile_cache import ProfileCache, \
+            profile_fingerprint
+
+        # Instances sharing a messagebus, handling updates like the skill
+        bus = FakeBus()
+        instances = [ProfileCache() for _ in range(8)]
+        received = list()
+
+        def _handler(cache):
+            def _on_update(message):
+                profile = message.data["profile"]
+                cache.update(profile["user"]["username"], profile,
+                             message.context.get("profile_version"),
+                             message.context.get("profile_supersedes"))
+                received.append(cache)
+            return _on_update
+
+        for cache in instances:
+            bus.on("neon.profile_update", _handler(cache))
+
+        profile = {"user": {"username": "test_user"},
+                   "units": {"measure": "metric"}}
+        snapshots = [deepcopy(profile)]
+        for idx in range(50):
+            writer = instances[idx % len(instances)]
+            updated = deepcopy(profile)
+            updated["units"]["measure"] = \
+                "imperial" if idx % 2 else "metric"
+            updated["user"]["write"] = idx
+            version = writer.next_version("test_user", f"instance_{idx}")
+            received.clear()
+            bus.emit(Message("neon.profile_update", {"profile": updated},
+                             {"profile_version": version,
+                              "profile_supersedes":
+                                  profile_fingerprint(profile)}))
+            # Every instance receives each update once
+            self.assertEqual(len(received), len(instances))
+            self.assertEqual(set(map(id, received)), set(map(id, instances)))
+            snapshots.append(deepcopy(updated))
+            profile = updated
+
+        # All instances converge and replace any superseded snapshot
+        for cache in instances:
+            self.assertEqual(cache.version("test_user")[0], 50)
+            for snapshot in snapshots[-cache.max_superseded:-1]:
+                self.assertEqual(cache.get_latest("test_user", snapshot),
+                                 profile)
+            self.assertIsNone(cache.get_latest("test_user", profile))
+            # The staleness window is measured, not asserted, since it
+            # depends on the load of the machine running the test
+            stats = cache.stats
+            self.assertEqual(stats["updates"], 50)
+            self.assertEqual(stats["stale_reads"], cache.max_superseded - 1)
+            self.assertGreaterEqual(stats["max_staleness"], 0)
+
+        # Reordered delivery does not roll back any instance
+        bus.emit(Message("neon.profile_update", {"profile": snapshots[0]},
+                         {"profile_version": [1, "instance_0"]}))
+        for cache in instances:
+            self.assertIsNone(cache.get_latest("test_user", profile))
+            self.assertEqual(cache.get_latest("test_user", snapshots[0]),
+                             profile)
+            self.assertEqual(cache.stats["stale_updates"], 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_bucket(self):
+        from skill_user_settings.util.rate_limiter import TokenBucket
+        bucket = TokenBucket(rate=2, capacity=4, now=0)
+        self.assertTrue(bucket.full)
+        bucket.tokens = 0
+        self.assertEqual(bucket.refill(1), 2)
+        self.assertEqual(bucket.refill(0.5), 2)
+        self.assertEqual(bucket.refill(10), 4)
+        self.assertTrue(bucket.full)
+
+    def test_rate_limiter(self):
+        from skill_user_settings.util.rate_limiter import RateLimiter
+        now = [100.0]
+        with patch("skill_user_settings.util.rate_limiter.monotonic",
+                   lambda: now[0]):
+            limiter = RateLimiter({
+                "settings": {"user_rate": 60, "user_burst": 2,
+                             "global_rate": 60, "global_burst": 3},
+                "geocode": {"user_rate": 6, "user_burst": 1}})
+            # Per-user burst, then refill at the configured rate
+            self.assertEqual(limiter.try_acquire("u1", ["settings"]),
+                             (True, None))
+            self.assertTrue(limiter.try_acquire("u1", ["settings"])[0])
+            self.assertEqual(limiter.try_acquire("u1", ["settings"]),
+                             (False, "settings"))
+            now[0] += 1
+            self.assertTrue(limiter.try_acquire("u1", ["settings"])[0])
+
+            # Global budget is shared by all users
+            self.assertTrue(limiter.try_acquire("u2", ["settings"])[0])
+            self.assertEqual(limiter.try_acquire("u2", ["settings"]),
+                             (False, "settings"))
+            now[0] += 1
+            self.assertTrue(limiter.try_acquire("u2", ["settings"])[0])
+
+            # Throttled requests consume nothing from other budgets
+            now[0] += 10
+            self.assertTrue(limiter.try_acquire("u3", ["settings",
+                                                       "geocode"])[0])
+            self.assertEqual(limiter.try_acquire("u3", ["settings",
+                                                        "geocode"]),
+                             (False, "geocode"))
+            self.assertTrue(limiter.try_acquire("u3", ["settings"])[0])
+            self.assertTrue(limiter.try_acquire("u3", ["unknown"])[0])
+
+            stats = limiter.stats
+            self.assertEqual(stats["users"], 4)
+            self.assertEqual(stats["budgets"]["settings"],
+                             {"allowed": 7, "throttled_user": 1,
+                              "throttled_global": 1})
+            self.assertEqual(stats["budgets"]["geocode"],
+                             {"allowed": 1, "throttled_user": 1,
+                              "throttled_global": 0})
+
+            # Nested handlers are counted once
+            now[0] += 10
+            with limiter.limit("u4", ["settings"]) as allowed:
+                self.assertTrue(allowed)
+                for _ in range(5):
+                    with limiter.limit("u4", ["settings"]) as nested:
+                        self.assertTrue(nested)
+            with limiter.limit("u4", ["settings"]) as allowed:
+                self.assertTrue(allowed)
+            with limiter.limit("u4", ["settings"]) as allowed:
+                self.assertFalse(allowed)
+
+            limiter.reset()
+            self.assertEqual(limiter.stats["users"], 0)
+            self.assertTrue(limiter.try_acquire("u4", ["settings"])[0])
+
+    def test_rate_limiter_users(self):
+        from skill_user_settings.util.rate_limiter import RateLimiter
+        limiter = RateLimiter({"settings": {"user_rate": 60,
+                                            "user_burst": 5}},
+                              max_users=1000)
+        # Tracked users stay bounded, so checks cost the same regardless of
+        # how many users made requests. See `test/benchmarks.py
+        # rate_limiter_users` for the cost per check
+        for idx in range(51000):
+            limiter.try_acquire(f"user_{idx}", ["settings"])
+            self.assertLessEqual(limiter.stats["users"], 1000)
+        self.assertEqual(limiter.stats["users"], 1000)
+        self.assertEqual(limiter.stats["budgets"]["settings"]["allowed"],
+                         51000)
+
+        # Least recently seen users are forgotten first
+        for _ in range(4):
+            limiter.try_acquire("user_50999", ["settings"])
+        self.assertFalse(limiter.try_acquire("user_50999", ["settings"])[0])
+        limiter.try_acquire("user_0", ["settings"])
+        self.assertNotIn(("settings", "user_50000"), limiter._users)
+        self.assertIn(("settings", "user_50001"), limiter._users)
+        self.assertIn(("settings", "user_50999"), limiter._users)
+
+
+class TestProfilePatch(unittest.TestCase):
+    def test_make_apply_patch(self):
+        from copy import deepcopy
+        from skill_user_settings.util.profile_patch import PatchError, \
+            apply_patch, make_patch
+        old = {"speech": {"speed_multiplier": 1.0, "tts_language": "en-us"},
+               "units": {"measure": "imperial"},
+               "a/b": {"c~d": 1}, "removed": True}
+        new = deepcopy(old)
+        new["speech"]["speed_multiplier"] = 1.1
+        new["units"]["time"] = 24
+        new["a/b"]["c~d"] = 2
+        del new["removed"]
+        ops = make_patch(old, new)
+        self.assertEqual(ops, [
+            {"op": "replace", "path": "/speech/speed_multiplier",
+             "value": 1.1},
+            {"op": "add", "path": "/units/time", "value": 24},
+            {"op": "replace", "path": "/a~1b/c~0d", "value": 2},
+            {"op": "remove", "path": "/removed"}])
+        self.assertEqual(apply_patch(deepcopy(old), ops), new)
+        self.assertEqual(make_patch(new, new), [])
+        self.assertEqual(make_patch({"a": 1}, {"a": 1.0}),
+                         [{"op": "replace", "path": "/a", "value": 1.0}])
+
+        for bad_op in ({"op": "replace", "path": "/missing", "value": 1},
+                       {"op": "remove", "path": "/speech/missing"},
+                       {"op": "add", "path": "/missing/key", "value": 1},
+                       {"op": "move", "path": "/units"},
+                       {"op": "add", "path": "", "value": 1}):
+            with self.assertRaises(PatchError):
+                apply_patch(deepcopy(old), [bad_op])
+
+    def test_patch_messages(self):
+        import json
+        from copy import deepcopy
+        from neon_utils.user_utils import get_default_user_config
+        from skill_user_settings.util.profile_cache import ProfileCache, \
+            profile_fingerprint
+        from skill_user_settings.util.profile_patch import make_patch
+
+        profile = deepcopy(get_default_user_config())
+        profile["user"]["username"] = "test_user"
+        updated = deepcopy(profile)
+        updated["speech"]["speed_multiplier"] = 1.1
+        base_version, version = (1, "a"), (2, "a")
+        update_message = {"profile": updated}
+        patch_message = {"username": "test_user",
+                         "base_version": base_version, "version": version,
+                         "patch": make_patch(profile, updated),
+                         "fingerprint": profile_fingerprint(updated),
+                         "supersedes": profile_fingerprint(profile)}
+        self.assertLess(len(json.dumps(patch_message)) * 3,
+                        len(json.dumps(update_message)))
+
+        def _receivers():
+            caches = [ProfileCache() for _ in range(100)]
+            for cache in caches:
+                cache.update("test_user", profile, base_version)
+            return caches
+
+        # Receivers patch their cached profile in place instead of copying
+        # the complete profile. See `test/benchmarks.py profile_patches` for
+        # the speedup
+        caches = _receivers()
+        serialized = json.dumps(patch_message)
+        with patch("skill_user_settings.util.profile_cache.deepcopy") as copy:
+            for cache in caches:
+                data = json.loads(serialized)
+                self.assertTrue(cache.apply_patch(
+                    data["username"], data["patch"], data["base_version"],
+                    data["version"], data["fingerprint"], data["supersedes"]))
+        copy.assert_not_called()
+        for cache in caches:
+            self.assertEqual(cache.version("test_user"), version)
+            self.assertEqual(cache.get_latest("test_user", profile), updated)
+            self.assertEqual(cache.stats["patches"], 1)
+
+        # Patches after a missed update are dropped
+        cache = caches[0]
+        self.assertFalse(cache.apply_patch(
+            "test_user", patch_message["patch"], (3, "b"), (4, "b"),
+            patch_message["fingerprint"]))
+        self.assertFalse(cache.apply_patch(
+            "other_user", patch_message["patch"], base_version, version,
+            patch_message["fingerprint"]))
+        self.assertEqual(cache.stats["patch_gaps"], 2)
+        self.assertEqual(cache.version("test_user"), version)
+
+        # Duplicate patches are ignored
+        self.assertFalse(cache.apply_patch(
+            "test_user", patch_message["patch"], base_version, version,
+            patch_message["fingerprint"]))
+        self.assertEqual(cache.stats["patch_gaps"], 2)
+
+        # Patches that do not apply invalidate the cached profile
+        self.assertFalse(cache.apply_patch(
+            "test_user", [{"op": "remove", "path": "/missing"}], version,
+            (5, "a"), patch_message["fingerprint"]))
+        self.assertEqual(cache.version("test_user"), (0, ""))
+
+
+class TestRecentPlaces(unittest.TestCase):
+    def test_recent_places(self):
+        from os.path import isfile, join
+        from tempfile import TemporaryDirectory
+        from skill_user_settings.util.recent_places import RecentPlaces, \
+            normalize_place
+
+        self.assertEqual(normalize_place("  Paris,  France. "), "paris france")
+        self.assertEqual(normalize_place(None), "")
+
+        seattle = {"lat": "47.6", "lon": "-122.3",
+                   "address": {"city": "Seattle", "state": "Washington",
+                               "country": "United States"}}
+        paris = {"lat": "48.9", "lon": "2.3",
+                 "address": {"city": "Paris", "country": "France"}}
+        with TemporaryDirectory() as tmp:
+            file_path = join(tmp, "skill", "recent_places.json")
+            places = RecentPlaces(max_places=2, file_path=file_path,
+                                  save_delay=60)
+            self.assertIsNone(places.match("test_user", "seattle"))
+            places.add("test_user", "Seattle Washington",
+                       dict(seattle, display_name="Seattle, King County",
+                            osm_id=237385), "America/Los_Angeles")
+            expected = {"place": seattle, "tz": "America/Los_Angeles"}
+
+            # Only fields needed to update a profile are retained
+            self.assertEqual(places.match("test_user", "seattle washington."),
+                             expected)
+            # Mis-transcribed names match
+            self.assertEqual(places.match("test_user", "seatle washington"),
+                             expected)
+            # Places that differ by a qualifier never match
+            for known, spoken in (("springfield il", "springfield ma"),
+                                  ("kansas city ks", "kansas city mo"),
+                                  ("washington dc", "washington pa")):
+                near = RecentPlaces()
+                near.add("test_user", known, paris, "Europe/Paris")
+                self.assertIsNone(near.match("test_user", spoken), spoken)
+                self.assertIsNotNone(near.match("test_user", known.upper()))
+            # Resolved city names are not indexed
+            self.assertIsNone(places.match("test_user", "seattle"))
+            self.assertIsNone(places.match("test_user", "boston"))
+            # Places are per-user
+            self.assertIsNone(places.match("other_user", "seattle washington"))
+            self.assertEqual(places.stats, {"users": 1, "hits": 2,
+                                            "fuzzy_hits": 1, "misses": 4})
+
+            # A place never matches another place sharing its city name
+            places.add("test_user", "Paris Texas",
+                       {"lat": "33.7", "lon": "-95.6",
+                        "address": {"city": "Paris", "state": "Texas",
+                                    "country": "United States"}},
+                       "America/Chicago")
+            self.assertIsNone(places.match("test_user", "paris"))
+
+            # Places are persisted in batches
+            self.assertFalse(isfile(file_path))
+            places.flush()
+            loaded = RecentPlaces(file_path=file_path)
+            loaded.load()
+            self.assertEqual(loaded.match("test_user", "seattle washington"),
+                             expected)
+
+            # Least recently used places are removed first
+            places.match("test_user", "seattle washington")
+            places.add("test_user", "paris", paris, "Europe/Paris")
+            self.assertIsNone(places.match("test_user", "paris texas"))
+            self.assertIsNotNone(places.match("test_user",
+                                              "seattle washington"))
+            self.assertEqual(places.match("test_user", "paris")["tz"],
+                             "Europe/Paris")
+
+            # Removals are written immediately
+            places.clear("test_user")
+            self.assertIsNone(places.match("test_user", "seattle washington"))
+            loaded.load()
+            self.assertIsNone(loaded.match("test_user", "seattle washington"))
+
+            # Without a delay, every change is written
+            immediate = RecentPlaces(file_path=file_path, save_delay=0)
+            immediate.add("test_user", "paris", paris, "Europe/Paris")
+            loaded.load()
+            self.assertIsNotNone(loaded.match("test_user", "paris"))
+
+            # Least recently active users are removed beyond `max_users`
+            limited = RecentPlaces(max_users=2)
+            for user in ("user_1", "user_2", "user_3"):
+                limited.add(user, "paris", paris, "Europe/Paris")
+                limited.match("user_1", "paris")
+            self.assertEqual(limited.stats["users"], 2)
+            self.assertIsNotNone(limited.match("user_1", "paris"))
+            self.assertIsNone(limited.match("user_2", "paris"))
+
+            # A limit of 0 disables the store
+            disabled = RecentPlaces(max_places=0)
+            disabled.add("test_user", "paris", paris, "Europe/Paris")
+            self.assertIsNone(disabled.match("test_user", "paris"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from datetime import datetime, tzinfo
+from heapq import heapify, heappop, heappush
+from threading import Lock
+from typing import List, Optional
+
+from ovos_utils.log import LOG
+
+from .profile_utils import UNSET_DOB
+
+
+class _Birthday:
+    __slots__ = ("username", "month", "day", "tz", "next_time", "context")
+
+    def __init__(self, username: str, month: int, day: int, tz: tzinfo):
+        self.username = username
+        self.month = month
+        self.day = day
+        self.tz = tz
+        self.next_time = None
+        self.context = None
+
+
+def parse_dob(dob: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a profile `dob` value
+    :param dob: date of birth string in "YYYY/MM/DD" format
+    :returns: parsed datetime, or None if unset or invalid
+    """
+    if not dob or dob == UNSET_DOB:
+        return None
+    try:
+        return datetime.strptime(dob, "%Y/%m/%d")
+    except ValueError:
+        LOG.warning(f"Invalid dob: {dob}")
+        return None
+
+
+def next_birthday(month: int, day: int, tz: tzinfo, now: datetime,
+                  hour: int = 0) -> datetime:
+    """
+    Get the next occurrence of a birthday after `now`
+    :param month: birthday month
+    :param day: birthday day of month
+    :param tz: timezone the birthday is observed in
+    :param now: time to get the next birthday after
+    :param hour: hour of the day in `tz` to return
+    :returns: timezone-aware datetime of the next birthday
+    """
+    now = now.astimezone(tz)
+    for year in (now.year, now.year + 1, now.year + 2):
+        try:
+            birthday = datetime(year, month, day, hour, tzinfo=tz)
+        except ValueError:
+            # February 29 in a non-leap year
+            birthday = datetime(year, month, day - 1, hour, tzinfo=tz)
+        if birthday > now:
+            return birthday
+    raise ValueError(f"Invalid birthday: {month}/{day}")
+
+
+class BirthdayScheduler:
+    """
+    Tracks the next birthday of each known user in a min-heap so the next
+    due greeting can be found without scanning every user. Users whose
+    profiles were not seen recently are forgotten beyond `max_users` and are
+    tracked again with their next profile update.
+    """
+    def __init__(self, greeting_hour: int = 9, max_users: int = 10000):
+        """
+        :param greeting_hour: hour of the day in each user's timezone to greet
+        :param max_users: max number of users to track; the least recently
+            updated are removed first
+        """
+        self.greeting_hour = greeting_hour
+        self.max_users = max_users
+        self._users = OrderedDict()
+        self._heap = list()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._users)
+
+    def update_user(self, username: str, dob: Optional[str], tz: tzinfo,
+                    now: Optional[datetime] = None,
+                    context: Optional[dict] = None) -> Optional[datetime]:
+        """
+        Add or update a user's birthday
+        :param username: user to track
+        :param dob: user's date of birth in "YYYY/MM/DD" format
+        :param tz: user's timezone
+        :param now: current time (default now)
+        :param context: message context to greet the user in; the latest
+            context replaces any previous one
+        :returns: time of the user's next birthday greeting, if any
+        """
+        birth_date = parse_dob(dob)
+        if not birth_date:
+            self.remove_user(username)
+            return None
+        with self._lock:
+            record = self._users.get(username)
+            if not record or (record.month, record.day, record.tz) != \
+                    (birth_date.month, birth_date.day, tz):
+                previous = record
+                record = _Birthday(username, birth_date.month,
+                                   birth_date.day, tz)
+                record.context = previous.context if previous else None
+                self._users[username] = record
+                self._schedule(record, now or datetime.now(tz))
+            self._users.move_to_end(username)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+            if context is not None:
+                record.context = context
+            return record.next_time
+
+    def get_context(self, username: str) -> Optional[dict]:
+        """
+        Get the message context a user's birthday was last updated in
+        :param username: tracked user
+        :returns: message context, or None if unknown
+        """
+        with self._lock:
+            record = self._users.get(username)
+            return record.context if record else None
+
+    def remove_user(self, username: str):
+        """
+        Stop tracking a user. Stale heap entries are skipped when popped.
+        :param username: user to remove
+        """
+        with self._lock:
+            self._users.pop(username, None)
+
+    def _schedule(self, record: _Birthday, now: datetime):
+        record.next_time = next_birthday(record.month, record.day, record.tz,
+                                         now, self.greeting_hour)
+        heappush(self._heap, (record.next_time.timestamp(), record.username))
+        if len(self._heap) > 2 * len(self._users) + 16:
+            # Drop entries of removed or rescheduled users
+            self._heap = [entry for entry in self._heap
+                          if self._is_current(entry)]
+            heapify(self._heap)
+
+    def _is_current(self, entry: tuple) -> bool:
+        record = self._users.get(entry[1])
+        return bool(record) and record.next_time.timestamp() == entry[0]
+
+    @property
+    def next_due(self) -> Optional[datetime]:
+        """
+        Get the time of the next birthday greeting
+        """
+        with self._lock:
+            while self._heap and not self._is_current(self._heap[0]):
+                heappop(self._heap)
+            if not self._heap:
+                return None
+            return self._users[self._heap[0][1]].next_time
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Get users with a birthday greeting due and schedule their next one
+        :param now: current time (default now)
+        :returns: list of usernames to greet
+        """
+        now = now or datetime.now().astimezone()
+        timestamp = now.timestamp()
+        due = list()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= timestamp:
+                entry = heappop(self._heap)
+                if not self._is_current(entry):
+                    continue
+                record = self._users[entry[1]]
+                due.append(record.username)
+                self._schedule(record, now)
+        return due
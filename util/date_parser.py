@@ -0,0 +1,118 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from datetime import datetime
+from typing import Dict, Optional, Pattern
+
+# Day of month with an optional ordinal suffix, i.e. `5`, `5th`, `5-го`
+_DAY = r"(?P<{0}>[0-3]?\d)(?:-?[^\W\d_]{{1,3}})?\b"
+# Separator with an optional short filler word, i.e. `, `, ` the `, ` of `
+_SEP = r"[\s,]+(?:[^\W\d_]{1,3}[\s,]+)?"
+# Year with an optional short filler word, i.e. ` 1990`, ` of 1990`, ` in 1990`
+_YEAR = r"(?:,?\s+(?:[^\W\d_]{1,3}\s+)?(?P<year>\d{4})\b)?"
+_ANY_YEAR = re.compile(r"\b\d{4}\b")
+
+
+def has_year(utterance: str) -> bool:
+    """
+    Check if an utterance includes a 4-digit year
+    :param utterance: string to check
+    :returns: True if `utterance` contains a year
+    """
+    return bool(_ANY_YEAR.search(utterance or ""))
+
+
+def previous_occurrence(date: datetime, now: datetime) -> datetime:
+    """
+    Get the latest occurrence of a date's month and day that is not after
+    `now`, i.e. for birthdays spoken without a year
+    :param date: date to move back
+    :param now: tz-aware datetime the result may not be after
+    :returns: `date` in the latest year that is not after `now`
+    """
+    year = min(date.year, now.year)
+    while True:
+        try:
+            moved = date.replace(year=year)
+        except ValueError:
+            # February 29 only occurs in leap years
+            year -= 1
+            continue
+        if moved.date() <= now.date():
+            return moved
+        year -= 1
+
+
+def compile_date_pattern(months: Dict[str, int]) -> Pattern:
+    """
+    Compile a pattern matching spoken dates like `march 5th, 1990` or
+    `the 5th of march` for the given month names
+    :param months: dict of lowercase month names to month numbers
+    :returns: compiled case-insensitive pattern
+    """
+    # Longest names first so `march` is not matched as `mar`
+    month = "|".join(re.escape(name) for name in
+                     sorted(months, key=len, reverse=True))
+    month_day = rf"(?P<month_1>{month})\b{_SEP}{_DAY.format('day_1')}"
+    day_month = rf"{_DAY.format('day_2')}{_SEP}(?P<month_2>{month})\b"
+    return re.compile(rf"\b(?:{month_day}|{day_month}){_YEAR}", re.IGNORECASE)
+
+
+def extract_date(pattern: Pattern, months: Dict[str, int], utterance: str,
+                 now: datetime) -> Optional[datetime]:
+    """
+    Extract a date from an utterance using a pattern from
+    `compile_date_pattern`. Dates without a year resolve to the next
+    occurrence after `now`, consistent with `extract_datetime`.
+    :param pattern: compiled date pattern
+    :param months: dict of lowercase month names to month numbers
+    :param utterance: string to parse
+    :param now: tz-aware datetime to resolve dates relative to
+    :returns: tz-aware datetime at midnight if a valid date was found
+    """
+    match = pattern.search(utterance)
+    if not match:
+        return None
+    if not match.group("year") and has_year(utterance[match.end():]):
+        # A year the pattern did not match; leave it to `extract_datetime`
+        return None
+    month = months[(match.group("month_1") or match.group("month_2")).lower()]
+    day = int(match.group("day_1") or match.group("day_2"))
+    year = match.group("year")
+    try:
+        if year:
+            return datetime(int(year), month, day, tzinfo=now.tzinfo)
+        extracted = datetime(now.year, month, day, tzinfo=now.tzinfo)
+        if extracted <= now:
+            extracted = extracted.replace(year=now.year + 1)
+        return extracted
+    except ValueError:
+        # Invalid date, i.e. February 30
+        return None
@@ -0,0 +1,156 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from contextlib import contextmanager
+from threading import Condition, local
+from time import monotonic
+from typing import Iterator, Optional
+
+from ovos_utils.log import LOG
+
+
+class HandlerLimiter:
+    """
+    Limits the number of handlers running at once. Handlers for the same user
+    are serialized and requests beyond `max_queued` waiting handlers are
+    rejected immediately.
+    """
+    def __init__(self, max_concurrent: int = 4, max_queued: int = 8,
+                 queue_timeout: Optional[float] = 30):
+        """
+        :param max_concurrent: max number of handlers to run at once
+        :param max_queued: max number of handlers waiting to run
+        :param queue_timeout: max seconds a handler may wait to run
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._condition = Condition()
+        self._active_users = set()
+        self._queued = 0
+        self._local = local()
+
+        self.completed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def active(self) -> int:
+        return len(self._active_users)
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get a dict of current queue state and wait-time metrics
+        """
+        with self._condition:
+            accepted = self.completed + self.active
+            return {"active": self.active,
+                    "queued": self._queued,
+                    "max_queue_depth": self.max_queue_depth,
+                    "completed": self.completed,
+                    "rejected": self.rejected,
+                    "mean_wait": self.total_wait / accepted if accepted else 0,
+                    "max_wait": self.max_wait}
+
+    def _can_run(self, user: str) -> bool:
+        return len(self._active_users) < self.max_concurrent and \
+            user not in self._active_users
+
+    def try_acquire(self, user: str) -> bool:
+        """
+        Wait for a slot to run a handler for `user`.
+        :param user: user the handler is running for
+        :returns: True if a slot was acquired, False if the request is rejected
+        """
+        start = monotonic()
+        with self._condition:
+            if not self._can_run(user):
+                if self._queued >= self.max_queued:
+                    self.rejected += 1
+                    LOG.warning(f"Handler queue full ({self._queued}); "
+                                f"rejecting request for {user}")
+                    return False
+                self._queued += 1
+                self.max_queue_depth = max(self.max_queue_depth, self._queued)
+                try:
+                    if not self._condition.wait_for(
+                            lambda: self._can_run(user), self.queue_timeout):
+                        self.rejected += 1
+                        LOG.warning(f"Timed out waiting to handle request "
+                                    f"for {user}")
+                        return False
+                finally:
+                    self._queued -= 1
+            self._active_users.add(user)
+            wait = monotonic() - start
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return True
+
+    def release(self, user: str):
+        """
+        Release a slot acquired by `try_acquire`.
+        :param user: user the handler was running for
+        """
+        with self._condition:
+            self._active_users.discard(user)
+            self.completed += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def acquire(self, user: str) -> Iterator[bool]:
+        """
+        Context manager wrapping `try_acquire` and `release`. Nested calls on
+        the same thread (a handler calling another handler) reuse the slot
+        already held.
+        :param user: user the handler is running for
+        :returns: True if the handler may run, else False
+        """
+        if getattr(self._local, "depth", 0):
+            self._local.depth += 1
+            try:
+                yield True
+            finally:
+                self._local.depth -= 1
+            return
+        if not self.try_acquire(user):
+            yield False
+            return
+        self._local.depth = 1
+        try:
+            yield True
+        finally:
+            self._local.depth = 0
+            self.release(user)
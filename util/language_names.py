@@ -0,0 +1,108 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Lock
+from typing import Dict, Iterable, Optional
+
+from lingua_franca.format import pronounce_lang
+from ovos_utils.log import LOG
+
+
+class LanguageNames:
+    """
+    Table of pronounceable language names in one display language. Names are
+    resolved once per code, so lookups are dict reads.
+    """
+    def __init__(self, lang: str, aliases: Optional[Dict[str, str]] = None):
+        """
+        :param lang: language to pronounce names in
+        :param aliases: spoken names to language codes, used as names for
+            codes lingua_franca does not know (i.e. `languages.value`)
+        """
+        self.lang = lang
+        self._aliases = {code.strip().lower(): name
+                         for name, code in (aliases or {}).items()}
+        self._names: Dict[str, str] = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._names)
+
+    def warm(self, codes: Iterable[str]):
+        """
+        Resolve names for the given language codes
+        :param codes: language codes to add to the table
+        """
+        for code in codes:
+            self.get(code)
+
+    def get(self, code: str) -> str:
+        """
+        Get the pronounceable name of a language
+        :param code: language code, i.e. `en-us` or `uk`
+        :returns: name of the language, else `code` if no name is known
+        """
+        try:
+            return self._names[code]
+        except KeyError:
+            pass
+        with self._lock:
+            if code not in self._names:
+                self._names[code] = self._resolve(code)
+        return self._names[code]
+
+    @staticmethod
+    def _pronounce(code: str, lang: str) -> Optional[str]:
+        try:
+            return pronounce_lang(code, lang)
+        except Exception as e:
+            # lingua_franca raises if `lang` is not supported or loaded
+            LOG.debug(f"Unable to pronounce {code} in {lang}: {e}")
+            return None
+
+    def _resolve(self, code: str) -> str:
+        if not code:
+            return code
+        normalized = code.lower()
+        # Unknown codes are returned as-is, possibly lowercased
+        name = self._pronounce(code, self.lang)
+        if name and name.lower() != normalized:
+            return name
+        if normalized in self._aliases:
+            return self._aliases[normalized].title()
+        primary = normalized.split('-')[0]
+        if primary != normalized:
+            name = self._pronounce(primary, self.lang)
+            if name and name.lower() != primary:
+                return name
+        if self.lang.split('-')[0] != "en":
+            # Fall back to the English name before the raw code
+            name = self._pronounce(code, "en")
+            if name and name.lower() != normalized:
+                return name
+        return code
@@ -0,0 +1,91 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from typing import List, Optional, Tuple
+
+_GROUP_NAME = re.compile(r"\(\?P<(\w+)>")
+_GROUP_REF = re.compile(r"\(\?P=(\w+)\)")
+
+
+def read_patterns(rx_file: str) -> List[str]:
+    """
+    Read regex patterns from a `.rx` file, skipping blank and comment lines
+    :param rx_file: path to the `.rx` file
+    :returns: list of patterns in file order
+    """
+    with open(rx_file) as f:
+        return [pat.strip() for pat in f.read().splitlines()
+                if pat.strip() and not pat.strip().startswith("#")]
+
+
+def _rename_groups(pattern: str, suffix: str) -> str:
+    pattern = _GROUP_NAME.sub(lambda m: f"(?P<{m.group(1)}_{suffix}>",
+                              pattern)
+    return _GROUP_REF.sub(lambda m: f"(?P={m.group(1)}_{suffix})", pattern)
+
+
+class LanguageExtractor:
+    """
+    Extracts requested primary and secondary languages from an utterance with
+    a single compiled pattern. Each set of patterns is tried in order, like
+    searching with each pattern until one matches.
+    """
+    def __init__(self, primary_patterns: List[str],
+                 secondary_patterns: List[str]):
+        """
+        :param primary_patterns: patterns with an `rx_primary` group
+        :param secondary_patterns: patterns with an `rx_secondary` group
+        """
+        self._groups = {"rx_primary": list(), "rx_secondary": list()}
+        lookaheads = list()
+        idx = 0
+        for group, patterns in (("rx_primary", primary_patterns),
+                                ("rx_secondary", secondary_patterns)):
+            alternatives = list()
+            for pattern in patterns:
+                # Group names must be unique across all patterns
+                self._groups[group].append(f"{group}_{idx}")
+                alternatives.append(
+                    rf"(?=[\s\S]*?{_rename_groups(pattern, str(idx))})")
+                idx += 1
+            if alternatives:
+                lookaheads.append(f"(?:{'|'.join(alternatives)})?")
+        self._pattern = re.compile("".join(lookaheads))
+
+    def extract(self, utterance: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract requested languages
+        :param utterance: raw utterance spoken by the user
+        :returns: spoken primary, secondary languages requested
+        """
+        groups = self._pattern.match(f"{utterance}\n").groupdict()
+        return tuple(next((groups[name].strip() for name in
+                           self._groups[group] if groups.get(name)), None)
+                     for group in ("rx_primary", "rx_secondary"))
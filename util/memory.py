@@ -0,0 +1,91 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+import tracemalloc
+
+from os.path import dirname
+from typing import Dict, Optional
+
+_SKILL_DIR = dirname(dirname(__file__))
+
+
+def deep_getsizeof(obj, _seen: Optional[set] = None) -> int:
+    """
+    Get the approximate size in bytes of an object and everything it
+    references through containers, `__dict__`, and `__slots__`.
+    :param obj: object to measure
+    :returns: size in bytes
+    """
+    _seen = _seen if _seen is not None else set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_getsizeof(k, _seen) + deep_getsizeof(v, _seen)
+                    for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_getsizeof(i, _seen) for i in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_getsizeof(vars(obj), _seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_getsizeof(getattr(obj, slot), _seen)
+    return size
+
+
+def start_memory_audit(frames: int = 1):
+    """
+    Start tracing memory allocations if not already tracing
+    :param frames: number of stack frames to record per allocation
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def get_memory_report(structures: Dict[str, object], top: int = 10) -> dict:
+    """
+    Get a report of memory used by the named structures and, if allocations
+    are being traced, the lines in this skill holding the most memory.
+    :param structures: dict of name to object to measure
+    :param top: number of allocation sites to include
+    :returns: dict report of sizes in bytes
+    """
+    report = {"structures": {name: deep_getsizeof(obj)
+                             for name, obj in structures.items()}}
+    if tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(True, f"{_SKILL_DIR}/*"),))
+        stats = snapshot.statistics("lineno")
+        report["traced"] = sum(stat.size for stat in stats)
+        report["allocations"] = {str(stat.traceback): stat.size
+                                 for stat in stats[:top]}
+    return report
@@ -0,0 +1,97 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+_INVALID_NAME_CHARS = re.compile(r'[\'".,\d]')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an input name
+    @param name: the input name parsed from user utterance
+    @return: normalized name
+    """
+    return _INVALID_NAME_CHARS.sub('', name).strip().title()
+
+
+class NameParser:
+    """
+    Parses full names into first, middle, and last names using lexicons of
+    surname particles (`van`, `de`) and suffixes (`Jr`, `III`) for one
+    language. Parsed names are cached.
+    """
+    def __init__(self, particles: Iterable[str], suffixes: Iterable[str],
+                 cache_size: int = 1024):
+        """
+        :param particles: surname particles, i.e. `van`, `de`, `al`
+        :param suffixes: name suffixes, i.e. `jr`, `iii`
+        :param cache_size: max number of parsed names to cache
+        """
+        self.particles = frozenset(p.strip().lower() for p in particles
+                                   if p.strip())
+        self.suffixes = frozenset(s.strip().lower().rstrip('.')
+                                  for s in suffixes if s.strip())
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _is_particle(self, token: str) -> bool:
+        token = token.lower()
+        # Hyphenated particles like `al-Rashid` start a surname too
+        return token in self.particles or \
+            ('-' in token and token.split('-', 1)[0] in self.particles)
+
+    def _parse(self, name: str) -> Tuple[str, Optional[str], Optional[str]]:
+        """
+        Parse a name
+        :param name: full or partial name
+        :returns: first name, middle name, and last name
+        """
+        tokens = name.split()
+        suffix_start = len(tokens)
+        while suffix_start > 1 and \
+                tokens[suffix_start - 1].lower().rstrip('.') in self.suffixes:
+            suffix_start -= 1
+        names, suffixes = tokens[:suffix_start], tokens[suffix_start:]
+        if len(names) == 1:
+            # A single name keeps any suffix as part of the name
+            return " ".join(tokens), None, None
+
+        # The surname starts at the first particle. Otherwise it is the last
+        # word, or every word after a single middle name for longer names
+        # like `José Eduardo Santos Tavares`
+        last_start = min(len(names) - 1, 2)
+        for idx in range(1, len(names) - 1):
+            if self._is_particle(names[idx]):
+                last_start = idx
+                break
+        middle = " ".join(names[1:last_start]) or None
+        last = " ".join(names[last_start:] + suffixes)
+        return names[0], middle, last
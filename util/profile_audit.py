@@ -0,0 +1,171 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Audit stored user profiles for placeholder or invalid settings. Profiles are
+streamed one at a time, so memory use does not grow with the number of users.
+Example:
+
+    python -m skill_user_settings.util.profile_audit profiles.jsonl \
+        --languages en-us,uk-ua > report.jsonl
+"""
+
+import argparse
+import json
+import sys
+
+from collections import Counter
+from os import listdir
+from os.path import isdir, join, splitext
+from typing import Collection, Iterator, List, Optional, TextIO
+
+import yaml
+
+from ovos_utils.log import LOG
+
+from .profile_utils import MAX_SPEECH_SPEED, MIN_SPEECH_SPEED, UNSET_DOB, \
+    is_default_location, is_generated_username
+
+_LANGUAGE_KEYS = ("stt_language", "tts_language", "secondary_tts_language")
+
+
+def iter_profiles(path: str) -> Iterator[dict]:
+    """
+    Iterate over stored user profiles
+    :param path: JSON Lines file with one profile per line (`-` for stdin),
+        or a directory of `.json`/`.yml` profile files
+    :returns: iterator of user profiles
+    """
+    if isdir(path):
+        for file in sorted(listdir(path)):
+            ext = splitext(file)[1]
+            if ext not in (".json", ".yml", ".yaml"):
+                continue
+            with open(join(path, file)) as f:
+                profile = json.load(f) if ext == ".json" else \
+                    yaml.safe_load(f)
+            if isinstance(profile, dict):
+                yield profile
+            else:
+                LOG.warning(f"Skipping invalid profile: {file}")
+        return
+    if path == "-":
+        yield from _iter_json_lines(sys.stdin)
+        return
+    with open(path) as f:
+        yield from _iter_json_lines(f)
+
+
+def _iter_json_lines(stream: TextIO) -> Iterator[dict]:
+    for idx, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            LOG.warning(f"Skipping invalid profile on line {idx}: {e}")
+
+
+def audit_profile(profile: dict,
+                  languages: Optional[Collection[str]] = None) -> List[str]:
+    """
+    Check a user profile for placeholder or invalid settings
+    :param profile: user profile to audit
+    :param languages: supported language codes; languages are not checked
+        if None
+    :returns: list of issues found, empty if the profile is valid
+    """
+    user = profile.get("user") or dict()
+    location = profile.get("location") or dict()
+    speech = profile.get("speech") or dict()
+    issues = list()
+    if is_generated_username(user.get("username") or ""):
+        issues.append("generated_username")
+    if not user.get("dob") or user["dob"] == UNSET_DOB:
+        issues.append("placeholder_dob")
+    if is_default_location(location.get("lat"), location.get("lng")):
+        issues.append("default_location")
+    try:
+        speed = speech.get("speed_multiplier")
+        # An unset speed is the default; 0 is out of range
+        speed = 1.0 if speed is None else float(speed)
+        if not MIN_SPEECH_SPEED <= speed <= MAX_SPEECH_SPEED:
+            issues.append("speed_out_of_range")
+    except (TypeError, ValueError):
+        issues.append("invalid_speed")
+    if languages is not None:
+        for key in _LANGUAGE_KEYS:
+            lang = speech.get(key)
+            if lang and lang.split('-')[0] not in languages:
+                issues.append(f"unsupported_{key}")
+    return issues
+
+
+def audit_profiles(profiles: Iterator[dict],
+                   languages: Optional[Collection[str]] = None,
+                   summary: Optional[Counter] = None) -> Iterator[dict]:
+    """
+    Audit each profile in a stream of profiles
+    :param profiles: iterator of user profiles
+    :param languages: supported language codes; languages are not checked
+        if None
+    :param summary: optional Counter to update with totals by issue and the
+        number of `profiles` and `users_with_issues`
+    :returns: iterator of `username` and `issues` for profiles with issues
+    """
+    summary = summary if summary is not None else Counter()
+    if languages is not None:
+        languages = {lang.split('-')[0] for lang in languages}
+    for profile in profiles:
+        summary["profiles"] += 1
+        issues = audit_profile(profile, languages)
+        if issues:
+            summary["users_with_issues"] += 1
+            summary.update(issues)
+            yield {"username": (profile.get("user") or {}).get("username"),
+                   "issues": issues}
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("profiles",
+                        help="JSON Lines file of profiles (`-` for stdin) "
+                             "or a directory of profile files")
+    parser.add_argument("--languages",
+                        help="comma-separated supported language codes")
+    parsed = parser.parse_args(args)
+    languages = parsed.languages.split(',') if parsed.languages else None
+    summary = Counter()
+    for result in audit_profiles(iter_profiles(parsed.profiles), languages,
+                                 summary):
+        print(json.dumps(result))
+    print(json.dumps({"summary": dict(summary)}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
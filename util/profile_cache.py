@@ -0,0 +1,258 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from collections import OrderedDict, deque
+from copy import deepcopy
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic
+from typing import List, Optional, Sequence, Tuple
+
+from ovos_utils.log import LOG
+
+from .profile_patch import PatchError, apply_patch
+
+ProfileVersion = Tuple[int, str]
+
+
+def profile_fingerprint(profile: dict) -> str:
+    """
+    Get a fingerprint of a profile that is stable across processes
+    :param profile: user profile
+    :returns: hex digest of the profile's contents
+    """
+    return blake2b(json.dumps(profile, sort_keys=True,
+                              default=str).encode(), digest_size=8).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("version", "profile", "fingerprint", "superseded", "updated")
+
+    def __init__(self, max_superseded: int):
+        self.version = (0, "")
+        self.profile = None
+        self.fingerprint = None
+        self.superseded = deque(maxlen=max_superseded)
+        self.updated = 0.0
+
+
+class ProfileCache:
+    """
+    Latest known profile per user, kept coherent across skill instances by
+    `neon.profile_update` broadcasts. Each update carries a version of
+    (counter, origin); updates older than the cached version are dropped, so
+    every instance converges on the same profile regardless of delivery order.
+    Profiles replaced by a newer version are remembered, so a stale profile in
+    a message context can be recognized and replaced with the latest one.
+    """
+    def __init__(self, max_users: int = 1000, max_superseded: int = 8):
+        """
+        :param max_users: max number of users to cache, least recent evicted
+        :param max_superseded: max number of replaced profiles to recognize
+            per user
+        """
+        self.max_users = max_users
+        self.max_superseded = max_superseded
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+        self.updates = 0
+        self.patches = 0
+        self.patch_gaps = 0
+        self.stale_updates = 0
+        self.stale_reads = 0
+        self.evictions = 0
+        self.max_staleness = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get a dict of cache size and coherence metrics
+        """
+        with self._lock:
+            return {"users": len(self._entries),
+                    "updates": self.updates,
+                    "patches": self.patches,
+                    "patch_gaps": self.patch_gaps,
+                    "stale_updates": self.stale_updates,
+                    "stale_reads": self.stale_reads,
+                    "evictions": self.evictions,
+                    "max_staleness": self.max_staleness}
+
+    def version(self, username: str) -> ProfileVersion:
+        """
+        Get the cached profile version for a user
+        :param username: user to get the profile version of
+        :returns: (counter, origin) version; (0, "") if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            return entry.version if entry else (0, "")
+
+    def fingerprint(self, username: str) -> Optional[str]:
+        """
+        Get the fingerprint of the cached profile for a user
+        :param username: user to get the profile fingerprint of
+        :returns: fingerprint of the cached profile; None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            return entry.fingerprint if entry and entry.profile else None
+
+    def next_version(self, username: str, origin: str) -> ProfileVersion:
+        """
+        Get a version for a new profile update written by `origin`
+        :param username: user whose profile is being updated
+        :param origin: unique ID of the writing instance
+        :returns: version newer than any cached version for `username`
+        """
+        return self.version(username)[0] + 1, origin
+
+    def update(self, username: str, profile: dict,
+               version: Optional[Sequence] = None,
+               supersedes: Optional[str] = None) -> bool:
+        """
+        Apply a broadcast profile update
+        :param username: user the profile belongs to
+        :param profile: complete updated profile
+        :param version: (counter, origin) of the update; unversioned updates
+            are newer than any cached version
+        :param supersedes: fingerprint of the profile the update was applied to
+        :returns: True if the cached profile was replaced
+        """
+        fingerprint = profile_fingerprint(profile)
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                entry = self._entries[username] = _Entry(self.max_superseded)
+                if len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            self._entries.move_to_end(username)
+            version = tuple(version) if version else (entry.version[0] + 1, "")
+            if version == entry.version:
+                # Duplicate delivery, i.e. an instance receiving its own update
+                return False
+            if version < entry.version:
+                if fingerprint != entry.fingerprint and \
+                        fingerprint not in entry.superseded:
+                    entry.superseded.append(fingerprint)
+                self.stale_updates += 1
+                LOG.debug(f"Ignoring stale profile update for {username}: "
+                          f"{version} < {entry.version}")
+                return False
+            entry.profile = deepcopy(profile)
+            self._set_version(entry, version, fingerprint, supersedes)
+            return True
+
+    def apply_patch(self, username: str, ops: List[dict],
+                    base_version: Sequence, version: Sequence,
+                    fingerprint: str,
+                    supersedes: Optional[str] = None) -> bool:
+        """
+        Apply a broadcast profile patch. Patches only apply to the version
+        they were made from; if any update was missed, the patch is dropped and
+        the cache waits for the next complete profile.
+        :param username: user the profile belongs to
+        :param ops: patch operations from `make_patch`
+        :param base_version: version of the profile the patch was made from
+        :param version: version of the patched profile
+        :param fingerprint: fingerprint of the patched profile
+        :param supersedes: fingerprint of the profile the patch was made from
+        :returns: True if the cached profile was patched
+        """
+        version = tuple(version)
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is not None and version <= entry.version:
+                return False
+            if entry is None or entry.profile is None or \
+                    entry.version != tuple(base_version):
+                self.patch_gaps += 1
+                LOG.debug(f"Missed profile updates for {username} before "
+                          f"{version}")
+                return False
+            self._entries.move_to_end(username)
+            try:
+                apply_patch(entry.profile, ops)
+                if profile_fingerprint(entry.profile) != fingerprint:
+                    raise PatchError("Patched profile does not match "
+                                     "fingerprint")
+            except PatchError as e:
+                LOG.error(f"Dropping cached profile for {username}: {e}")
+                del self._entries[username]
+                self.patch_gaps += 1
+                return False
+            self._set_version(entry, version, fingerprint, supersedes)
+            self.patches += 1
+            return True
+
+    def _set_version(self, entry: _Entry, version: ProfileVersion,
+                     fingerprint: str, supersedes: Optional[str]):
+        for replaced in (entry.fingerprint, supersedes):
+            if replaced and replaced != fingerprint and \
+                    replaced not in entry.superseded:
+                entry.superseded.append(replaced)
+        if fingerprint in entry.superseded:
+            entry.superseded.remove(fingerprint)
+        entry.version = version
+        entry.fingerprint = fingerprint
+        entry.updated = monotonic()
+        self.updates += 1
+
+    def get_latest(self, username: str, profile: dict) -> Optional[dict]:
+        """
+        Check if a profile has been replaced by a newer broadcast update
+        :param username: user the profile belongs to
+        :param profile: profile to check, i.e. from a message context
+        :returns: copy of the latest profile if `profile` is stale, else None
+        """
+        with self._lock:
+            entry = self._entries.get(username)
+            if not entry or not entry.superseded:
+                return None
+        fingerprint = profile_fingerprint(profile)
+        with self._lock:
+            if fingerprint not in entry.superseded:
+                return None
+            self.stale_reads += 1
+            self.max_staleness = max(self.max_staleness,
+                                     monotonic() - entry.updated)
+            return deepcopy(entry.profile)
+
+    def clear(self):
+        """
+        Remove all cached profiles
+        """
+        with self._lock:
+            self._entries.clear()
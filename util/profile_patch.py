@@ -0,0 +1,105 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+JSON Patch (RFC 6902) style diffs of user profiles. A patch lists only the
+changed values by key path, so receivers can apply it in time proportional
+to the number of changed keys instead of re-merging the whole profile.
+"""
+
+from typing import List
+
+
+class PatchError(ValueError):
+    """
+    Raised when a patch cannot be applied to a profile
+    """
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(key: str) -> str:
+    return key.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old: dict, new: dict, path: str = "") -> List[dict]:
+    """
+    Get the operations that turn `old` into `new`. Nested dicts are diffed by
+    key; any other changed value is replaced whole.
+    :param old: profile before the change
+    :param new: profile after the change
+    :param path: JSON Pointer prefix of `old` and `new`
+    :returns: list of `add`, `remove` and `replace` operations
+    """
+    ops = list()
+    for key, value in new.items():
+        key_path = f"{path}/{_escape(key)}"
+        if key not in old:
+            ops.append({"op": "add", "path": key_path, "value": value})
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            ops.extend(make_patch(old[key], value, key_path))
+        elif value != old[key] or type(value) != type(old[key]):
+            ops.append({"op": "replace", "path": key_path, "value": value})
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+    return ops
+
+
+def apply_patch(profile: dict, ops: List[dict]) -> dict:
+    """
+    Apply operations from `make_patch` to a profile in place
+    :param profile: profile to update
+    :param ops: list of patch operations
+    :returns: the updated `profile`
+    :raises PatchError: if an operation's path does not exist in `profile`
+    """
+    for op in ops:
+        keys = [_unescape(key) for key in op["path"].split("/")[1:]]
+        if not keys:
+            raise PatchError(f"Cannot patch the profile root: {op}")
+        parent = profile
+        for key in keys[:-1]:
+            parent = parent.get(key) if isinstance(parent, dict) else None
+            if parent is None:
+                raise PatchError(f"Path not found: {op['path']}")
+        if not isinstance(parent, dict):
+            raise PatchError(f"Path not found: {op['path']}")
+        if op["op"] in ("add", "replace"):
+            if op["op"] == "replace" and keys[-1] not in parent:
+                raise PatchError(f"Path not found: {op['path']}")
+            parent[keys[-1]] = op["value"]
+        elif op["op"] == "remove":
+            if parent.pop(keys[-1], PatchError) is PatchError:
+                raise PatchError(f"Path not found: {op['path']}")
+        else:
+            raise PatchError(f"Unsupported operation: {op['op']}")
+    return profile
+
@@ -0,0 +1,92 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Tuple
+
+# Placeholder birthday in a default user profile
+UNSET_DOB = "YYYY/MM/DD"
+# Coordinates in a default user profile
+DEFAULT_COORDS = ("38.971669", "-95.23525")
+# Usernames this long are generated UIDs, not names set by a user
+GENERATED_USERNAME_LENGTH = 32
+MAX_SPEECH_SPEED = 1.5
+MIN_SPEECH_SPEED = 0.7
+
+
+def is_generated_username(username: str) -> bool:
+    """
+    Check if a username is a generated UID rather than one chosen by a user
+    :param username: username to check
+    :returns: True if `username` is a generated UID
+    """
+    return len(username) >= GENERATED_USERNAME_LENGTH
+
+
+def is_default_location(lat, lng) -> bool:
+    """
+    Check if coordinates are unset or the default profile location
+    :param lat: latitude from a user profile
+    :param lng: longitude from a user profile
+    :returns: True if the location is unset or default
+    """
+    return not all((lat, lng)) or (str(lat), str(lng)) == DEFAULT_COORDS
+
+
+def patch_changes_profile(patch: dict, profile: dict) -> bool:
+    """
+    Check if applying `patch` to `profile` would change any values. Values are
+    compared in place, so neither input is copied.
+    :param patch: nested dict of profile values to update
+    :param profile: nested dict user profile to compare against
+    :returns: True if any value in `patch` differs from `profile`
+    """
+    for key, value in patch.items():
+        if key not in profile:
+            return True
+        current = profile[key]
+        if isinstance(value, dict) and isinstance(current, dict):
+            if patch_changes_profile(value, current):
+                return True
+        elif value != current:
+            return True
+    return False
+
+
+def get_section_changes(patch: dict, profile: dict,
+                        section: str) -> Tuple[dict, dict]:
+    """
+    Get the values in one section of `profile` that `patch` would change
+    :param patch: nested dict of profile values to update
+    :param profile: nested dict user profile to compare against
+    :param section: top-level profile section, i.e. `location`
+    :returns: dicts of changed keys to old values and to new values
+    """
+    current = profile.get(section) or dict()
+    new = {key: value for key, value in (patch.get(section) or dict()).items()
+           if key not in current or current[key] != value}
+    return {key: current.get(key) for key in new}, new
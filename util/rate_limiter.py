@@ -0,0 +1,213 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from threading import Lock, local
+from time import monotonic
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from ovos_utils.log import LOG
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to `capacity` requests, refilled at `rate` requests
+    per second. Tokens are refilled lazily, so each check is O(1).
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float,
+                 now: Optional[float] = None):
+        """
+        :param rate: tokens added per second
+        :param capacity: max number of tokens held
+        :param now: monotonic time the bucket is created at
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic() if now is None else now
+
+    def refill(self, now: float) -> float:
+        """
+        Add tokens accrued since the last refill
+        :param now: current monotonic time
+        :returns: number of tokens available
+        """
+        if now > self.updated:
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        return self.tokens
+
+    @property
+    def full(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+class RateLimiter:
+    """
+    Per-user and global token bucket rate limits for named budgets. A request
+    may draw on several budgets (i.e. a settings change that also geocodes)
+    and is only allowed if every bucket has a token, so a throttled request
+    consumes nothing.
+    """
+    def __init__(self, budgets: Optional[Dict[str, dict]] = None,
+                 max_users: int = 10000):
+        """
+        :param budgets: dict of budget name to `user_rate`, `user_burst`,
+            `global_rate` and `global_burst`. Rates are requests per minute;
+            a rate of 0 disables that limit
+        :param max_users: max number of per-user buckets to keep; the least
+            recently used are removed first
+        """
+        self.max_users = max_users
+        self._budgets = dict()
+        self._global = dict()
+        self._users = OrderedDict()
+        self._lock = Lock()
+        self._local = local()
+        self.allowed = Counter()
+        self.throttled = Counter()
+        for name, config in (budgets or dict()).items():
+            self.configure(name, **config)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get a dict of per-budget request counts and tracked users
+        """
+        with self._lock:
+            return {"users": len(self._users),
+                    "budgets": {name: {
+                        "allowed": self.allowed[name],
+                        "throttled_user": self.throttled[(name, "user")],
+                        "throttled_global": self.throttled[(name, "global")]}
+                        for name in self._budgets}}
+
+    def configure(self, name: str, user_rate: float = 0,
+                  user_burst: float = 1, global_rate: float = 0,
+                  global_burst: float = 1):
+        """
+        Add or update a budget. Existing per-user buckets for it are reset.
+        :param name: budget name
+        :param user_rate: requests per minute allowed per user
+        :param user_burst: requests a user may make at once
+        :param global_rate: requests per minute allowed for all users
+        :param global_burst: requests all users may make at once
+        """
+        with self._lock:
+            self._budgets[name] = (user_rate / 60, max(user_burst, 1))
+            self._global[name] = TokenBucket(
+                global_rate / 60, max(global_burst, 1)) if global_rate \
+                else None
+            for key in [key for key in self._users if key[0] == name]:
+                del self._users[key]
+
+    def _user_bucket(self, name: str, user: str,
+                     now: float) -> Optional[TokenBucket]:
+        rate, burst = self._budgets[name]
+        if not rate:
+            return None
+        key = (name, user)
+        bucket = self._users.get(key)
+        if bucket is None:
+            bucket = self._users[key] = TokenBucket(rate, burst, now)
+            if len(self._users) > self.max_users:
+                # Forgetting a user's bucket only resets it to full
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(key)
+        return bucket
+
+    def try_acquire(self, user: str, budgets: Sequence[str]) -> \
+            Tuple[bool, Optional[str]]:
+        """
+        Take a token from each budget's user and global buckets.
+        :param user: user making the request
+        :param budgets: names of budgets the request draws on
+        :returns: True if allowed, and the name of the exhausted budget if not
+        """
+        now = monotonic()
+        with self._lock:
+            buckets = list()
+            for name in budgets:
+                if name not in self._budgets:
+                    continue
+                for scope, bucket in (("user",
+                                       self._user_bucket(name, user, now)),
+                                      ("global", self._global[name])):
+                    if bucket is None:
+                        continue
+                    if bucket.refill(now) < 1:
+                        self.throttled[(name, scope)] += 1
+                        LOG.warning(f"Rate limited {user}: {scope} {name} "
+                                    f"budget exhausted")
+                        return False, name
+                    buckets.append(bucket)
+            for bucket in buckets:
+                bucket.tokens -= 1
+            for name in budgets:
+                if name in self._budgets:
+                    self.allowed[name] += 1
+        return True, None
+
+    @contextmanager
+    def limit(self, user: str, budgets: Sequence[str]) -> Iterator[bool]:
+        """
+        Context manager wrapping `try_acquire`. Nested calls on the same
+        thread (a handler calling another handler) are not counted again.
+        :param user: user making the request
+        :param budgets: names of budgets the request draws on
+        :returns: True if the request may proceed, else False
+        """
+        if getattr(self._local, "depth", 0):
+            allowed = True
+        else:
+            allowed = self.try_acquire(user, budgets)[0]
+        if not allowed:
+            yield False
+            return
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield True
+        finally:
+            self._local.depth -= 1
+
+    def reset(self):
+        """
+        Refill all buckets and clear counters
+        """
+        with self._lock:
+            self._users.clear()
+            for bucket in self._global.values():
+                if bucket:
+                    bucket.tokens = bucket.capacity
+            self.allowed.clear()
+            self.throttled.clear()
@@ -0,0 +1,275 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from os import makedirs, replace
+from os.path import dirname, isfile
+from re import compile as compile_re
+from threading import Lock, Timer
+from typing import Dict, Optional
+
+from ovos_utils.log import LOG
+
+_PUNCTUATION = compile_re(r"[^\w\s]")
+_WHITESPACE = compile_re(r"\s+")
+
+
+def normalize_place(spoken: str) -> str:
+    """
+    Normalize a spoken place name for comparison
+    :param spoken: place as spoken or transcribed, i.e. `Paris, France.`
+    :returns: lowercase place name with punctuation removed
+    """
+    spoken = _PUNCTUATION.sub(" ", spoken or "").lower()
+    return _WHITESPACE.sub(" ", spoken).strip()
+
+
+def _word_similarity(spoken: str, known: str) -> float:
+    """
+    Compare two normalized place names word by word. Names only match if
+    they have the same number of words, so a mis-transcribed word is never
+    confused with a different qualifier (i.e. `springfield il` and
+    `springfield ma`).
+    :param spoken: normalized requested place name
+    :param known: normalized place name to compare to
+    :returns: lowest similarity (0-1) of any pair of words
+    """
+    spoken_words = spoken.split()
+    known_words = known.split()
+    if len(spoken_words) != len(known_words):
+        return 0.0
+    return min(1.0 if a == b else SequenceMatcher(None, a, b).ratio()
+               for a, b in zip(spoken_words, known_words))
+
+
+def _place_id(record: dict) -> tuple:
+    return record["place"].get("lat"), record["place"].get("lon")
+
+
+def _retained_place(place: dict) -> dict:
+    """
+    Get the fields of a resolved place that are used to update a profile
+    :param place: resolved location with `lat`, `lon`, and `address`
+    :returns: dict with only `lat`, `lon`, and `address` city, state, country
+    """
+    address = place.get("address") or dict()
+    return {"lat": place.get("lat"), "lon": place.get("lon"),
+            "address": {key: address[key] for key in
+                        ("city", "state", "country") if key in address}}
+
+
+class RecentPlaces:
+    """
+    Per-user store of recently resolved places so repeated (or slightly
+    mis-transcribed) location requests resolve without a geocode. Places are
+    indexed only by the name the user requested, so a request never matches
+    a different place that happens to share a city name.
+
+    Only the requested name, coordinates, city, state, country, and timezone
+    of the last `max_places` places are retained for each of the `max_users`
+    most recent users. When `file_path` is set, these are written in plain
+    JSON, batched up to `save_delay` seconds after a change.
+    """
+    def __init__(self, max_places: int = 5, cutoff: float = 0.85,
+                 file_path: Optional[str] = None, save_delay: float = 30,
+                 max_users: int = 1000):
+        """
+        :param max_places: max number of places kept per user; 0 disables
+        :param cutoff: minimum similarity (0-1) of each word for a fuzzy match
+        :param file_path: JSON file to persist places to, else memory only
+        :param save_delay: seconds to batch changes before writing; 0 writes
+            every change immediately
+        :param max_users: max number of users to keep places for; the least
+            recently active are removed first
+        """
+        self.max_places = max_places
+        self.cutoff = cutoff
+        self.file_path = file_path
+        self.save_delay = save_delay
+        self.max_users = max_users
+        self._places: Dict[str, OrderedDict] = OrderedDict()
+        self._lock = Lock()
+        self._dirty = False
+        self._save_timer: Optional[Timer] = None
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._places)
+
+    @property
+    def stats(self) -> dict:
+        return {"users": len(self._places), "hits": self.hits,
+                "fuzzy_hits": self.fuzzy_hits, "misses": self.misses}
+
+    def load(self):
+        """
+        Load persisted places from `file_path`, if it exists
+        """
+        if not self.file_path or not isfile(self.file_path):
+            return
+        try:
+            with open(self.file_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            LOG.error(f"Failed to load recent places: {e}")
+            return
+        with self._lock:
+            self._places = OrderedDict((user, OrderedDict(places))
+                                       for user, places in data.items())
+            self._remove_inactive_users()
+
+    def save(self):
+        """
+        Write places to `file_path`. The file is replaced atomically so a
+        failed write never leaves a partial file.
+        """
+        if not self.file_path:
+            return
+        with self._lock:
+            self._dirty = False
+            data = {user: list(places.items())
+                    for user, places in self._places.items()}
+        tmp_file = f"{self.file_path}.tmp"
+        try:
+            makedirs(dirname(self.file_path) or ".", exist_ok=True)
+            with open(tmp_file, "w") as f:
+                json.dump(data, f)
+            replace(tmp_file, self.file_path)
+        except OSError as e:
+            LOG.error(f"Failed to save recent places: {e}")
+
+    def flush(self):
+        """
+        Write any changes that are waiting for a batched save
+        """
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty = self._dirty
+        if timer:
+            timer.cancel()
+        if dirty:
+            self.save()
+
+    def _schedule_save(self):
+        """
+        Save changes now, or after `save_delay` if no save is already pending
+        """
+        if not self.file_path:
+            return
+        if not self.save_delay:
+            self.save()
+            return
+        with self._lock:
+            self._dirty = True
+            if self._save_timer:
+                return
+            self._save_timer = Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def match(self, user: str, spoken: str) -> Optional[dict]:
+        """
+        Get a recent place for a spoken request
+        :param user: user making the request
+        :param spoken: requested place name
+        :returns: dict with resolved `place` and timezone `tz`, else None
+        """
+        key = normalize_place(spoken)
+        with self._lock:
+            places = self._places.get(user)
+            if not key or not places:
+                self.misses += 1
+                return None
+            if key not in places:
+                # Every word must be similar, so short qualifiers like a
+                # state or country abbreviation have to match exactly
+                similarity, close = max((_word_similarity(key, known), known)
+                                        for known in places)
+                if similarity < self.cutoff:
+                    self.misses += 1
+                    return None
+                LOG.debug(f"Matched {spoken} to recent place: {close}")
+                key = close
+                self.fuzzy_hits += 1
+            self.hits += 1
+            self._places.move_to_end(user)
+            record = places[key]
+            for key in [key for key, value in places.items()
+                        if _place_id(value) == _place_id(record)]:
+                places.move_to_end(key)
+            return record
+
+    def add(self, user: str, spoken: str, place: dict, tz_name: str):
+        """
+        Add a resolved place for a user and persist it
+        :param user: user who requested the place
+        :param spoken: requested place name
+        :param place: resolved location with `lat`, `lon`, and `address`
+        :param tz_name: IANA timezone name at the resolved location
+        """
+        key = normalize_place(spoken)
+        if not self.max_places or not key:
+            return
+        record = {"place": _retained_place(place), "tz": tz_name}
+        with self._lock:
+            places = self._places.setdefault(user, OrderedDict())
+            self._places.move_to_end(user)
+            self._remove_inactive_users()
+            places[key] = record
+            places.move_to_end(key)
+            # Remove least recently used places along with all their keys
+            while len(set(map(_place_id, places.values()))) > \
+                    self.max_places:
+                oldest = _place_id(places.popitem(last=False)[1])
+                for key in [key for key, value in places.items()
+                            if _place_id(value) == oldest]:
+                    del places[key]
+        self._schedule_save()
+
+    def _remove_inactive_users(self):
+        while len(self._places) > self.max_users:
+            self._places.popitem(last=False)
+
+    def clear(self, user: Optional[str] = None):
+        """
+        Remove recent places for one user, or all users. Removals are written
+        immediately, along with any batched changes.
+        :param user: user to clear places for, else clear all users
+        """
+        with self._lock:
+            if user:
+                self._places.pop(user, None)
+            else:
+                self._places.clear()
+            self._dirty = True
+        self.flush()
@@ -0,0 +1,241 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Pack a skill locale directory into one memory-mapped resource bundle. Each
+bundle holds every file under `locale/<lang>` behind an index, so reading a
+resource costs one dictionary lookup instead of a directory walk and a file
+open. Bundles are a build artifact; when none exists for a language, resources
+are read from the loose files, as they are when any loose file is newer than
+the bundle. Example:
+
+    python -m skill_user_settings.util.resource_bundle locale
+"""
+
+import argparse
+import json
+import mmap
+import struct
+
+from os import listdir, walk
+from os.path import getmtime, getsize, isdir, join, relpath
+from typing import Dict, List, Optional
+
+from ovos_utils.bracket_expansion import expand_options
+
+BUNDLE_MAGIC = b"NRB1"
+BUNDLE_EXTENSION = ".bundle"
+_INDEX_SIZE = struct.Struct("<I")
+
+
+def build_bundle(lang_dir: str, bundle_file: str) -> int:
+    """
+    Pack every file in a language directory into a bundle
+    :param lang_dir: path to a locale language directory, i.e. `locale/en-us`
+    :param bundle_file: path to write the bundle to
+    :returns: number of files packed
+    """
+    index = dict()
+    data = bytearray()
+    for directory, _, files in sorted(walk(lang_dir)):
+        for file_name in sorted(files):
+            with open(join(directory, file_name), 'rb') as f:
+                contents = f.read()
+            index[relpath(join(directory, file_name), lang_dir)] = \
+                (len(data), len(contents))
+            data += contents
+    index_bytes = json.dumps(index, separators=(',', ':')).encode()
+    with open(bundle_file, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(_INDEX_SIZE.pack(len(index_bytes)))
+        f.write(index_bytes)
+        f.write(data)
+    return len(index)
+
+
+def build_bundles(locale_dir: str) -> Dict[str, int]:
+    """
+    Build `<lang>.bundle` next to each language directory in `locale_dir`
+    :param locale_dir: path to a skill's `locale` directory
+    :returns: dict of language to number of files packed
+    """
+    return {lang: build_bundle(join(locale_dir, lang),
+                               join(locale_dir, f"{lang}{BUNDLE_EXTENSION}"))
+            for lang in sorted(listdir(locale_dir))
+            if isdir(join(locale_dir, lang))}
+
+
+def is_stale(bundle_file: str, lang_dir: str) -> bool:
+    """
+    Check if a language directory changed after its bundle was built
+    :param bundle_file: path to a bundle built from `lang_dir`
+    :param lang_dir: path to the locale language directory
+    :returns: True if any file or directory in `lang_dir` is newer
+    """
+    built = getmtime(bundle_file)
+    for directory, _, files in walk(lang_dir):
+        # Directory times change when files are added or removed
+        if getmtime(directory) > built or \
+                any(getmtime(join(directory, file_name)) > built
+                    for file_name in files):
+            return True
+    return False
+
+
+def _lines(contents: str) -> List[str]:
+    return [line.strip() for line in contents.splitlines()
+            if line.strip() and not line.strip().startswith("#")]
+
+
+class ResourceBundle:
+    """
+    Read-only view of a bundle built by `build_bundle`. Files are located the
+    same way as `find_resource`: a file in the language directory, then in the
+    resource type's subdirectory, then anywhere in the language directory.
+    """
+    def __init__(self, bundle_file: str):
+        with open(bundle_file, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) \
+                if getsize(bundle_file) else b""
+        if self._mmap[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError(f"Not a resource bundle: {bundle_file}")
+        index_start = len(BUNDLE_MAGIC) + _INDEX_SIZE.size
+        index_size = _INDEX_SIZE.unpack_from(self._mmap, len(BUNDLE_MAGIC))[0]
+        self._data_start = index_start + index_size
+        self._index = json.loads(
+            self._mmap[index_start:self._data_start].decode())
+        self._paths = dict()
+        # Expanded vocab by file name; bundles are immutable
+        self._vocabulary = dict()
+        for path in self._index:
+            self._paths.setdefault(path.rsplit('/', 1)[-1], []).append(path)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def find(self, res_name: str,
+             res_dirname: Optional[str] = None) -> Optional[str]:
+        """
+        Locate a resource in the bundle
+        :param res_name: resource file name, i.e. `languages.value`
+        :param res_dirname: resource type directory, i.e. `regex`
+        :returns: path of the resource in the bundle if found, else None
+        """
+        paths = self._paths.get(res_name)
+        if not paths:
+            return None
+        if res_name in paths:
+            return res_name
+        if res_dirname and f"{res_dirname}/{res_name}" in paths:
+            return f"{res_dirname}/{res_name}"
+        return paths[0]
+
+    def read(self, res_name: str,
+             res_dirname: Optional[str] = None) -> Optional[str]:
+        """
+        Read a resource from the bundle
+        :param res_name: resource file name, i.e. `languages.value`
+        :param res_dirname: resource type directory, i.e. `regex`
+        :returns: file contents if found, else None
+        """
+        path = self.find(res_name, res_dirname)
+        if path is None:
+            return None
+        offset, length = self._index[path]
+        start = self._data_start + offset
+        return self._mmap[start:start + length].decode()
+
+    def load_named_values(self, name: str, delimiter: str = ",") -> dict:
+        """
+        Load a `.value` file like `SkillResources.load_named_value_file`
+        :param name: name of the `.value` file, extension optional
+        :param delimiter: delimiter between names and values
+        :returns: dict of names to values; empty if the file is missing
+        """
+        if not name.endswith(".value"):
+            name = f"{name}.value"
+        named_values = dict()
+        for line in _lines(self.read(name, "vocab") or ""):
+            name_value = line.split(delimiter)
+            if len(name_value) == 2:
+                named_values[name_value[0]] = name_value[1]
+        return named_values
+
+    def load_list(self, name: str) -> Optional[List[str]]:
+        """
+        Load a `.list` file like `SkillResources.load_list_file`
+        :param name: name of the `.list` file, extension optional
+        :returns: list of lines, or None if the file is missing
+        """
+        if not name.endswith(".list"):
+            name = f"{name}.list"
+        contents = self.read(name, "dialog")
+        return None if contents is None else _lines(contents)
+
+    def load_patterns(self, name: str) -> Optional[List[str]]:
+        """
+        Load regex patterns from a `.rx` file, like `read_patterns`
+        :param name: name of the `.rx` file, extension optional
+        :returns: list of patterns in file order, or None if missing
+        """
+        if not name.endswith(".rx"):
+            name = f"{name}.rx"
+        contents = self.read(name, "regex")
+        return None if contents is None else _lines(contents)
+
+    def load_vocabulary(self, name: str) -> Optional[List[List[str]]]:
+        """
+        Load a `.voc` file like `SkillResources.load_vocabulary_file`, with
+        lines lowercased and `(a|b)` options expanded. Expanded vocab is
+        cached, since expansion is much slower than reading the file.
+        :param name: name of the `.voc` file, extension optional
+        :returns: list of synonym lists, or None if the file is missing
+        """
+        if not name.endswith(".voc"):
+            name = f"{name}.voc"
+        if name not in self._vocabulary:
+            contents = self.read(name, "vocab")
+            self._vocabulary[name] = None if contents is None else \
+                [expand_options(line.lower()) for line in _lines(contents)]
+        vocabulary = self._vocabulary[name]
+        return None if vocabulary is None else \
+            [list(synonyms) for synonyms in vocabulary]
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("locale_dir",
+                        help="skill `locale` directory containing one "
+                             "directory per language")
+    parsed = parser.parse_args(args)
+    for lang, count in build_bundles(parsed.locale_dir).items():
+        print(f"{lang}: {count} files")
+
+
+if __name__ == "__main__":
+    main()
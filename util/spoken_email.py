@@ -0,0 +1,75 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import re
+
+from functools import lru_cache
+from typing import Dict, List
+
+_SYMBOLS = re.compile(r"([.@_+\-])")
+
+
+def tokenize_email(email_addr: str) -> List[str]:
+    """
+    Split an email address into words and the symbols between them
+    :param email_addr: email address to tokenize
+    :returns: list of tokens, i.e. `['test', '@', 'neon', '.', 'ai']`
+    """
+    return [token for token in _SYMBOLS.split(email_addr) if token]
+
+
+class EmailRenderer:
+    """
+    Renders email addresses as speakable strings in one language. Rendered
+    addresses are cached, so repeated prompts about the same address cost a
+    dict lookup.
+    """
+    def __init__(self, symbols: Dict[str, str], domains: Dict[str, str],
+                 cache_size: int = 256):
+        """
+        :param symbols: spoken words for `.`, `@`, `_`, `-`, and `+`
+        :param domains: spoken forms of known email domains
+        :param cache_size: max number of rendered addresses to cache
+        """
+        self.symbols = symbols
+        self.domains = {domain.lower(): spoken
+                        for domain, spoken in domains.items()}
+        self.render = lru_cache(maxsize=cache_size)(self._render)
+
+    def _render(self, email_addr: str) -> str:
+        local_part, at, domain = email_addr.rpartition('@')
+        if not at:
+            return self._render_tokens(email_addr)
+        spoken_domain = self.domains.get(domain.lower()) or \
+            self._render_tokens(domain)
+        return f"{self._render_tokens(local_part)} {self.symbols['@']} " \
+               f"{spoken_domain}"
+
+    def _render_tokens(self, text: str) -> str:
+        return " ".join(self.symbols.get(token, token)
+                        for token in tokenize_email(text))
@@ -0,0 +1,101 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+from datetime import datetime, tzinfo
+from threading import Lock
+from typing import Dict, Optional
+
+from dateutil.tz import gettz
+from lingua_franca.time import default_timezone
+from ovos_utils.log import LOG
+
+
+class TimezoneRegistry:
+    """
+    Caches `tzinfo` objects by name so zoneinfo files are read at most once
+    per timezone for the lifetime of the skill. Valid names are bounded by
+    the tz database; unknown names come from user input, so only the
+    `max_unknown` most recently requested are remembered.
+    """
+    def __init__(self, max_unknown: int = 64):
+        """
+        :param max_unknown: max number of unknown timezone names to cache
+        """
+        self.max_unknown = max_unknown
+        self._timezones: Dict[str, tzinfo] = dict()
+        self._unknown: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._timezones) + len(self._unknown)
+
+    def warm(self, *tz_names: Optional[str]):
+        """
+        Load the named timezones so later lookups are served from memory
+        :param tz_names: IANA timezone names to load
+        """
+        for tz_name in tz_names:
+            self.get(tz_name)
+
+    def get(self, tz_name: Optional[str]) -> tzinfo:
+        """
+        Get a timezone by name
+        :param tz_name: IANA timezone name, i.e. `America/Los_Angeles`
+        :returns: requested timezone, else the default timezone
+        """
+        if not tz_name:
+            return default_timezone()
+        try:
+            return self._timezones[tz_name]
+        except KeyError:
+            pass
+        with self._lock:
+            if tz_name in self._unknown:
+                self._unknown.move_to_end(tz_name)
+                return default_timezone()
+            user_tz = self._timezones.get(tz_name) or gettz(tz_name)
+            if user_tz:
+                self._timezones[tz_name] = user_tz
+                return user_tz
+            # Unknown names are cached too so repeated requests are not
+            # searched for again
+            LOG.warning(f"Unknown timezone: {tz_name}")
+            if self.max_unknown:
+                self._unknown[tz_name] = None
+                while len(self._unknown) > self.max_unknown:
+                    self._unknown.popitem(last=False)
+        return default_timezone()
+
+    def now(self, tz_name: Optional[str] = None) -> datetime:
+        """
+        Get the current time in the named timezone
+        :param tz_name: IANA timezone name, else use the default timezone
+        :returns: tz-aware datetime for the current time
+        """
+        return datetime.now(self.get(tz_name))
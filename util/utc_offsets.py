@@ -0,0 +1,142 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Recompute stored `location.utc` offsets after timezone database updates.
+Profiles are streamed and each timezone's offset is computed once, so a run
+costs one tz lookup per distinct zone rather than per user. Only profiles with
+a changed offset are output, as profile updates. Example:
+
+    python -m skill_user_settings.util.utc_offsets profiles.jsonl \
+        > updates.jsonl
+"""
+
+import argparse
+import json
+import sys
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from dateutil.tz import gettz
+from ovos_utils.log import LOG
+
+from .profile_audit import iter_profiles
+
+
+def format_utc_offset(offset: float) -> str:
+    """
+    Format an offset in hours the way it is stored in user profiles
+    :param offset: offset from UTC in hours
+    :returns: string offset, i.e. `-7.0`
+    """
+    return str(round(offset, 1))
+
+
+class UtcOffsetCache:
+    """
+    Current UTC offsets by timezone name, computed once per zone
+    """
+    def __init__(self, now: Optional[datetime] = None):
+        """
+        :param now: time to compute offsets at (default current time)
+        """
+        self.now = now or datetime.now(timezone.utc)
+        self._offsets: Dict[str, Optional[str]] = dict()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, tz_name: str) -> Optional[str]:
+        """
+        Get the formatted UTC offset for a timezone
+        :param tz_name: IANA timezone name
+        :returns: offset formatted for a user profile, None if tz is unknown
+        """
+        if tz_name not in self._offsets:
+            tz = gettz(tz_name) if tz_name else None
+            self._offsets[tz_name] = format_utc_offset(
+                self.now.astimezone(tz).utcoffset().total_seconds() / 3600) \
+                if tz else None
+        return self._offsets[tz_name]
+
+
+def _offset_changed(stored, offset: str) -> bool:
+    try:
+        return float(stored) != float(offset)
+    except (TypeError, ValueError):
+        return True
+
+
+def recompute_utc_offsets(profiles: Iterator[dict],
+                          now: Optional[datetime] = None,
+                          summary: Optional[Counter] = None) -> \
+        Iterator[dict]:
+    """
+    Get profile updates for users whose stored UTC offset no longer matches
+    their timezone
+    :param profiles: iterator of user profiles
+    :param now: time to compute offsets at (default current time)
+    :param summary: optional Counter to update with the number of `profiles`,
+        `changed` offsets, `unknown_tz` profiles, and distinct `timezones`
+    :returns: iterator of `username` and `location` updates
+    """
+    summary = summary if summary is not None else Counter()
+    offsets = UtcOffsetCache(now)
+    for profile in profiles:
+        summary["profiles"] += 1
+        location = profile.get("location") or dict()
+        offset = offsets.get(location.get("tz"))
+        if offset is None:
+            summary["unknown_tz"] += 1
+            continue
+        if _offset_changed(location.get("utc"), offset):
+            summary["changed"] += 1
+            yield {"username": (profile.get("user") or {}).get("username"),
+                   "location": {"utc": offset}}
+    summary["timezones"] = len(offsets)
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("profiles",
+                        help="JSON Lines file of profiles (`-` for stdin) "
+                             "or a directory of profile files")
+    parsed = parser.parse_args(args)
+    summary = Counter()
+    for update in recompute_utc_offsets(iter_profiles(parsed.profiles),
+                                        summary=summary):
+        print(json.dumps(update))
+    if summary["unknown_tz"]:
+        LOG.warning(f"{summary['unknown_tz']} profiles have unknown timezones")
+    print(json.dumps({"summary": dict(summary)}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()